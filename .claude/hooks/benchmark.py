@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""Benchmarks for the raw-text pipeline on synthetic corpora, checked against stored baselines.
+
+``run`` generates (or reuses) a synthetic checkout per size under
+.claude/cache/bench/ with synthetic_corpus.py and measures it in a fresh
+interpreter whose ``CEOCONT_REPO_ROOT`` points at it, so every engine reads
+the synthetic tree. Stages, all single-process:
+
+    rule:<name>       each content_validator rule over the files it applies to
+                      (texts preloaded), plus the cross-file faq pair and twin rules
+    twin-json         json.loads of every twin
+    twin-schema       MetadataTwin.model_validate of every parsed twin
+    validate          content_validator.run end to end, I/O included
+    hash-cold/-warm   integrity_engine.Hasher with an empty / a populated stat cache
+    manifest-cold/-warm
+                      manifest_compiler.build from an empty build cache / from
+                      one that already matches chunks.json
+    search-build      search_index.SearchIndex.update into an empty index
+    search-query      SEARCH_QUERIES against the built index with warm decode
+                      caches; time / items is the mean query latency
+
+Each stage runs ``--repeat`` times and keeps the fastest; one more run under
+tracemalloc records its peak Python allocation. The worker also times a fixed
+calibration workload, and baseline times are scaled by the calibration ratio
+so a baseline recorded on one machine stays meaningful on another. A stage
+slower than its scaled baseline, or with a higher peak, by more than
+``--tolerance`` fails the run.
+
+Usage:
+    python .claude/hooks/benchmark.py run                      # 1k and 10k against the baselines
+    python .claude/hooks/benchmark.py run --sizes 100k
+    python .claude/hooks/benchmark.py run --sizes 1k,10k,100k --update-baseline
+    python .claude/hooks/benchmark.py run --json > bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import hashlib
+import json
+import os
+import shutil
+import subprocess  # fixed argv re-running this script only  # nosec B404
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import content_validator as validator
+import manifest_compiler
+import search_index
+from corpus import CACHE_DIR, CHUNKS_PATH, RAW_TEXT_DIR, TOOLS_DIR, iter_raw_text, write_if_changed
+from integrity_engine import INTEGRITY_REL, Hasher, StatCache
+from synthetic_corpus import existing, generate, parse_size
+
+BASELINES_PATH = TOOLS_DIR / "benchmarks" / "baselines.json"
+CORPORA_DIR = CACHE_DIR / "bench"
+DEFAULT_SIZES = "1k,10k"
+DEFAULT_TOLERANCE = 0.3
+# Differences below these are noise at any tolerance
+MIN_REGRESSION_SECONDS = 0.005
+# hash-warm alone swings by about 1 MB between identical runs
+MIN_REGRESSION_KB = 2048
+# Single terms, pairs, an abbreviation expansion and filtered queries (query, component)
+SEARCH_QUERIES = (
+    ("independência", None),
+    ("sigilo profissional", None),
+    ("auditoria independente", None),
+    ("CFC", None),
+    ("sigilo", "docks"),
+    ("responsabilidade técnica", "plaintext"),
+)
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[[], object]
+    items: int
+    size: int
+    unit: str = "files"
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    gc.collect()
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def calibrate() -> float:
+    """Seconds for a fixed mix of hashing, JSON and interpreter work; the unit baselines are scaled by."""
+    data = bytes(range(256)) * 4096
+    doc = {"fragments": [{"id": i, "title": f"fragmento {i}", "tags": ["a", "b"]} for i in range(2000)]}
+
+    def work() -> None:
+        for _ in range(8):
+            hashlib.sha256(data).digest()
+            json.loads(json.dumps(doc))
+            sum(len(str(i)) for i in range(20_000))
+
+    return min(_timed(work) for _ in range(5))
+
+
+def rule_stages(rels: list[str], texts: dict[str, str], sizes: dict[str, int]) -> list[Stage]:
+    stages = [Stage("rule:path", lambda: [validator.check_path(rel) for rel in rels], len(rels), 0)]
+    for applies, rule in validator.RULES:
+        subset = [(rel, text) for rel, text in texts.items() if applies(rel)]
+
+        def run(subset=subset, rule=rule) -> None:
+            for rel, text in subset:
+                rule(rel, text)
+
+        name = "rule:" + rule.__name__.removeprefix("check_")
+        stages.append(Stage(name, run, len(subset), sum(sizes[rel] for rel, _ in subset)))
+
+    results = {rel: validator.validate_file(rel) for rel in rels}
+    stages.append(Stage("rule:faq_pairs", lambda: validator.check_faq_pairs(rels), len(rels), 0))
+    stages.append(Stage("rule:twins", lambda: validator.check_twins(results), len(results), 0))
+    return stages
+
+
+def twin_stages(twins: list[tuple[str, str]], twin_bytes: int) -> list[Stage]:
+    parsed = [json.loads(text) for _, text in twins]
+    schema = validator.MetadataTwin.model_validate
+    return [
+        Stage("twin-json", lambda: [json.loads(text) for _, text in twins], len(twins), twin_bytes, "twins"),
+        Stage("twin-schema", lambda: [schema(data) for data in parsed], len(twins), twin_bytes, "twins"),
+    ]
+
+
+def hash_stages(rels: list[str]) -> list[Stage]:
+    hashed = [rel for rel in rels if rel != INTEGRITY_REL]
+    hashed_bytes = sum(os.path.getsize(RAW_TEXT_DIR / rel) for rel in hashed)
+    stat_cache = StatCache(None)
+    Hasher(stat_cache, 1).hash_all(hashed)
+    return [
+        Stage("hash-cold", lambda: Hasher(StatCache(None), 1).hash_all(hashed), len(hashed), hashed_bytes),
+        Stage("hash-warm", lambda: Hasher(stat_cache, 1).hash_all(hashed), len(hashed), hashed_bytes),
+    ]
+
+
+def manifest_stages() -> list[Stage]:
+    raw = CHUNKS_PATH.read_text(encoding="utf-8")
+    fragments = sum(len(chunk["fragments"]) for chunk in json.loads(raw)["chunks"])
+    size = len(raw.encode("utf-8"))
+    build_cache = manifest_compiler.BuildCache(None)
+    manifest_compiler.build(build_cache, write=False)
+    build_cache.output = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    return [
+        Stage(
+            "manifest-cold",
+            lambda: manifest_compiler.build(manifest_compiler.BuildCache(None), write=False),
+            fragments,
+            size,
+            "fragments",
+        ),
+        Stage("manifest-warm", lambda: manifest_compiler.build(build_cache, write=False), fragments, size, "fragments"),
+    ]
+
+
+def build_stages(rels: list[str], texts: dict[str, str]) -> list[Stage]:
+    """Stages over the checkout at REPO_ROOT; warm stages are primed here, outside the timings."""
+    sizes = {rel: len(text.encode("utf-8")) for rel, text in texts.items()}
+    twins = [(rel, text) for rel, text in texts.items() if rel.endswith(".json") and not rel.startswith("meta/")]
+    twin_bytes = sum(sizes[rel] for rel, _ in twins)
+    return [
+        *rule_stages(rels, texts, sizes),
+        *twin_stages(twins, twin_bytes),
+        Stage("validate", lambda: validator.run(rels, jobs=1), len(rels), sum(sizes.values())),
+        *hash_stages(rels),
+        *manifest_stages(),
+        *search_stages(len(twins), twin_bytes),
+    ]
+
+
+def search_stages(twins: int, twin_bytes: int) -> list[Stage]:
+    index = search_index.SearchIndex()
+    index.update()
+
+    def queries() -> list:
+        return [index.search(query, component=component) for query, component in SEARCH_QUERIES]
+
+    queries()
+    return [
+        Stage("search-build", lambda: search_index.SearchIndex().update(), twins, twin_bytes, "twins"),
+        Stage("search-query", queries, len(SEARCH_QUERIES), 0, "queries"),
+    ]
+
+
+def measure(repeat: int) -> dict:
+    """Measure every stage against the checkout at REPO_ROOT (the worker side of ``run``)."""
+    rels = list(iter_raw_text())
+    texts = {}
+    for rel in rels:
+        if not rel.endswith("README.md"):
+            texts[rel] = (RAW_TEXT_DIR / rel).read_text(encoding="utf-8")
+    stages = build_stages(rels, texts)
+    result = {
+        "files": len(rels),
+        "bytes": sum(len(text.encode("utf-8")) for text in texts.values()),
+        "calibration": round(calibrate(), 6),
+        "stages": {},
+    }
+    for stage in stages:
+        seconds = min(_timed(stage.run) for _ in range(repeat))
+        gc.collect()
+        tracemalloc.start()
+        stage.run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        result["stages"][stage.name] = {
+            "items": stage.items,
+            "bytes": stage.size,
+            "unit": stage.unit,
+            "seconds": round(seconds, 6),
+            "peak_kb": peak // 1024,
+        }
+    return result
+
+
+def corpus_for(fragments: int, seed: int) -> tuple[Path, str]:
+    root = CORPORA_DIR / f"{fragments}-seed{seed}"
+    fingerprint = existing(root, fragments, seed)
+    if fingerprint is None:
+        print(f"🧪 generating {fragments} fragments in {root}", file=sys.stderr, flush=True)
+        shutil.rmtree(root, ignore_errors=True)
+        fingerprint = generate(root, fragments, seed)
+    return root, fingerprint
+
+
+def run_worker(root: Path, repeat: int) -> dict:
+    env = {**os.environ, "CEOCONT_REPO_ROOT": str(root)}
+    cmd = [sys.executable, str(Path(__file__).resolve()), "measure", "--repeat", str(repeat)]
+    # This interpreter re-running this script, no shell
+    out = subprocess.run(cmd, env=env, check=True, stdout=subprocess.PIPE).stdout  # nosec B603
+    return json.loads(out)
+
+
+def compare(size: str, result: dict, baseline: dict | None, tolerance: float) -> list[str]:
+    """Regression messages for ``result`` against ``baseline``; annotates each stage with its delta."""
+    if baseline is None:
+        return []
+    scale = result["calibration"] / baseline["calibration"]
+    result["scale"] = round(scale, 3)
+    regressions = []
+    for name, stage in result["stages"].items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            continue
+        expected = base["seconds"] * scale
+        stage["delta"] = stage["seconds"] / expected - 1 if expected else 0.0
+        if stage["seconds"] > expected * (1 + tolerance) and stage["seconds"] - expected > MIN_REGRESSION_SECONDS:
+            regressions.append(
+                f"{size} {name}: {_ms(stage['seconds'])} vs {_ms(expected)} scaled baseline ({stage['delta']:+.0%})"
+            )
+        limit = base["peak_kb"] * (1 + tolerance)
+        if stage["peak_kb"] > limit and stage["peak_kb"] - base["peak_kb"] > MIN_REGRESSION_KB:
+            regressions.append(f"{size} {name}: peak {_kb(stage['peak_kb'])} vs {_kb(base['peak_kb'])} baseline")
+    return regressions
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f} ms"
+
+
+def _kb(kb: float) -> str:
+    return f"{kb / 1024:.1f} MB" if kb >= 1024 else f"{kb:.0f} KB"
+
+
+def _rate(count: float, seconds: float) -> str:
+    rate = count / seconds if seconds else 0.0
+    for threshold, suffix in ((1e6, "M"), (1e3, "k")):
+        if rate >= threshold:
+            return f"{rate / threshold:.1f}{suffix}"
+    return f"{rate:.0f}"
+
+
+def report(size: str, result: dict, baseline: dict | None) -> None:
+    scale = f", ×{result['scale']:.2f} vs baseline machine" if "scale" in result else ", no baseline"
+    print(
+        f"📊 {size}: {result['fragments']} fragments, {result['files']} files, {result['bytes'] / 2**20:.1f} MB "
+        f"(calibration {_ms(result['calibration'])}{scale})"
+    )
+    if baseline and baseline.get("fingerprint") != result["fingerprint"]:
+        print("  ⚠️  corpus differs from the one the baseline was recorded on; rerun with --update-baseline")
+    print(f"  {'stage':<24}{'items':>9}{'time':>12}{'throughput':>18}{'MB/s':>9}{'peak':>10}{'Δ':>8}")
+    for name, stage in result["stages"].items():
+        throughput = f"{_rate(stage['items'], stage['seconds'])} {stage['unit']}/s"
+        mbps = f"{stage['bytes'] / 2**20 / stage['seconds']:.1f}" if stage["bytes"] and stage["seconds"] else "-"
+        delta = f"{stage['delta']:+.0%}" if "delta" in stage else "-"
+        print(
+            f"  {name:<24}{stage['items']:>9}{_ms(stage['seconds']):>12}{throughput:>18}{mbps:>9}"
+            f"{_kb(stage['peak_kb']):>10}{delta:>8}"
+        )
+
+
+def run_sizes(args: argparse.Namespace, baselines: dict) -> tuple[dict[str, dict], list[str]]:
+    """Measure every ``--sizes`` corpus; the results by fragment count and the regressions against ``baselines``."""
+    results, regressions = {}, []
+    for label in args.sizes.split(","):
+        fragments = parse_size(label)
+        root, fingerprint = corpus_for(fragments, args.seed)
+        print(f"⏱️  measuring {fragments} fragments", file=sys.stderr, flush=True)
+        result = {"fragments": fragments, "seed": args.seed, "fingerprint": fingerprint}
+        result.update(run_worker(root, args.repeat))
+        baseline = None if args.update_baseline else baselines.get(str(fragments))
+        regressions += compare(label.strip(), result, baseline, args.tolerance)
+        results[str(fragments)] = result
+        if not args.json:
+            report(label.strip(), result, baseline)
+    return results, regressions
+
+
+def save_baselines(baselines: dict, results: dict[str, dict]) -> None:
+    for size, result in results.items():
+        baselines[size] = {
+            "fingerprint": result["fingerprint"],
+            "calibration": result["calibration"],
+            "stages": {
+                name: {"seconds": stage["seconds"], "peak_kb": stage["peak_kb"]}
+                for name, stage in result["stages"].items()
+            },
+        }
+    BASELINES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(BASELINES_PATH, json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+    print(f"✏️  baselines for {', '.join(sorted(results, key=int))} fragments written to {BASELINES_PATH}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_cmd = sub.add_parser("run", help="benchmark synthetic corpora and compare with the baselines")
+    run_cmd.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated fragment counts, e.g. 1k,10k,100k")
+    run_cmd.add_argument("--seed", type=int, default=0)
+    run_cmd.add_argument("--repeat", type=int, default=3)
+    run_cmd.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown, 0.3 = 30%%")
+    run_cmd.add_argument("--update-baseline", action="store_true", help="record these results as the new baselines")
+    run_cmd.add_argument("--json", action="store_true")
+    measure_cmd = sub.add_parser("measure", help="(internal) measure the checkout at CEOCONT_REPO_ROOT")
+    measure_cmd.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == "measure":
+        json.dump(measure(args.repeat), sys.stdout)
+        return 0
+
+    baselines = json.loads(BASELINES_PATH.read_text(encoding="utf-8")) if BASELINES_PATH.exists() else {}
+    results, regressions = run_sizes(args, baselines)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.update_baseline:
+        save_baselines(baselines, results)
+        return 0
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    if not any(size in baselines for size in results):
+        print("⚠️  no baselines to compare with")
+        return 0
+    print("✅ no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
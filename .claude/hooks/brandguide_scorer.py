@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""Brandguide compliance and readability scorer for the metadata twins (ADR-012).
+
+Computes each twin's ``brandguide_compliance`` and ``quality_metrics`` blocks
+from its .txt and writes them back with format-preserving patches:
+
+- modals: the allowed/forbidden lists are read from server-brandguide.spec
+  §2.3/§2.4 and matched, together with glossary/abbreviation terms and the
+  voice (§2.1) and tone (§3.3) markers below, by one Aho-Corasick automaton in
+  a single pass over the text;
+- emojis and decorative symbols (§1.3), line width and file size (§6.1),
+  encoding (§6.2) and the per-category rules shared with content_validator.py.
+  §6.1 defers line width to CI, so the limit is the markdownlint MD013
+  line_length of .markdownlintrc; like MD013 with ``tables: false``, it is
+  checked on prose only, not on tables, data or diagrams;
+- Portuguese readability: Flesch (Martins et al. adaptation), Gunning fog,
+  sentence/word length, passive voice ratio and technical term density.
+  Tables, data and diagrams have no sentences or prose words and tradeoffs
+  are bullet lists, so their sentence-based metrics are written as null.
+
+Readability counts are gathered per feature over every pending fragment,
+one array column per feature, each filled by one compiled scanner. The
+scanners themselves dominate the run, so they are kept few: word-level counts
+(words, letters, syllables, complex words) all run over the same token
+stream, the WORD matches of the text once ``${...}`` placeholders are dropped,
+and words and letters come from counting that stream's separators rather
+than from another regex pass. Results are memoised by the SHA256 of
+the .txt (plus its path) in .claude/cache/, so only changed fragments are
+rescored; the cache is dropped whenever the spec or the dictionaries change.
+
+Usage:
+    python .claude/hooks/brandguide_scorer.py            # report
+    python .claude/hooks/brandguide_scorer.py --write    # update twins
+    python .claude/hooks/brandguide_scorer.py --check    # fail if twins are stale
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import unicodedata
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+import json_edit
+from content_validator import (
+    MAX_DOCK_CHARS,
+    MAX_FILE_BYTES,
+    check_dock_length,
+    check_encoding_hygiene,
+    check_tradeoffs,
+)
+from corpus import (
+    CACHE_DIR,
+    META_DIR,
+    PLACEHOLDER,
+    RAW_TEXT_DIR,
+    REPO_ROOT,
+    TOOLS_DIR,
+    iter_twins,
+    load_json,
+    write_if_changed,
+)
+from ptbr import counts
+
+SPEC_PATH = REPO_ROOT / "server-brandguide.spec"
+CACHE_PATH = CACHE_DIR / "brandguide-scores.json"
+CACHE_VERSION = 5
+# §6.1 defers line width to CI: the MD013 line_length of the markdownlint hook's configuration
+MAX_LINE_CHARS = int(load_json(TOOLS_DIR.parent / ".markdownlintrc")["MD013"]["line_length"])
+# Components without running prose: sentence-based readability is null, word-based too outside tradeoffs
+NO_SENTENCES = {"tables", "data", "diagrams", "tradeoffs"}
+# ... and no line width either: their lines are rows and statements that cannot be rewrapped
+NO_PROSE = {"tables", "data", "diagrams"}
+
+MODAL_RULE = re.compile(r"^(2\.[34])\s.*?:\s*(.+?)\.?\s*$", re.MULTILINE)
+# §2.1 impersonal voice: first and second person markers
+PERSONAL = ("nós", "nosso", "nossa", "nossos", "nossas", "você", "vocês")
+# §3.3 no hyperbole or gratuitous adjectives
+HYPE = (
+    "absolutamente",
+    "extremamente",
+    "incrível",
+    "incríveis",
+    "fantástico",
+    "fantástica",
+    "excelente",
+    "excelentes",
+    "perfeito",
+    "perfeita",
+    "revolucionário",
+    "revolucionária",
+    "sem dúvida",
+    "definitivamente",
+)
+
+# Readability scanners, applied to lowercased text
+VOWELS = "aeiouáéíóúâêôãõàü"
+WORD = re.compile(r"[^\W\d_]+(?:-[^\W\d_]+)*")
+VOWEL_GROUP = re.compile(f"[{VOWELS}y]+")
+COMPLEX_SYLLABLES = 4  # pt-BR words run about a syllable longer than English ones
+COMPLEX_WORD = re.compile(rf"\b(?:[^\W\d_{VOWELS}]*[{VOWELS}]+){{{COMPLEX_SYLLABLES},}}[^\W\d_]*")
+SENTENCE_END = re.compile(r"[.!?…]+(?=\s|$)|[^.!?…:;\s]$", re.MULTILINE)
+PASSIVE = re.compile(
+    r"\b(?:é|são|foi|foram|era|eram|será|serão|seja|sejam|fosse|fossem|ser|sendo|sido)\s+"
+    r"(?:[^\W\d_]+mente\s+)?[^\W\d_]{2,}(?:ad|id)[oa]s?\b"
+)
+# Counted over the space-joined words of a text, so every per-word ratio shares one token set. That string holds
+# only letters, in-word hyphens and single spaces, so words and letters are counted from its separators
+WORD_FEATURES = {
+    "words": lambda words: words.count(" ") + 1 if words else 0,
+    "letters": lambda words: len(words) - words.count(" ") - words.count("-"),
+    "syllables": lambda words: len(VOWEL_GROUP.findall(words)),
+    "complex": lambda words: len(COMPLEX_WORD.findall(words)),
+}
+TEXT_FEATURES = {
+    "sentences": lambda text: len(SENTENCE_END.findall(text)),
+    "passive": lambda text: len(PASSIVE.findall(text)),
+    "exclamations": lambda text: text.count("!"),
+}
+
+
+class Automaton:
+    """Aho-Corasick matcher over many phrases at once, reporting whole-word matches only."""
+
+    def __init__(self, patterns: Iterable[tuple[str, tuple[str, str]]]) -> None:
+        self.goto: list[dict[str, int]] = [{}]
+        self.out: list[list[tuple[int, tuple[str, str]]]] = [[]]
+        for phrase, payload in patterns:
+            state = 0
+            for char in phrase:
+                nxt = self.goto[state].get(char)
+                if nxt is None:
+                    nxt = self.goto[state][char] = len(self.goto)
+                    self.goto.append({})
+                    self.out.append([])
+                state = nxt
+            if (len(phrase), payload) not in self.out[state]:
+                self.out[state].append((len(phrase), payload))
+        self.fail = [0] * len(self.goto)
+        self._link()
+
+    def _link(self) -> None:
+        """Fill the failure links breadth first, merging each state's output with its fallback's."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                back = self.fail[state]
+                while back and char not in self.goto[back]:
+                    back = self.fail[back]
+                self.fail[nxt] = self.goto[back].get(char, 0) if self.goto[back].get(char) != nxt else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def finditer(self, text: str) -> Iterator[tuple[int, int, tuple[str, str]]]:
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for end, char in enumerate(text, start=1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, payload in out[state]:
+                start = end - length
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    yield start, end, payload
+
+
+Pattern = tuple[str, tuple[str, str]]
+
+
+def _voice_patterns(spec: str) -> list[Pattern]:
+    """Allowed and forbidden modals from the spec's §2.3/§2.4 rules, then the voice and tone word lists."""
+    modals = {number: [m.strip() for m in items.split(",") if m.strip()] for number, items in MODAL_RULE.findall(spec)}
+    patterns = [(modal.lower(), ("allowed", modal)) for modal in modals.get("2.3", [])]
+    patterns += [(modal.lower(), ("forbidden", modal)) for modal in modals.get("2.4", [])]
+    patterns += [(word, ("personal", word)) for word in PERSONAL]
+    patterns += [(word, ("hype", word)) for word in HYPE]
+    return patterns
+
+
+def _abbr_patterns(data: dict) -> list[Pattern]:
+    patterns: list[Pattern] = []
+    for abbr, entry in data.get("abbreviations", {}).items():
+        patterns += [(form.lower(), ("term", abbr)) for form in (abbr, entry.get("full", "")) if form]
+    return patterns
+
+
+def _glossary_patterns(data: dict) -> list[Pattern]:
+    patterns: list[Pattern] = []
+    for slug, entry in data.get("terms", {}).items():
+        forms = sorted({entry.get("term", "").lower(), slug.replace("-", " ")})
+        patterns += [(form, ("term", slug)) for form in forms if form]
+    return patterns
+
+
+def load_rules(spec_path: Path = SPEC_PATH, meta_dir: Path = META_DIR) -> tuple[Automaton, str]:
+    """Build the automaton and a digest of every input it was built from."""
+    spec = spec_path.read_text(encoding="utf-8")
+    patterns = _voice_patterns(spec)
+    digest = hashlib.sha256(f"{CACHE_VERSION}\0{MAX_LINE_CHARS}\0{spec}".encode())
+    for path, extract in (
+        (meta_dir / "abbr.json.txt", _abbr_patterns),
+        (meta_dir / "glossario.json.txt", _glossary_patterns),
+    ):
+        if path.exists():
+            digest.update(path.read_bytes())
+            patterns += extract(load_json(path))
+    return Automaton(patterns), digest.hexdigest()
+
+
+def measure(texts: list[str]) -> dict[str, array]:
+    """Count every readability feature over ``texts``: one array per feature, one slot per text."""
+    words = [" ".join(WORD.findall(PLACEHOLDER.sub(" ", text))) for text in texts]
+    columns = {name: array("I", map(counter, words)) for name, counter in WORD_FEATURES.items()}
+    columns.update({name: array("I", map(counter, texts)) for name, counter in TEXT_FEATURES.items()})
+    return columns
+
+
+def _clamp(value: float) -> float:
+    return round(min(1.0, max(0.0, value)), 2)
+
+
+def flesch_reading_ease(features: dict[str, int]) -> float:
+    """Flesch, Martins et al. pt-BR adaptation, clamped to its 0-100 scale."""
+    words = features["words"] or 1
+    sentence_length = features["words"] / (features["sentences"] or 1)
+    flesch = 248.835 - 1.015 * sentence_length - 84.6 * features["syllables"] / words
+    return round(min(100.0, max(0.0, flesch)), 1)
+
+
+def _scan(automaton: Automaton, lowered: str) -> tuple[dict[str, list[str]], int]:
+    """Modal, voice and tone matches by kind, and the number of words covered by glossary terms."""
+    found: dict[str, list[str]] = {"allowed": [], "forbidden": [], "personal": [], "hype": []}
+    term_words = 0
+    covered = 0
+    for start, end, (kind, name) in automaton.finditer(lowered):
+        if kind != "term":
+            found[kind].append(name)
+        elif start >= covered:  # leftmost match wins where terms overlap
+            term_words += len(lowered[start:end].split())
+            covered = end
+    return found, term_words
+
+
+def _voice_issues(found: dict[str, list[str]], exclamations: int) -> list[str]:
+    """§2.1, §2.4 and §3.3 issues."""
+    issues = [f"forbidden modal (§2.4): {modal}" for modal in sorted(set(found["forbidden"]))]
+    issues += [f"personal voice (§2.1): {word}" for word in sorted(set(found["personal"]))]
+    issues += [f"hyperbole (§3.3): {word}" for word in sorted(set(found["hype"]))]
+    if exclamations:
+        issues.append(f"exclamation marks (§3.3): {exclamations}")
+    return issues
+
+
+def long_lines(component: str, text: str) -> list[tuple[int, int]]:
+    """``(line number, length)`` of each prose line wider than MAX_LINE_CHARS."""
+    if component in NO_PROSE:
+        return []
+    return [(number, len(line)) for number, line in enumerate(text.split("\n"), start=1) if len(line) > MAX_LINE_CHARS]
+
+
+def _layout_issues(text: str, data: bytes, wide: list[tuple[int, int]]) -> list[str]:
+    """§1.3 symbols and §6.1 line width and file size issues."""
+    symbols = sorted({ch for ch in text if unicodedata.category(ch) == "So" or ch == "\ufe0f"})
+    issues = [f"emoji or decorative symbol (§1.3): U+{ord(ch):04X}" for ch in symbols]
+    issues += [f"line {number}: {length} characters, limit is {MAX_LINE_CHARS} (§6.1)" for number, length in wide]
+    if len(data) > MAX_FILE_BYTES:
+        issues.append(f"{len(data)} bytes, limit is {MAX_FILE_BYTES}")
+    return issues
+
+
+def compliance(rel: str, text: str, data: bytes, found: dict[str, list[str]], exclamations: int) -> dict[str, Any]:
+    """The ``brandguide_compliance`` block of the raw-text file ``rel``."""
+    component = rel.split("/", 1)[0]
+    wide = long_lines(component, text)
+    issues = _voice_issues(found, exclamations) + _layout_issues(text, data, wide)
+    forbidden = sorted(set(found["forbidden"]))
+    encoding = check_encoding_hygiene(rel, text)
+    issues += [f"{finding.rule}: {finding.message}" for finding in encoding]
+    voice = _clamp(1.0 - 0.25 * len(found["forbidden"]) - 0.1 * len(found["personal"]))
+    tone = _clamp(1.0 - 0.1 * (len(found["hype"]) + exclamations))
+    block: dict[str, Any] = {
+        "overall_score": 0.0,
+        "voice_check": voice,
+        "tone_check": tone,
+        "modals_allowed": not forbidden,
+        "modals_forbidden_detected": forbidden,
+        "max_line_length_ok": not wide,
+        "max_file_size_ok": len(data) <= MAX_FILE_BYTES,
+    }
+    if component == "docks":
+        block["max_docks_length_ok"] = not check_dock_length(rel, text)
+        if not block["max_docks_length_ok"]:
+            issues.append(f"dock longer than {MAX_DOCK_CHARS} characters (§4.3)")
+    block["utf8_lf_ok"] = not encoding
+    if component == "tradeoffs":
+        markers = check_tradeoffs(rel, text)
+        block["tradeoffs_format_ok"] = not markers
+        issues += [f"line {finding.line}: {finding.message} (§4.4)" for finding in markers]
+    checks = [value for key, value in block.items() if key.endswith(("_ok", "_allowed"))]
+    block["overall_score"] = _clamp((voice + tone + sum(checks)) / (2 + len(checks)))
+    block["issues"] = issues
+    return block
+
+
+def quality_metrics(component: str, text: str, features: dict[str, int], term_words: int) -> dict[str, Any]:
+    """The ``quality_metrics`` block."""
+    word_count, character_count = counts(text)
+    words = features["words"] or 1
+    sentences = features["sentences"] or 1
+    sentence_length = features["words"] / sentences
+    flesch = flesch_reading_ease(features)
+    metrics: dict[str, Any] = {
+        "word_count": word_count,
+        "character_count": character_count,
+        "readability_score": flesch,
+        "avg_sentence_length": round(sentence_length, 1),
+        "avg_word_length": round(features["letters"] / words, 1),
+        "technical_term_density": round(term_words / words, 2),
+        "passive_voice_ratio": round(min(1.0, features["passive"] / sentences), 2),
+        "flesch_reading_ease": flesch,
+        "gunning_fog_index": round(0.4 * (sentence_length + 100 * features["complex"] / words), 1),
+    }
+    if component in NO_SENTENCES:
+        for key in ("readability_score", "avg_sentence_length", "flesch_reading_ease", "gunning_fog_index"):
+            metrics[key] = None
+    if component in NO_PROSE:
+        metrics["avg_word_length"] = None
+    if component in ("tables", "data"):
+        rows = [line for line in text.split("\n") if line.strip()]
+        metrics["table_rows"] = len(rows)
+        metrics["table_columns"] = rows[0].count("\t") + 1 if rows else 0
+    return metrics
+
+
+def score(automaton: Automaton, rel: str, data: bytes, features: dict[str, int]) -> dict[str, dict[str, Any]]:
+    """Both twin blocks for the .txt ``rel``, from its raw bytes and its precomputed feature counts."""
+    text = data.decode("utf-8", errors="replace")
+    found, term_words = _scan(automaton, text.lower())
+    return {
+        "brandguide_compliance": compliance(rel, text, data, found, features["exclamations"]),
+        "quality_metrics": quality_metrics(rel.split("/", 1)[0], text, features, term_words),
+    }
+
+
+class ScoreCache:
+    """``sha256(txt):txt path -> blocks``, valid only for the rules digest it was built with."""
+
+    def __init__(self, path: Path | None, rules: str) -> None:
+        self.path = path
+        self.rules = rules
+        self.entries: dict[str, dict] = {}
+        self.used: set[str] = set()
+        if path is None or not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION and data.get("rules") == rules:
+            self.entries = data.get("entries", {})
+
+    def get(self, key: str) -> dict | None:
+        self.used.add(key)
+        return self.entries.get(key)
+
+    def save(self, prune: bool = True) -> None:
+        """Write the cache; ``prune`` drops entries this run did not look up, which only a full run may do."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        keep = self.used if prune else self.used | self.entries.keys()
+        entries = {key: self.entries[key] for key in sorted(keep) if key in self.entries}
+        payload = {"version": CACHE_VERSION, "rules": self.rules, "entries": entries}
+        # Entries keep their key order: it is the order the blocks are written into twins
+        write_if_changed(self.path, json.dumps(payload, ensure_ascii=False) + "\n")
+
+
+def score_corpus(rels: list[str], cache: ScoreCache, automaton: Automaton) -> tuple[dict[str, dict], int]:
+    """Blocks for every twin in ``rels`` and the number of fragments actually rescored."""
+    keys: dict[str, str] = {}
+    pending: dict[str, tuple[str, bytes]] = {}
+    for rel in rels:
+        txt = Path(rel).with_suffix(".txt").as_posix()
+        data = (RAW_TEXT_DIR / txt).read_bytes()
+        key = keys[rel] = f"{hashlib.sha256(data).hexdigest()}:{txt}"
+        if cache.get(key) is None and key not in pending:
+            pending[key] = (txt, data)
+
+    cache.entries.update(zip(pending, score_batch(automaton, list(pending.values()))))
+    return {rel: cache.entries[key] for rel, key in keys.items()}, len(pending)
+
+
+def score_batch(automaton: Automaton, items: list[tuple[str, bytes]]) -> list[dict[str, dict]]:
+    """Blocks for each ``(.txt path, .txt bytes)`` pair, with the features of the whole batch counted at once."""
+    columns = measure([data.decode("utf-8", errors="replace").lower() for _, data in items])
+    return [
+        score(automaton, rel, data, {name: column[row] for name, column in columns.items()})
+        for row, (rel, data) in enumerate(items)
+    ]
+
+
+def merge(current: Any, computed: dict[str, Any]) -> dict[str, Any]:
+    """Computed keys in canonical order, then any hand-added keys the scorer does not own."""
+    if not isinstance(current, dict):
+        return computed
+    extra = {key: value for key, value in current.items() if key not in computed}
+    return {**computed, **extra}
+
+
+def apply(rel: str, blocks: dict[str, dict], write: bool) -> bool | None:
+    """Compare (and with ``write``, patch) one twin; ``None`` when a block is missing, else whether it is stale."""
+    path = RAW_TEXT_DIR / rel
+    raw = path.read_text(encoding="utf-8")
+    twin = json.loads(raw)
+    if any(name not in twin for name in blocks):
+        return None
+    updates = {(name,): merge(twin[name], computed) for name, computed in blocks.items()}
+    patched = json_edit.patch(raw, updates)
+    if write and patched != raw:
+        write_if_changed(path, patched)
+    return patched != raw
+
+
+def select(paths: list[str]) -> list[str]:
+    """Twins named by ``paths``, in corpus order; every twin when none are given."""
+    rels = list(iter_twins())
+    if not paths:
+        return rels
+    wanted = {Path(path).resolve() for path in paths}
+    return [rel for rel in rels if (RAW_TEXT_DIR / rel).resolve() in wanted]
+
+
+def report(rel: str, blocks: dict[str, dict]) -> bool:
+    """Print the twin's brandguide issues; whether it has any."""
+    block = blocks["brandguide_compliance"]
+    if block["issues"]:
+        print(f"⚠️  {rel}: {block['overall_score']:.2f}")
+        for issue in block["issues"]:
+            print(f"    {issue}")
+    return bool(block["issues"])
+
+
+def reconcile(rel: str, blocks: dict[str, dict], write: bool, check: bool) -> bool | None:
+    """``apply`` one twin and print what happened to it."""
+    state = apply(rel, blocks, write)
+    if state is None:
+        print(f"❌ {rel}: missing brandguide_compliance/quality_metrics block")
+    elif state and write:
+        print(f"📝 {rel}: updated")
+    elif state and check:
+        print(f"❌ {rel}: brandguide_compliance/quality_metrics out of date")
+    return state
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="twins to score (default: all)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--write", action="store_true", help="write the computed blocks into the twins")
+    mode.add_argument("--check", action="store_true", help="exit 1 if any twin differs from the computed blocks")
+    parser.add_argument("--no-cache", action="store_true", help="rescore every fragment")
+    args = parser.parse_args(argv)
+
+    rels = select(args.paths)
+    automaton, rules = load_rules()
+    cache = ScoreCache(None if args.no_cache else CACHE_PATH, rules)
+    results, rescored = score_corpus(rels, cache, automaton)
+    cache.save(prune=not args.paths)
+
+    stale = missing = flagged = 0
+    for rel in rels:
+        flagged += report(rel, results[rel])
+        state = reconcile(rel, results[rel], args.write, args.check)
+        missing += state is None
+        stale += bool(state)
+
+    verb = "updated" if args.write else "stale"
+    print(f"🎯 {len(rels)} twins scored ({rescored} rescored): {flagged} with issues, {stale} {verb}")
+    if args.write and stale:
+        print("   run integrity_engine.py to refresh meta/integrity.txt")
+    return 1 if missing or (args.check and stale) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
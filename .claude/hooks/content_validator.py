@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""Single-pass content validator for online-resources/raw-text/.
+
+Each file is read exactly once and every server-contract.spec rule that
+applies to it runs on that single buffer. Files are sharded across a process
+pool; rules that span several files (faq q/a pairs, twin existence, twin/text
+sync) run afterwards on the per-file results.
+
+Usage:
+    python .claude/hooks/content_validator.py                       # whole tree
+    python .claude/hooks/content_validator.py FILE...               # pre-commit
+    python .claude/hooks/content_validator.py --changed-since main  # git delta
+    python .claude/hooks/content_validator.py --format json         # CI output
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from multiprocessing import Pool
+
+from corpus import (
+    INTEGRITY_PATH,
+    RAW_TEXT_DIR,
+    RAW_TEXT_PREFIX,
+    REPO_ROOT,
+    TOOLS_DIR,
+    TREE_PATH,
+    git_changed_since,
+    iter_raw_text,
+)
+from pydantic import ValidationError
+
+sys.path.insert(0, str(TOOLS_DIR))
+from models.metadata_twin import MetadataTwin  # noqa: E402
+
+CATEGORIES = {
+    "plaintext",
+    "callouts",
+    "docks",
+    "tradeoffs",
+    "tables",
+    "data",
+    "faqs",
+    "diagrams",
+    "disclaimers",
+    "others",
+    "header_h1",
+    "header_h2",
+    "header_h3",
+    "meta",
+}
+# Structural headers and faq pairs carry no metadata twin (path_json is null in chunks.json)
+TWINLESS = {"faqs", "header_h1", "header_h2", "header_h3", "meta"}
+
+MAX_FILE_BYTES = 100 * 1024  # mirrors check-added-large-files --maxkb=100
+MAX_DOCK_CHARS = 600  # server-brandguide.spec §4.3
+# Manifests generated by integrity_engine.py grow with the corpus, so the size limit would cap it
+SIZE_EXEMPT = {path.relative_to(RAW_TEXT_DIR).as_posix() for path in (INTEGRITY_PATH, TREE_PATH)}
+# Docks published before §4.3 was enforced, pinned at their current length so they can only shrink
+GRANDFATHERED_DOCKS = {
+    "docks/003-estudo-caso-irregularidade-cliente-4800.txt": 1000,
+    "docks/020-estudo-caso-relacionamento-cliente-401c.txt": 753,
+    "docks/030-estudo-caso-venda-empresa-cliente-bb26.txt": 902,
+}
+TRADEOFF_MARKERS = ("+", "-", "−")
+PARALLEL_MIN_FILES = 512
+
+FRAGMENT_NAME = re.compile(r"^\d{3}-[a-z0-9]+(?:-[a-z0-9]+)*(?:\.tsv|\.dot)?\.(?:txt|json)$")
+FAQ_DIR_NAME = re.compile(r"^\d{3}-[a-z0-9]+(?:-[a-z0-9]+)*$")
+# Categories whose .txt files must carry a format suffix
+TEXT_SUFFIXES = {"tables": ".tsv.txt", "data": ".tsv.txt", "diagrams": ".dot.txt"}
+CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+HTML_JS_CSS = re.compile(
+    r"</?[A-Za-z][A-Za-z0-9]*(?:\s[^<>]*)?/?>|<!--|javascript:|\bon[a-z]+\s*=\s*[\"']|\{[^{}]*:[^{}]*;[^{}]*\}",
+    re.IGNORECASE,
+)
+DECIMAL_COMMA = re.compile(r"^-?\d+,\d+$")
+DOT_HEADER = re.compile(r"^\s*(?:strict\s+)?(?:di)?graph\b[^{]*\{", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Finding:
+    path: str
+    rule: str
+    message: str
+    line: int = 0
+
+
+@dataclass
+class FileResult:
+    rel: str
+    findings: list[Finding]
+    # sha256 of the fragment text (the .txt body or the twin's transformed_text)
+    # with trailing newlines stripped, used for the cross-file twin sync rule
+    text_digest: str | None = None
+
+
+def _text_digest(text: str) -> str:
+    return hashlib.sha256(text.rstrip("\n").encode("utf-8")).hexdigest()
+
+
+# --- per-file rules ------------------------------------------------------------
+# Each rule takes (rel, text) and returns findings; RULES pairs it with the
+# predicate deciding which files it applies to.
+
+
+def check_encoding_hygiene(rel: str, text: str) -> list[Finding]:
+    findings = []
+    if text.startswith("\ufeff"):
+        findings.append(Finding(rel, "bom", "UTF-8 BOM is forbidden", 1))
+    if "\r" in text:
+        line = text.count("\n", 0, text.index("\r")) + 1
+        findings.append(Finding(rel, "crlf", "CR/CRLF line endings are forbidden; use LF", line))
+    match = CONTROL_CHARS.search(text)
+    if match:
+        line = text.count("\n", 0, match.start()) + 1
+        findings.append(Finding(rel, "control-chars", f"control character {match.group()!r}", line))
+    if text.endswith("\n\n"):
+        findings.append(Finding(rel, "trailing-blank-lines", "superfluous trailing blank lines"))
+    return findings
+
+
+def check_html_js_css(rel: str, text: str) -> list[Finding]:
+    match = HTML_JS_CSS.search(text)
+    if not match:
+        return []
+    line = text.count("\n", 0, match.start()) + 1
+    return [Finding(rel, "html-js-css", f"markup or code is forbidden: {match.group()[:40]!r}", line)]
+
+
+def check_tsv(rel: str, text: str) -> list[Finding]:
+    lines = text.rstrip("\n").split("\n")
+    if not lines[0].strip():
+        return [Finding(rel, "tsv-header", "TSV must start with a header line", 1)]
+    columns = lines[0].count("\t") + 1
+    if columns < 2:
+        return [Finding(rel, "tsv-header", "TSV header must be tab-separated", 1)]
+    findings = []
+    for number, line in enumerate(lines[1:], start=2):
+        cells = line.split("\t")
+        if len(cells) != columns:
+            findings.append(Finding(rel, "tsv-columns", f"{len(cells)} columns, header has {columns}", number))
+        for cell in cells:
+            if cell.startswith("="):
+                findings.append(Finding(rel, "tsv-formula", f"formulas are forbidden: {cell[:40]!r}", number))
+            elif DECIMAL_COMMA.match(cell):
+                findings.append(Finding(rel, "tsv-decimal", f"use '.' as decimal separator: {cell!r}", number))
+    return findings
+
+
+def check_tradeoffs(rel: str, text: str) -> list[Finding]:
+    findings = []
+    lines = [(n, line) for n, line in enumerate(text.split("\n"), start=1) if line.strip()]
+    # The first non-empty line is the tradeoff title
+    for number, line in lines[1:]:
+        if not line.startswith(TRADEOFF_MARKERS):
+            findings.append(Finding(rel, "tradeoff-marker", "line must start with '+' or '-'", number))
+    return findings
+
+
+def check_dock_length(rel: str, text: str) -> list[Finding]:
+    length = len(text.rstrip("\n"))
+    limit = GRANDFATHERED_DOCKS.get(rel, MAX_DOCK_CHARS)
+    if length > limit:
+        return [Finding(rel, "dock-length", f"{length} characters, limit is {limit}")]
+    return []
+
+
+def check_json_text(rel: str, text: str) -> list[Finding]:
+    try:
+        json.loads(text)
+    except ValueError as exc:
+        return [Finding(rel, "json-text", f"invalid JSON: {exc}")]
+    return []
+
+
+def check_dot(rel: str, text: str) -> list[Finding]:
+    if not DOT_HEADER.match(text) or text.count("{") != text.count("}") or not text.rstrip().endswith("}"):
+        return [Finding(rel, "dot-syntax", "must be a single Graphviz graph/digraph with balanced braces")]
+    return []
+
+
+Rule = Callable[[str, str], list[Finding]]
+RULES: list[tuple[Callable[[str], bool], Rule]] = [
+    (lambda rel: rel.endswith(".txt"), check_encoding_hygiene),
+    (lambda rel: rel.endswith(".txt") and not rel.startswith("meta/"), check_html_js_css),
+    (lambda rel: rel.startswith(("tables/", "data/")) and rel.endswith(".tsv.txt"), check_tsv),
+    (lambda rel: rel.startswith("tradeoffs/") and rel.endswith(".txt"), check_tradeoffs),
+    (lambda rel: rel.startswith("docks/") and rel.endswith(".txt"), check_dock_length),
+    (lambda rel: rel.endswith(".json.txt"), check_json_text),
+    (lambda rel: rel.endswith(".dot.txt"), check_dot),
+]
+
+
+def _check_fragment_name(rel: str, parts: list[str], name: str) -> list[Finding]:
+    """Layout of a fragment file under a non-meta category."""
+    if parts[0] == "faqs":
+        if len(parts) != 3 or not FAQ_DIR_NAME.match(parts[1]) or name not in ("q.txt", "a.txt"):
+            return [Finding(rel, "filename", "faqs must be laid out as faqs/NNN-slug/{q,a}.txt")]
+        return []
+    if len(parts) != 2 or not FRAGMENT_NAME.match(name):
+        return [Finding(rel, "filename", "name must be a lowercase NNN-slug with hyphens")]
+    suffix = TEXT_SUFFIXES.get(parts[0])
+    if suffix and name.endswith(".txt") and not name.endswith(suffix):
+        return [Finding(rel, "filename", f"{parts[0]}/ only holds *{suffix} files")]
+    return []
+
+
+def check_path(rel: str) -> list[Finding]:
+    """Extension, category and slug rules (server-contract.spec §1.2, §2.5, §3.1)."""
+    parts = rel.split("/")
+    name = parts[-1]
+    if name == "README.md":
+        return []
+    if not name.endswith((".txt", ".json")) or (name.endswith(".json") and parts[0] == "meta"):
+        return [Finding(rel, "raw-text-only", "only .txt files (and .json twins) are allowed under raw-text/")]
+    if len(parts) == 1 or parts[0] not in CATEGORIES:
+        return [Finding(rel, "category", f"'{parts[0]}' is not a contract category")]
+    if parts[0] == "meta":
+        return []
+    return _check_fragment_name(rel, parts, name)
+
+
+def check_twin(rel: str, text: str) -> tuple[list[Finding], str | None]:
+    """Schema-validate a metadata twin and return the digest of its transformed_text."""
+    try:
+        data = json.loads(text)
+    except ValueError as exc:
+        return [Finding(rel, "twin-json", f"invalid JSON: {exc}")], None
+    try:
+        twin = MetadataTwin.model_validate(data)
+    except ValidationError as exc:
+        return [
+            Finding(rel, "twin-schema", f"{'.'.join(str(p) for p in err['loc']) or '<root>'}: {err['msg']}")
+            for err in exc.errors()
+        ], None
+    if "/" not in rel:
+        return [Finding(rel, "twin-component", "twin is not stored under a category directory")], None
+    findings = []
+    category, name = rel.split("/", 1)
+    if twin.component != category:
+        findings.append(Finding(rel, "twin-component", f"component '{twin.component}' is stored under {category}/"))
+    stem = re.sub(r"(\.tsv|\.dot)?\.json$", "", name)
+    if twin.content_id != stem:
+        findings.append(Finding(rel, "twin-content-id", f"content_id '{twin.content_id}' does not match '{stem}'"))
+    return findings, _text_digest(twin.transformed_text)
+
+
+def validate_file(rel: str) -> FileResult:
+    """Read ``rel`` once and apply every rule that matches it."""
+    findings = check_path(rel)
+    if rel.endswith("README.md") or (findings and findings[0].rule == "raw-text-only"):
+        return FileResult(rel, findings)
+
+    data = (RAW_TEXT_DIR / rel).read_bytes()
+    if len(data) > MAX_FILE_BYTES and rel not in SIZE_EXEMPT:
+        findings.append(Finding(rel, "file-size", f"{len(data)} bytes, limit is {MAX_FILE_BYTES}"))
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        line = data.count(b"\n", 0, exc.start) + 1
+        findings.append(Finding(rel, "utf8", f"invalid UTF-8 at byte {exc.start}", line))
+        return FileResult(rel, findings)
+
+    if rel.endswith(".json"):
+        twin_findings, digest = check_twin(rel, text)
+        return FileResult(rel, findings + twin_findings, digest)
+
+    for applies, rule in RULES:
+        if applies(rel):
+            findings.extend(rule(rel, text))
+    return FileResult(rel, findings, _text_digest(text))
+
+
+# --- cross-file rules ----------------------------------------------------------
+
+
+def twin_of(rel: str) -> str | None:
+    if rel.split("/", 1)[0] in TWINLESS:
+        return None
+    if rel.endswith(".txt"):
+        return rel[: -len(".txt")] + ".json"
+    if rel.endswith(".json"):
+        return rel[: -len(".json")] + ".txt"
+    return None
+
+
+def faq_partner(rel: str) -> str | None:
+    """The other half of a ``faqs/NNN-slug/{q,a}.txt`` pair."""
+    head, _, name = rel.rpartition("/")
+    if not rel.startswith("faqs/") or name not in ("q.txt", "a.txt"):
+        return None
+    return f"{head}/{'a.txt' if name == 'q.txt' else 'q.txt'}"
+
+
+def check_faq_pairs(rels: Iterable[str]) -> list[Finding]:
+    dirs = {rel.split("/")[1] for rel in rels if rel.startswith("faqs/") and rel.count("/") == 2}
+    findings = []
+    for faq_dir in sorted(dirs):
+        for part in ("q.txt", "a.txt"):
+            if not (RAW_TEXT_DIR / "faqs" / faq_dir / part).is_file():
+                findings.append(Finding(f"faqs/{faq_dir}/", "faq-pair", f"missing {part}"))
+    return findings
+
+
+def check_twins(results: dict[str, FileResult]) -> list[Finding]:
+    findings = []
+    for rel, result in sorted(results.items()):
+        twin = twin_of(rel)
+        if twin is None:
+            continue
+        if not (RAW_TEXT_DIR / twin).is_file():
+            kind = "metadata twin" if rel.endswith(".txt") else "text file"
+            findings.append(Finding(rel, "twin-missing", f"missing {kind} {twin}"))
+        elif rel.endswith(".txt") and twin in results:
+            twin_digest = results[twin].text_digest
+            if twin_digest and result.text_digest and twin_digest != result.text_digest:
+                findings.append(Finding(rel, "twin-sync", f"text differs from transformed_text in {twin}"))
+    return findings
+
+
+# --- driver --------------------------------------------------------------------
+
+
+def select(paths: list[str], rev: str | None) -> list[str]:
+    if rev is None and not paths:
+        return list(iter_raw_text())
+    candidates = [str(REPO_ROOT / path) for path in git_changed_since(rev)] if rev is not None else paths
+    selected = set()
+    for path in candidates:
+        rel = os.path.relpath(os.path.abspath(path), RAW_TEXT_DIR).replace(os.sep, "/")
+        if rel.startswith(".."):
+            continue
+        # Twin sync and the faq pair rule look at both halves, so a change to either pulls in the other; a
+        # deleted file is only checked through the counterpart it leaves behind
+        pair = (rel, twin_of(rel), faq_partner(rel))
+        selected.update(other for other in pair if other and (RAW_TEXT_DIR / other).is_file())
+    return sorted(selected)
+
+
+def run(rels: list[str], jobs: int) -> list[Finding]:
+    if jobs > 1 and len(rels) >= PARALLEL_MIN_FILES:
+        with Pool(jobs) as pool:
+            results = list(pool.imap_unordered(validate_file, rels, chunksize=max(1, len(rels) // (jobs * 8))))
+    else:
+        results = [validate_file(rel) for rel in rels]
+    by_path = {result.rel: result for result in results}
+    findings = [finding for result in results for finding in result.findings]
+    findings += check_faq_pairs(rels)
+    findings += check_twins(by_path)
+    return sorted(findings, key=lambda f: (f.path, f.line, f.rule))
+
+
+def report(findings: list[Finding], checked: int, fmt: str) -> None:
+    if fmt == "json":
+        summary = Counter(f.rule for f in findings)
+        payload = {
+            "files_checked": checked,
+            "errors": len(findings),
+            "by_rule": dict(sorted(summary.items())),
+            "findings": [asdict(f) for f in findings],
+        }
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        return
+    for f in findings:
+        path = RAW_TEXT_PREFIX + f.path
+        if fmt == "github":
+            location = f"file={path},line={f.line}" if f.line else f"file={path}"
+            print(f"::error {location}::[{f.rule}] {f.message}")
+        else:
+            print(f"❌ {path}{f':{f.line}' if f.line else ''}: [{f.rule}] {f.message}")
+    if not findings:
+        print(f"✅ {checked} files validated")
+    elif fmt == "text":
+        print(f"\n{len(findings)} error(s) in {checked} files")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="files to validate (default: the whole raw-text tree)")
+    parser.add_argument("--changed-since", metavar="REV", help="validate only files touched since a git revision")
+    parser.add_argument("--format", choices=("text", "json", "github"), default="text")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    rels = select(args.paths, args.changed_since)
+    findings = run(rels, args.jobs)
+    report(findings, len(rels), args.format)
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
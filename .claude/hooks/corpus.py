@@ -0,0 +1,101 @@
+"""Shared paths and helpers for the raw-text corpus tooling.
+
+Every engine under .claude/hooks/ resolves the repository layout through this
+module so the scripts can be run from any working directory. Setting
+``CEOCONT_REPO_ROOT`` points them at another checkout, such as a synthetic
+corpus generated by synthetic_corpus.py for benchmarking.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess  # fixed git argv lists only  # nosec B404
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+TOOLS_DIR = Path(__file__).resolve().parents[1]
+REPO_ROOT = Path(os.environ.get("CEOCONT_REPO_ROOT") or TOOLS_DIR.parent).resolve()
+RAW_TEXT_DIR = REPO_ROOT / "online-resources" / "raw-text"
+META_DIR = RAW_TEXT_DIR / "meta"
+INTEGRITY_PATH = META_DIR / "integrity.txt"
+TREE_PATH = META_DIR / "TREE.txt"
+CHUNKS_PATH = REPO_ROOT / "chunks.json"
+PLACEHOLDERS_PATH = REPO_ROOT / "placeholders.txt"
+CACHE_DIR = REPO_ROOT / ".claude" / "cache"
+
+# Raw-text paths in chunks.json are repository-relative; integrity.txt uses "./"
+RAW_TEXT_PREFIX = "online-resources/raw-text/"
+
+# ``${variable-name}`` placeholders (server-contract.spec), group 1 is the name
+PLACEHOLDER = re.compile(r"\$\{([a-z0-9]+(?:-[a-z0-9]+)*)\}")
+
+# Entries modified this close to the run start are "racily clean": a later edit
+# within the same mtime tick would keep size and mtime, so stat caches skip them.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def iter_raw_text(root: Path = RAW_TEXT_DIR) -> Iterator[str]:
+    """Yield every file under ``root`` as a sorted POSIX path relative to it."""
+    stack = [""]
+    found: list[str] = []
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(root / rel_dir if rel_dir else root) as entries:
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(rel)
+                elif entry.is_file(follow_symlinks=False):
+                    found.append(rel)
+    yield from sorted(found)
+
+
+def iter_twins(root: Path = RAW_TEXT_DIR) -> Iterator[str]:
+    """Yield relative paths of every metadata twin (``*.json`` outside meta/)."""
+    for rel in iter_raw_text(root):
+        if rel.endswith(".json") and not rel.startswith("meta/"):
+            yield rel
+
+
+def repo_path_to_rel(path: str) -> str:
+    """Convert a chunks.json ``path_txt``/``path_json`` into a raw-text relative path."""
+    return path[len(RAW_TEXT_PREFIX) :] if path.startswith(RAW_TEXT_PREFIX) else path
+
+
+def git_changed_since(rev: str) -> list[str]:
+    """Repository-relative raw-text paths added, copied, modified or deleted since ``rev``, plus untracked ones.
+
+    Renames are listed as a deletion of the old path and an addition of the new one, so callers must expect
+    paths that no longer exist.
+    """
+    pathspec = RAW_TEXT_PREFIX.rstrip("/")
+    diff = ["git", "diff", "--name-only", "--no-renames", "--diff-filter=ACMD", rev, "--", pathspec]
+    untracked = ["git", "ls-files", "--others", "--exclude-standard", "--", pathspec]
+    names = set()
+    for cmd in (diff, untracked):
+        # Fixed git argv, no shell
+        out = subprocess.run(cmd, cwd=REPO_ROOT, check=True, capture_output=True, text=True).stdout  # nosec B603
+        names.update(line for line in out.splitlines() if line)
+    return sorted(names)
+
+
+def load_json(path: Path) -> Any:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write ``content`` atomically unless the file already holds exactly it."""
+    data = content.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Incremental, parallel integrity engine for online-resources/raw-text/.
+
+A regeneration run rewrites, in one pass:
+
+- the ``audit`` hashes of every metadata twin: ``sha256_transformed`` holds
+  the SHA256 of the twin's .txt file and ``sha256_original`` that of its
+  ``original_text``, the fragment as extracted from the source document,
+- ``meta/TREE.txt``,
+- ``meta/integrity.txt`` (``sha256␠␠./path``, server-contract.spec §6),
+- the ``sha256_txt`` field of every file fragment in ``chunks.json``.
+
+Files are hashed through mmap across a process pool. A stat cache keyed on
+path, size, mtime and inode lets unchanged files skip the read entirely.
+
+Usage:
+    python .claude/hooks/integrity_engine.py            # regenerate everything
+    python .claude/hooks/integrity_engine.py --verify   # stop at first mismatch
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from multiprocessing import Pool
+from pathlib import Path
+
+from corpus import (
+    CACHE_DIR,
+    CHUNKS_PATH,
+    INTEGRITY_PATH,
+    RACY_WINDOW_NS,
+    RAW_TEXT_DIR,
+    TREE_PATH,
+    iter_raw_text,
+    iter_twins,
+    repo_path_to_rel,
+    write_if_changed,
+)
+from json_edit import patch
+
+CACHE_PATH = CACHE_DIR / "integrity-stat-cache.json"
+CACHE_VERSION = 3
+
+INTEGRITY_REL = INTEGRITY_PATH.relative_to(RAW_TEXT_DIR).as_posix()
+TREE_REL = TREE_PATH.relative_to(RAW_TEXT_DIR).as_posix()
+
+# Below this much unread data the pool start-up costs more than hashing inline
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """Return the SHA256 hex digest of ``path`` read through mmap."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return EMPTY_SHA256
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return hashlib.sha256(view).hexdigest()
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class StatCache:
+    """Persistent ``path -> (size, mtime_ns, inode)`` keyed cache.
+
+    ``digests`` maps a file to its last known SHA256. ``twins`` records the
+    stat key of twins whose audit hashes were reconciled in a previous run,
+    with the .txt digest they were reconciled against.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.started_ns = time.time_ns()
+        self.digests: dict[str, list] = {}
+        self.twins: dict[str, list] = {}
+        if path is None or not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION and data.get("root") == str(RAW_TEXT_DIR):
+            self.digests = data.get("digests", {})
+            self.twins = data.get("twins", {})
+
+    @staticmethod
+    def key(st: os.stat_result) -> list:
+        return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    def digest(self, rel: str, st: os.stat_result) -> str | None:
+        entry = self.digests.get(rel)
+        if entry and entry[:3] == self.key(st):
+            return entry[3]
+        return None
+
+    def store_digest(self, rel: str, st: os.stat_result, digest: str) -> None:
+        self.digests[rel] = [*self.key(st), digest]
+
+    def twin_reconciled(self, rel: str, st: os.stat_result, digest: str) -> bool:
+        return self.twins.get(rel) == [*self.key(st), digest]
+
+    def store_twin(self, rel: str, st: os.stat_result, digest: str) -> None:
+        self.twins[rel] = [*self.key(st), digest]
+
+    def save(self, live: Iterable[str]) -> None:
+        if self.path is None:
+            return
+        live = set(live)
+        cutoff = self.started_ns - RACY_WINDOW_NS
+
+        def stable(entries: dict[str, list]) -> dict[str, list]:
+            return {rel: entry for rel, entry in sorted(entries.items()) if rel in live and entry[1] < cutoff}
+
+        data = {
+            "version": CACHE_VERSION,
+            "root": str(RAW_TEXT_DIR),
+            "digests": stable(self.digests),
+            "twins": stable(self.twins),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.path, json.dumps(data, separators=(",", ":")))
+
+
+class Hasher:
+    """Resolve digests from the stat cache, hashing the misses across a pool."""
+
+    def __init__(self, cache: StatCache, jobs: int) -> None:
+        self.cache = cache
+        self.jobs = max(1, jobs)
+        self.hashed = 0
+        self.cached = 0
+
+    def _split(self, rels: Iterable[str]) -> tuple[dict[str, str], list[tuple[str, os.stat_result]]]:
+        known: dict[str, str] = {}
+        pending: list[tuple[str, os.stat_result]] = []
+        for rel in rels:
+            st = os.stat(RAW_TEXT_DIR / rel)
+            digest = self.cache.digest(rel, st)
+            if digest is None:
+                pending.append((rel, st))
+            else:
+                known[rel] = digest
+        self.cached += len(known)
+        return known, pending
+
+    def _stream(self, pending: list[tuple[str, os.stat_result]]) -> Iterator[tuple[str, str]]:
+        paths = [str(RAW_TEXT_DIR / rel) for rel, _ in pending]
+        if self.jobs == 1 or sum(st.st_size for _, st in pending) < PARALLEL_MIN_BYTES:
+            digests: Iterable[str] = map(hash_file, paths)
+            pool = None
+        else:
+            pool = Pool(self.jobs)
+            digests = pool.imap(hash_file, paths, chunksize=max(1, len(paths) // (self.jobs * 8)))
+        try:
+            for (rel, st), digest in zip(pending, digests):
+                self.cache.store_digest(rel, st, digest)
+                self.hashed += 1
+                yield rel, digest
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    def hash_all(self, rels: Iterable[str]) -> dict[str, str]:
+        known, pending = self._split(rels)
+        known.update(self._stream(pending))
+        return known
+
+    def iter_hashes(self, rels: Iterable[str]) -> Iterator[tuple[str, str]]:
+        """Yield ``(rel, digest)`` lazily; closing the iterator stops the pool."""
+        known, pending = self._split(rels)
+        yield from known.items()
+        yield from self._stream(pending)
+
+
+def twin_text(rel: str) -> str:
+    """The .txt a twin describes (``tables/x.tsv.json`` -> ``tables/x.tsv.txt``)."""
+    return rel.removesuffix(".json") + ".txt"
+
+
+def reconcile_twin(rel: str, digest: str) -> bool:
+    """Set ``sha256_transformed`` to ``digest`` (the .txt's SHA256) and ``sha256_original`` to the SHA256 of the
+    twin's original_text; return whether the twin was rewritten."""
+    path = RAW_TEXT_DIR / rel
+    raw = path.read_text(encoding="utf-8")
+    twin = json.loads(raw)
+    audit = twin.get("audit")
+    if not isinstance(audit, dict):
+        return False
+    updates = {}
+    if "sha256_transformed" in audit:
+        updates[("audit", "sha256_transformed")] = digest
+    if "sha256_original" in audit and isinstance(twin.get("original_text"), str):
+        updates[("audit", "sha256_original")] = sha256_text(twin["original_text"])
+    return write_if_changed(path, patch(raw, updates))
+
+
+def render_tree(rels: Iterable[str]) -> str:
+    """Render the ``find``-style tree used by meta/TREE.txt."""
+    lines = ["."]
+    emitted: set[str] = set()
+    for rel in sorted(rels):
+        parts = rel.split("/")
+        for depth in range(len(parts)):
+            node = "/".join(parts[: depth + 1])
+            if node not in emitted:
+                emitted.add(node)
+                lines.append("| " * depth + "|____" + parts[depth])
+    return "\n".join(lines) + "\n"
+
+
+def render_integrity(digests: dict[str, str]) -> str:
+    return "".join(f"{digests[rel]}  ./{rel}\n" for rel in sorted(digests))
+
+
+def update_chunks(digests: dict[str, str]) -> bool:
+    if not CHUNKS_PATH.exists():
+        return False
+    raw = CHUNKS_PATH.read_text(encoding="utf-8")
+    manifest = json.loads(raw)
+    updates = {}
+    for i, chunk in enumerate(manifest.get("chunks", [])):
+        for j, fragment in enumerate(chunk.get("fragments", [])):
+            rel = repo_path_to_rel(fragment.get("path_txt") or "")
+            if "sha256_txt" in fragment and rel in digests:
+                updates[("chunks", i, "fragments", j, "sha256_txt")] = digests[rel]
+    return write_if_changed(CHUNKS_PATH, patch(raw, updates))
+
+
+def reconcile_twins(cache: StatCache, digests: dict[str, str]) -> list[str]:
+    """Reconcile every twin whose .txt digest is known; return the twins rewritten."""
+    rewritten = []
+    for rel in iter_twins():
+        digest = digests.get(twin_text(rel))
+        if digest is None:
+            continue
+        st = os.stat(RAW_TEXT_DIR / rel)
+        if cache.twin_reconciled(rel, st, digest):
+            continue
+        if reconcile_twin(rel, digest):
+            rewritten.append(rel)
+            st = os.stat(RAW_TEXT_DIR / rel)
+        cache.store_twin(rel, st, digest)
+    return rewritten
+
+
+def regenerate(cache: StatCache, jobs: int) -> int:
+    rels = set(iter_raw_text()) | {TREE_REL, INTEGRITY_REL}
+    rewritten = []
+    if write_if_changed(TREE_PATH, render_tree(rels)):
+        rewritten.append(TREE_REL)
+
+    # Twins record their .txt digest, so the texts are hashed before the twins are
+    hasher = Hasher(cache, jobs)
+    twins = set(iter_twins())
+    digests = hasher.hash_all(sorted(rels - twins - {INTEGRITY_REL}))
+    rewritten += reconcile_twins(cache, digests)
+    digests.update(hasher.hash_all(sorted(twins)))
+    if write_if_changed(INTEGRITY_PATH, render_integrity(digests)):
+        rewritten.append(INTEGRITY_REL)
+    if update_chunks(digests):
+        rewritten.append(CHUNKS_PATH.name)
+    cache.save(rels)
+
+    print(f"🔐 {len(digests)} files: {hasher.hashed} hashed, {hasher.cached} from cache")
+    for rel in rewritten:
+        print(f"  ✏️  updated {rel}")
+    return 0
+
+
+def parse_integrity(text: str) -> Iterator[tuple[str, str]]:
+    for line in text.splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        digest, _, path = line.partition("  ")
+        yield path[2:] if path.startswith("./") else path, digest
+
+
+def verify(cache: StatCache, jobs: int) -> int:
+    """Stream-verify integrity.txt, returning at the first failure."""
+    if not INTEGRITY_PATH.exists():
+        print(f"❌ {INTEGRITY_REL} not found")
+        return 1
+    expected = dict(parse_integrity(INTEGRITY_PATH.read_text(encoding="utf-8")))
+    on_disk = set(iter_raw_text()) - {INTEGRITY_REL}
+
+    for rel in sorted(expected):
+        if rel not in on_disk:
+            print(f"❌ ./{rel}: listed in {INTEGRITY_REL} but missing")
+            return 1
+    for rel in sorted(on_disk):
+        if rel not in expected:
+            print(f"❌ ./{rel}: not covered by {INTEGRITY_REL}")
+            return 1
+
+    hasher = Hasher(cache, jobs)
+    results = hasher.iter_hashes(sorted(expected))
+    try:
+        for rel, digest in results:
+            if digest != expected[rel]:
+                print(f"❌ ./{rel}: FAILED (expected {expected[rel]}, got {digest})")
+                return 1
+    finally:
+        results.close()
+        cache.save(on_disk)
+    print(f"✅ {len(expected)} files verified: {hasher.hashed} hashed, {hasher.cached} from cache")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verify", action="store_true", help="verify integrity.txt and stop at the first mismatch")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="hashing processes (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the stat cache")
+    args = parser.parse_args(argv)
+
+    cache = StatCache(None if args.no_cache else CACHE_PATH)
+    return verify(cache, args.jobs) if args.verify else regenerate(cache, args.jobs)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Format-preserving edits for the hand-formatted JSON files in this repository.
+
+chunks.json and the metadata twins mix inline and expanded arrays, so a plain
+``json.dumps`` round trip would reformat every file it touches. ``patch`` only
+rewrites the byte spans of the values that actually change and leaves every
+other character of the document untouched.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Union
+
+JsonPath = tuple[Union[str, int], ...]
+
+_WS = re.compile(r"[ \t\n\r]*")
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_LITERALS = {"true": True, "false": False, "null": None}
+_scanstring = json.decoder.scanstring
+
+
+def locate(raw: str) -> dict[JsonPath, tuple[int, int]]:
+    """Map every JSON path in ``raw`` to the ``(start, end)`` span of its value."""
+    spans: dict[JsonPath, tuple[int, int]] = {}
+
+    def value(pos: int, path: JsonPath) -> int:
+        pos = _WS.match(raw, pos).end()
+        start = pos
+        char = raw[pos]
+        if char == "{":
+            pos = _WS.match(raw, pos + 1).end()
+            if raw[pos] == "}":
+                pos += 1
+            else:
+                while True:
+                    key, pos = _scanstring(raw, pos + 1)
+                    pos = _WS.match(raw, pos).end() + 1  # skip ':'
+                    pos = _WS.match(raw, value(pos, (*path, key))).end()
+                    if raw[pos] == "}":
+                        pos += 1
+                        break
+                    pos = _WS.match(raw, pos + 1).end()  # skip ','
+        elif char == "[":
+            pos = _WS.match(raw, pos + 1).end()
+            if raw[pos] == "]":
+                pos += 1
+            else:
+                index = 0
+                while True:
+                    pos = _WS.match(raw, value(pos, (*path, index))).end()
+                    index += 1
+                    if raw[pos] == "]":
+                        pos += 1
+                        break
+                    pos += 1  # skip ','
+        elif char == '"':
+            _, pos = _scanstring(raw, pos + 1)
+        else:
+            for literal in _LITERALS:
+                if raw.startswith(literal, pos):
+                    pos += len(literal)
+                    break
+            else:
+                match = _NUMBER.match(raw, pos)
+                if not match:
+                    raise ValueError(f"Unexpected character {char!r} at offset {pos}")
+                pos = match.end()
+        spans[path] = (start, pos)
+        return pos
+
+    value(0, ())
+    return spans
+
+
+def dumps(obj: Any, indent: str = "") -> str:
+    """Serialize ``obj`` in the repository style.
+
+    Objects are expanded one key per line with two-space indentation, arrays of
+    scalars stay on a single line and arrays holding containers are expanded.
+    ``indent`` is the indentation of the line the value starts on.
+    """
+    inner = indent + "  "
+    if isinstance(obj, dict):
+        if not obj:
+            return "{}"
+        items = [f"{inner}{json.dumps(k, ensure_ascii=False)}: {dumps(v, inner)}" for k, v in obj.items()]
+        return "{\n" + ",\n".join(items) + "\n" + indent + "}"
+    if isinstance(obj, list):
+        if not obj:
+            return "[]"
+        if any(isinstance(item, (dict, list)) for item in obj):
+            return "[\n" + ",\n".join(inner + dumps(item, inner) for item in obj) + "\n" + indent + "]"
+        return "[" + ", ".join(json.dumps(item, ensure_ascii=False) for item in obj) + "]"
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _line_indent(raw: str, pos: int) -> str:
+    line_start = raw.rfind("\n", 0, pos) + 1
+    return _WS.match(raw, line_start).group().lstrip("\n\r")
+
+
+def _render(raw: str, start: int, end: int, value: Any) -> str | None:
+    """Replacement text for the JSON value at ``raw[start:end]``; None when it already equals ``value``."""
+    current = json.loads(raw[start:end])
+    if current == value and type(current) is type(value):
+        return None
+    indent = _line_indent(raw, start)
+    text = dumps(value, indent)
+    if isinstance(value, list) and value and "\n" in raw[start:end] and "\n" not in text:
+        # Keep a hand-expanded array of scalars expanded
+        inner = indent + "  "
+        text = "[\n" + ",\n".join(inner + dumps(item, inner) for item in value) + "\n" + indent + "]"
+    return text
+
+
+def _splice(raw: str, edits: list[tuple[int, int, str]]) -> str:
+    # One pass; rebuilding the string per edit is quadratic on large manifests
+    pieces, cursor = [], 0
+    for start, end, text in sorted(edits):
+        pieces += (raw[cursor:start], text)
+        cursor = end
+    pieces.append(raw[cursor:])
+    return "".join(pieces)
+
+
+def patch(raw: str, updates: dict[JsonPath, Any]) -> str:
+    """Return ``raw`` with the values at ``updates`` paths replaced.
+
+    Values whose current JSON content already equals the update are left as
+    they are, so a no-op patch returns ``raw`` unchanged byte for byte. Every
+    path must already exist in the document and no path may be nested inside
+    another one from the same call. Arrays that were spread over several lines
+    stay expanded.
+    """
+    if not updates:
+        return raw
+    spans = locate(raw)
+    edits = []
+    for path, new_value in updates.items():
+        start, end = spans[path]
+        text = _render(raw, start, end, new_value)
+        if text is not None:
+            edits.append((start, end, text))
+    return _splice(raw, edits)
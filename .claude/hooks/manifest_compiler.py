@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""Incremental compiler for the derived fields of chunks.json and placeholders.txt.
+
+The twins (and, for headers and faq pairs, the .txt files) are the source of
+truth; chunks.json only contributes the chunk membership and order of the
+fragments. Everything else is derived:
+
+    fragment   component, title, word_count, character_count,
+               transformations_applied, review_status
+    chunk      fragments_generated, validation.component_sequence,
+               validation.no_consecutive_components (ADR-014)
+    manifest   total_chunks, total_fragments, component_distribution,
+               component_distribution_percentage (headers excluded),
+               _distribution_note, saturation_warnings, placeholders_inventory
+    placeholders.txt
+
+A build cache in .claude/cache/ records, per fragment, the files it was
+compiled from (with their stat keys), the chunks.json fields it was seeded
+with and its contribution to the running component and placeholder totals.
+A build restats the inputs, recompiles only the fragments whose inputs or
+seed fields changed, subtracts their old contribution and adds the new one,
+and recompiles only the chunks whose fragment list or components changed.
+Unchanged inputs produce byte-identical output; ``last_updated`` is only
+bumped when something else in chunks.json changes.
+
+sha256_txt is owned by integrity_engine.py and left untouched here.
+
+Usage:
+    python .claude/hooks/manifest_compiler.py           # build
+    python .claude/hooks/manifest_compiler.py --check   # exit 1 if outputs are stale
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import json_edit
+from corpus import (
+    CACHE_DIR,
+    CHUNKS_PATH,
+    PLACEHOLDER,
+    PLACEHOLDERS_PATH,
+    RACY_WINDOW_NS,
+    RAW_TEXT_DIR,
+    load_json,
+    repo_path_to_rel,
+    write_if_changed,
+)
+from ptbr import counts
+
+CACHE_PATH = CACHE_DIR / "manifest-build.json"
+CACHE_VERSION = 3
+
+COMPONENTS = (
+    "plaintext",
+    "callouts",
+    "docks",
+    "tradeoffs",
+    "tables",
+    "data",
+    "faqs",
+    "diagrams",
+    "disclaimers",
+    "others",
+    "header_h1",
+    "header_h2",
+    "header_h3",
+)
+HEADERS = frozenset({"header_h1", "header_h2", "header_h3"})
+FRAGMENT_FIELDS = ("component", "title", "word_count", "character_count", "transformations_applied", "review_status")
+# Fields a record is seeded with from chunks.json (all a twinless fragment has); part of its cache key
+SEED_FIELDS = ("component", "title", "transformations_applied", "review_status")
+DISTRIBUTION_NOTE = (
+    "Headers (header_h1, header_h2, header_h3) are structural elements and do NOT count towards the "
+    "{plaintext_min:g}-{plaintext_max:g}% plaintext / {others_min:g}-{others_max:g}% others baseline. "
+    "Percentages calculated based on {body} non-header fragments ({total} total - {headers} headers)."
+)
+SATURATION = re.compile(r"^(?P<metric>\S+) at [\d.]+% (?P<direction>below min|above max) [\d.]+%(?P<note>.*)$")
+PLACEHOLDERS_HEADER = "# PLACEHOLDERS INVENTORY\n\n## Placeholder format: ${variable-name}\n\n"
+
+
+def fragment_inputs(fragment: dict) -> list[str]:
+    """Raw-text files a chunks.json fragment is compiled from."""
+    path_txt = repo_path_to_rel(fragment.get("path_txt") or "")
+    texts = [path_txt + "q.txt", path_txt + "a.txt"] if path_txt.endswith("/") else [path_txt]
+    twin = repo_path_to_rel(fragment.get("path_json") or "")
+    return [rel for rel in (*texts, twin) if rel]
+
+
+def _twin_fields(record: dict[str, Any], twin: dict) -> set[str]:
+    """Overlay the fields the twin owns onto ``record``; return the placeholder keys it declares."""
+    record["component"] = twin.get("component", record["component"])
+    record["title"] = (twin.get("metadata") or {}).get("title", record["title"])
+    record["transformations_applied"] = [t.get("type") for t in twin.get("transformations") or [] if t.get("type")]
+    record["review_status"] = (twin.get("review_status") or {}).get("status", record["review_status"])
+    return {p["key"] for p in twin.get("placeholders") or [] if p.get("key")}
+
+
+def compile_fragment(fragment: dict, inputs: list[str]) -> dict[str, Any]:
+    """Derived fields of one fragment plus the placeholder keys it contributes.
+
+    word_count and character_count always come from the .txt inputs, never from the twin's quality_metrics.
+    """
+    twin_rel = repo_path_to_rel(fragment.get("path_json") or "")
+    text = "".join((RAW_TEXT_DIR / rel).read_text(encoding="utf-8") for rel in inputs if rel != twin_rel)
+    record = {field: fragment.get(field) for field in FRAGMENT_FIELDS}
+    record["word_count"], record["character_count"] = counts(text)
+    keys = {match.group() for match in PLACEHOLDER.finditer(text)}
+    if twin_rel:
+        keys |= _twin_fields(record, load_json(RAW_TEXT_DIR / twin_rel))
+    return {"record": record, "placeholders": sorted(keys)}
+
+
+def compile_chunk(components: list[str]) -> dict[str, Any]:
+    consecutive = any(a == b for a, b in zip(components, components[1:]))
+    return {"fragments_generated": len(components), "component_sequence": components, "no_consecutive": not consecutive}
+
+
+class BuildCache:
+    """Fragment records, their input stat keys and the running totals they add up to."""
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.started_ns = time.time_ns()
+        self.files: dict[str, list] = {}
+        self.fragments: dict[str, dict] = {}
+        self.chunks: dict[str, dict] = {}
+        self.components: Counter[str] = Counter()
+        self.placeholders: Counter[str] = Counter()
+        self.output = ""
+        if path is None or not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION and data.get("root") == str(RAW_TEXT_DIR):
+            self.files = data["files"]
+            self.fragments = data["fragments"]
+            self.chunks = data["chunks"]
+            self.components = Counter(data["components"])
+            self.placeholders = Counter(data["placeholders"])
+            self.output = data["output"]
+
+    def add(self, entry: dict, sign: int) -> None:
+        self.components[entry["record"]["component"]] += sign
+        for key in entry["placeholders"]:
+            self.placeholders[key] += sign
+
+    def save(self, chunks_digest: str) -> None:
+        if self.path is None:
+            return
+        cutoff = self.started_ns - RACY_WINDOW_NS
+        data = {
+            "version": CACHE_VERSION,
+            "root": str(RAW_TEXT_DIR),
+            "output": chunks_digest,
+            # Inputs modified within the racy window get no key, so the next build recompiles their fragments
+            "files": {rel: key if key[1] < cutoff else None for rel, key in sorted(self.files.items())},
+            "fragments": dict(sorted(self.fragments.items())),
+            "chunks": dict(sorted(self.chunks.items())),
+            "components": dict(sorted((+self.components).items())),
+            "placeholders": dict(sorted((+self.placeholders).items())),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.path, json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def _stat_key(rel: str) -> list:
+    st = os.stat(RAW_TEXT_DIR / rel)
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _round(value: float) -> float:
+    return round(value, 1)
+
+
+def saturation_warnings(shares: dict[str, float], targets: dict, previous: list[str]) -> list[str]:
+    """One warning per ``target_distribution`` bound missed; hand-written notes on a still-valid warning are kept."""
+    notes = {}
+    for warning in previous:
+        match = SATURATION.match(warning)
+        if match:
+            notes[match["metric"], match["direction"]] = match["note"]
+    warnings = []
+    for metric, bounds in targets.items():
+        value = shares.get(metric, 0.0)
+        low, high = bounds.get("min"), bounds.get("max")
+        checks = (
+            ("below min", low, low is not None and value < low),
+            ("above max", high, high is not None and value > high),
+        )
+        for direction, limit, missed in checks:
+            if missed:
+                note = notes.get((metric, direction), "")
+                warnings.append(f"{metric} at {value:.1f}% {direction} {float(limit):.1f}%{note}")
+    return warnings
+
+
+def _cache_hit(entry: dict, inputs: list[str], seed: list, files: dict[str, list], keys: dict[str, list]) -> bool:
+    """Whether a cached fragment still matches its input files and its own chunks.json fields."""
+    if entry["inputs"] != inputs or entry["seed"] != seed:
+        return False
+    return all(files.get(rel) == keys[rel] for rel in inputs)
+
+
+def reconcile_fragments(manifest: dict, cache: BuildCache) -> set[str]:
+    """Restat every fragment's inputs, recompile the stale ones and fold the delta into the cached totals.
+
+    Returns the content_ids that were recompiled; fragments no longer in chunks.json are dropped from the cache.
+    """
+    live: set[str] = set()
+    files: dict[str, list] = {}
+    changed: set[str] = set()
+    for chunk in manifest.get("chunks", []):
+        for fragment in chunk.get("fragments", []):
+            cid = fragment["content_id"]
+            live.add(cid)
+            inputs = fragment_inputs(fragment)
+            keys = {rel: _stat_key(rel) for rel in inputs}
+            files.update(keys)
+            seed = [fragment.get(field) for field in SEED_FIELDS]
+            entry = cache.fragments.get(cid)
+            if entry and _cache_hit(entry, inputs, seed, cache.files, keys):
+                continue
+            if entry:
+                cache.add(entry, -1)
+            entry = cache.fragments[cid] = {"inputs": inputs, "seed": seed, **compile_fragment(fragment, inputs)}
+            cache.add(entry, +1)
+            changed.add(cid)
+    for cid in cache.fragments.keys() - live:
+        cache.add(cache.fragments.pop(cid), -1)
+    cache.files = files
+    return changed
+
+
+def _fragment_updates(
+    i: int, chunk: dict, cache: BuildCache, refresh: set[str] | None
+) -> dict[json_edit.JsonPath, Any]:
+    """Field updates for the fragments of chunk ``i`` in ``refresh`` (all of them when ``None``)."""
+    updates: dict[json_edit.JsonPath, Any] = {}
+    for j, fragment in enumerate(chunk.get("fragments", [])):
+        if refresh is None or fragment["content_id"] in refresh:
+            record = cache.fragments[fragment["content_id"]]["record"]
+            for field in FRAGMENT_FIELDS:
+                if field in fragment:
+                    updates["chunks", i, "fragments", j, field] = record[field]
+    return updates
+
+
+def _chunk_updates(i: int, chunk: dict, compiled: dict[str, Any]) -> dict[json_edit.JsonPath, Any]:
+    updates: dict[json_edit.JsonPath, Any] = {}
+    if "fragments_generated" in chunk:
+        updates["chunks", i, "fragments_generated"] = compiled["fragments_generated"]
+    if isinstance(chunk.get("validation"), dict):
+        updates["chunks", i, "validation", "component_sequence"] = compiled["component_sequence"]
+        updates["chunks", i, "validation", "no_consecutive_components"] = compiled["no_consecutive"]
+    return updates
+
+
+def compile_chunks(
+    manifest: dict, cache: BuildCache, changed: set[str], full: bool
+) -> tuple[dict[json_edit.JsonPath, Any], int]:
+    """chunks.json updates for the chunks touched by ``changed`` (every chunk when ``full``) and the recompile count."""
+    updates: dict[json_edit.JsonPath, Any] = {}
+    recompiled = 0
+    live = set()
+    for i, chunk in enumerate(manifest.get("chunks", [])):
+        live.add(chunk["chunk_id"])
+        ids = [fragment["content_id"] for fragment in chunk.get("fragments", [])]
+        updates.update(_fragment_updates(i, chunk, cache, None if full else changed))
+        components = [cache.fragments[cid]["record"]["component"] for cid in ids]
+        previous = cache.chunks.get(chunk["chunk_id"])
+        if previous is None or previous["component_sequence"] != components:
+            cache.chunks[chunk["chunk_id"]] = compile_chunk(components)
+            recompiled += 1
+        elif not full and not changed.intersection(ids):
+            continue
+        updates.update(_chunk_updates(i, chunk, cache.chunks[chunk["chunk_id"]]))
+    for chunk_id in cache.chunks.keys() - live:
+        del cache.chunks[chunk_id]
+    return updates, recompiled
+
+
+def _distribution(components: Counter[str], body: int) -> tuple[dict[str, int], dict[str, float]]:
+    """Counts per component (known components first) and their share of the ``body`` non-header fragments."""
+    distribution = {name: components[name] for name in COMPONENTS}
+    distribution.update((name, n) for name, n in sorted(components.items()) if n and name not in distribution)
+    percentage = {
+        name: 0.0 if name in HEADERS or not body else _round(100.0 * n / body) for name, n in distribution.items()
+    }
+    return distribution, percentage
+
+
+def compile_totals(manifest: dict, cache: BuildCache) -> dict[str, Any]:
+    """Manifest-level fields, straight from the running counters."""
+    total = sum(cache.components.values())
+    headers = sum(cache.components[name] for name in HEADERS)
+    body = total - headers
+    distribution, percentage = _distribution(cache.components, body)
+    others_count = body - distribution["plaintext"]
+    shares = {**percentage, "others_combined": _round(100.0 * others_count / body) if body else 0.0}
+    targets = manifest.get("target_distribution", {})
+    plaintext_target, others_target = targets.get("plaintext", {}), targets.get("others_combined", {})
+    return {
+        "total_chunks": len(manifest.get("chunks", [])),
+        "total_fragments": total,
+        "component_distribution": distribution,
+        "component_distribution_percentage": percentage,
+        "_distribution_note": DISTRIBUTION_NOTE.format(
+            plaintext_min=plaintext_target.get("min", 0),
+            plaintext_max=plaintext_target.get("max", 0),
+            others_min=others_target.get("min", 0),
+            others_max=others_target.get("max", 0),
+            body=body,
+            total=total,
+            headers=headers,
+        ),
+        "saturation_warnings": saturation_warnings(shares, targets, manifest.get("saturation_warnings", [])),
+        "placeholders_inventory": sorted(key for key, n in cache.placeholders.items() if n > 0),
+    }
+
+
+def write_outputs(
+    raw: str, manifest: dict, updates: dict, inventory: list[str], cache: BuildCache, write: bool
+) -> list[str]:
+    """Patch chunks.json and render placeholders.txt; return the outputs that differ from disk."""
+    compiled = json_edit.patch(raw, updates)
+    if compiled != raw and "last_updated" in manifest:
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        compiled = json_edit.patch(compiled, {("last_updated",): now})
+    placeholders = PLACEHOLDERS_HEADER + "".join(f"{key}\n" for key in inventory)
+
+    stale = []
+    if compiled != raw:
+        stale.append(CHUNKS_PATH.name)
+    if not PLACEHOLDERS_PATH.exists() or PLACEHOLDERS_PATH.read_text(encoding="utf-8") != placeholders:
+        stale.append(PLACEHOLDERS_PATH.name)
+    if write:
+        write_if_changed(CHUNKS_PATH, compiled)
+        write_if_changed(PLACEHOLDERS_PATH, placeholders)
+        cache.save(hashlib.sha256(compiled.encode("utf-8")).hexdigest())
+    return stale
+
+
+def build(cache: BuildCache, write: bool = True) -> tuple[list[str], dict[str, int]]:
+    """Recompile what changed; return the outputs that differ from disk and build statistics."""
+    raw = CHUNKS_PATH.read_text(encoding="utf-8")
+    manifest = json.loads(raw)
+    full = hashlib.sha256(raw.encode("utf-8")).hexdigest() != cache.output
+
+    changed = reconcile_fragments(manifest, cache)
+    updates, chunks_recompiled = compile_chunks(manifest, cache, changed, full)
+    top = compile_totals(manifest, cache)
+    updates.update(((key,), value) for key, value in top.items() if key in manifest)
+    stale = write_outputs(raw, manifest, updates, top["placeholders_inventory"], cache, write)
+
+    stats = {"fragments": len(cache.fragments), "recompiled": len(changed), "chunks_recompiled": chunks_recompiled}
+    return stale, stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="exit 1 instead of writing when outputs are stale")
+    parser.add_argument("--no-cache", action="store_true", help="recompile every fragment")
+    args = parser.parse_args(argv)
+
+    cache = BuildCache(None if args.no_cache else CACHE_PATH)
+    started = time.perf_counter()
+    stale, stats = build(cache, write=not args.check)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(
+        f"📦 {stats['fragments']} fragments: {stats['recompiled']} recompiled, "
+        f"{stats['chunks_recompiled']} chunks recompiled in {elapsed:.1f} ms"
+    )
+    for chunk_id, compiled in sorted(cache.chunks.items()):
+        if not compiled["no_consecutive"]:
+            print(f"⚠️  {chunk_id}: consecutive components in {compiled['component_sequence']} (ADR-014)")
+    for name in stale:
+        print(f"❌ {name} is out of date" if args.check else f"  ✏️  updated {name}")
+    return 1 if args.check and stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
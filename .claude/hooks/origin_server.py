@@ -0,0 +1,645 @@
+#!/usr/bin/env python3
+"""Local asyncio HTTP origin for raw-text/, for testing CDN caching before a release.
+
+Serves the working tree or, with ``--tag``, the raw-text/ of a pinned git tag.
+Files are addressed by their raw-text relative path, with or without the
+``online-resources/raw-text/`` prefix, so CDN-style URLs map directly.
+
+    ETag            strong, the SHA256 listed in meta/integrity.txt (nothing is
+                    hashed per request; working-tree files and integrity.txt
+                    itself are hashed once at startup, and a file that already
+                    differs from its listing is served like a changed one, below).
+                    Encoded variants get ``"<sha256>-gzip"``/``-br``.
+    If-None-Match   304 against the ETag of the selected representation
+    Range           single ``bytes=`` ranges on the identity body, 206/416;
+                    ``If-Range`` is honoured, multi-range requests get a 200
+    Encoding        gzip (and brotli when the ``brotli`` package is installed)
+                    variants are built at startup and kept in
+                    .claude/cache/origin-variants/, keyed by digest; a variant
+                    is only written after the bytes it compresses are checked
+                    against that digest. ``--precompress`` fills that cache and
+                    exits, for release jobs
+    Bodies          working-tree files up to 1 MiB come from an LRU memory
+                    cache (``--cache-mb``), larger ones go out with sendfile;
+                    pinned tags are held in memory. A working-tree file that
+                    does not match integrity.txt at startup, or whose size or
+                    mtime changed since, is served without an ETag or variants
+                    and with ``no-store`` until integrity.txt is regenerated and
+                    the server restarted.
+
+``GET /_twin/<twin or .txt path>`` returns a metadata twin together with its
+.txt in one JSON document (ETag derived from both digests). ``GET /_stats``
+returns request counters for load tests.
+
+Usage:
+    python .claude/hooks/origin_server.py                      # working tree on 127.0.0.1:8787
+    python .claude/hooks/origin_server.py --tag v2.3.0 --port 8080
+    python .claude/hooks/origin_server.py --tag v2.3.0 --precompress
+    curl -sI -H 'Accept-Encoding: gzip' http://127.0.0.1:8787/tables/017-principios-fundamentais-etica.tsv.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import gzip
+import hashlib
+import json
+import os
+import subprocess  # fixed git argv only  # nosec B404
+import sys
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from http import HTTPStatus
+from pathlib import Path
+from typing import BinaryIO
+from urllib.parse import unquote, urlsplit
+
+from corpus import CACHE_DIR, RAW_TEXT_DIR, RAW_TEXT_PREFIX, REPO_ROOT, repo_path_to_rel
+from integrity_engine import INTEGRITY_REL, hash_file, parse_integrity
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip variants without it
+    brotli = None
+
+VARIANTS_DIR = CACHE_DIR / "origin-variants"
+TWIN_PREFIX = "_twin/"
+STATS_PATH = "_stats"
+CONTENT_TYPES = {
+    ".txt": "text/plain; charset=utf-8",
+    ".json": "application/json",
+    ".md": "text/markdown; charset=utf-8",
+}
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+MIN_COMPRESS_BYTES = 256
+MAX_CACHED_FILE = 1 << 20
+MAX_HEADER_BYTES = 16 * 1024
+KEEPALIVE_TIMEOUT = 15
+SERVER = "ceocont-origin"
+
+
+class OriginError(Exception):
+    pass
+
+
+class RangeNotSatisfiableError(Exception):
+    pass
+
+
+@dataclass
+class Entry:
+    """One servable resource and its precomputed representations."""
+
+    rel: str
+    etag: str
+    content_type: str
+    size: int
+    path: Path | None = None  # working-tree file, read per request
+    stat: tuple[int, int] | None = None  # (size, mtime_ns) the ETag was taken for
+    body: bytes | None = None  # pinned tag file or twin bundle
+    sources: tuple[Entry, ...] = ()  # files a twin bundle is built from
+    variants: dict[str, tuple[bytes, str]] = field(default_factory=dict)
+
+
+class LRU:
+    """Byte-budgeted least-recently-used cache of identity bodies."""
+
+    def __init__(self, budget: int) -> None:
+        self.budget = budget
+        self.used = 0
+        self.items: OrderedDict[str, bytes] = OrderedDict()
+
+    def get(self, key: str) -> bytes | None:
+        data = self.items.get(key)
+        if data is not None:
+            self.items.move_to_end(key)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.budget:
+            return
+        self.discard(key)
+        self.items[key] = data
+        self.used += len(data)
+        while self.used > self.budget:
+            _, evicted = self.items.popitem(last=False)
+            self.used -= len(evicted)
+
+    def discard(self, key: str) -> None:
+        data = self.items.pop(key, None)
+        if data is not None:
+            self.used -= len(data)
+
+
+def content_type(rel: str) -> str:
+    return CONTENT_TYPES.get(os.path.splitext(rel)[1], "application/octet-stream")
+
+
+def load_worktree(root: Path = RAW_TEXT_DIR) -> dict[str, Entry]:
+    """Entries for the files of ``root`` listed in its integrity.txt, plus integrity.txt itself.
+
+    Every file is hashed once; one that no longer matches its listing gets no ``stat``, so it is never fresh.
+    """
+    integrity = root / INTEGRITY_REL
+    digests = dict(parse_integrity(integrity.read_text(encoding="utf-8")))
+    digests[INTEGRITY_REL] = hash_file(str(integrity))
+    entries = {}
+    for rel, digest in digests.items():
+        path = root / rel
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            print(f"⚠️  {rel} is listed in {INTEGRITY_REL} but missing; not served", file=sys.stderr)
+            continue
+        stat = (st.st_size, st.st_mtime_ns)
+        if hash_file(str(path)) != digest:
+            print(f"⚠️  {rel} does not match {INTEGRITY_REL}; served without an ETag", file=sys.stderr)
+            stat = None
+        entries[rel] = Entry(rel, f'"{digest}"', content_type(rel), st.st_size, path=path, stat=stat)
+    return entries
+
+
+def load_tag(tag: str) -> dict[str, Entry]:
+    """Entries for the raw-text/ of git revision ``tag``, held in memory."""
+    integrity = _git_blobs(tag, [INTEGRITY_REL])[INTEGRITY_REL]
+    digests = dict(parse_integrity(integrity.decode("utf-8")))
+    blobs = _git_blobs(tag, list(digests))
+    blobs[INTEGRITY_REL] = integrity
+    digests[INTEGRITY_REL] = hashlib.sha256(integrity).hexdigest()
+    return {
+        rel: Entry(rel, f'"{digests[rel]}"', content_type(rel), len(data), body=data) for rel, data in blobs.items()
+    }
+
+
+def _git_blobs(rev: str, rels: list[str]) -> dict[str, bytes]:
+    batch = "".join(f"{rev}:{RAW_TEXT_PREFIX}{rel}\n" for rel in rels).encode("utf-8")
+    cmd = ["git", "cat-file", "--batch"]
+    # Fixed git argv, no shell
+    result = subprocess.run(cmd, cwd=REPO_ROOT, input=batch, capture_output=True)  # nosec B603
+    if result.returncode:
+        raise OriginError(f"git cat-file: {result.stderr.decode().strip()}")
+    out, pos, blobs = result.stdout, 0, {}
+    for rel in rels:
+        end = out.index(b"\n", pos)
+        header = out[pos:end].split()
+        if len(header) != 3 or header[1] != b"blob":
+            raise OriginError(f"{rev}: {RAW_TEXT_PREFIX}{rel} is not in the tree")
+        size = int(header[2])
+        blobs[rel] = out[end + 1 : end + 1 + size]
+        pos = end + 2 + size
+    return blobs
+
+
+def read(entry: Entry) -> bytes:
+    """Current identity body of ``entry``."""
+    if entry.sources:
+        return build_twin(*entry.sources)
+    if entry.body is not None:
+        return entry.body
+    return entry.path.read_bytes()
+
+
+def build_twin(twin: Entry, txt: Entry, twin_data: bytes | None = None, txt_data: bytes | None = None) -> bytes:
+    """The ``_twin/`` document of a twin and its .txt, from their current bodies unless given."""
+    document = {
+        "path_json": RAW_TEXT_PREFIX + twin.rel,
+        "sha256_json": twin.etag.strip('"'),
+        "twin": json.loads(read(twin) if twin_data is None else twin_data),
+        "path_txt": RAW_TEXT_PREFIX + txt.rel,
+        "sha256_txt": txt.etag.strip('"'),
+        "txt": (read(txt) if txt_data is None else txt_data).decode("utf-8"),
+    }
+    return json.dumps(document, ensure_ascii=False).encode("utf-8")
+
+
+def add_twin_bundles(entries: dict[str, Entry]) -> int:
+    """Register ``_twin/<twin>`` and ``_twin/<txt>`` for every twin with a .txt."""
+    bundles = {}
+    for rel, twin in entries.items():
+        txt = entries.get(rel[: -len(".json")] + ".txt") if rel.endswith(".json") else None
+        if txt is None or rel.startswith("meta/"):
+            continue
+        try:
+            body = build_twin(twin, txt)
+        except ValueError as exc:
+            print(f"⚠️  {rel}: {exc}; no twin bundle", file=sys.stderr)
+            continue
+        etag = hashlib.sha256(f"{twin.etag}{txt.etag}".encode()).hexdigest()
+        bundle = Entry(TWIN_PREFIX + rel, f'"{etag}"', CONTENT_TYPES[".json"], len(body), body=body)
+        bundle.sources = (twin, txt)
+        bundles[bundle.rel] = bundles[TWIN_PREFIX + txt.rel] = bundle
+    entries.update(bundles)
+    return len(bundles) // 2
+
+
+def compress(data: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, 9, mtime=0)
+
+
+def verified_read(entry: Entry) -> bytes | None:
+    """Identity body of ``entry`` if every working-tree file behind it still has its listed digest, else None.
+
+    A file that fails the check loses its ``stat``, so it is served as changed from then on.
+    """
+    if entry.sources:
+        parts = [verified_read(source) for source in entry.sources]
+        return None if None in parts else build_twin(*entry.sources, *parts)
+    data = read(entry)
+    if entry.path is None or hashlib.sha256(data).hexdigest() == entry.etag.strip('"'):
+        return data
+    print(f"⚠️  {entry.rel} does not match {INTEGRITY_REL}; no encoded variants", file=sys.stderr)
+    entry.stat = None
+    return None
+
+
+def cached_variant(entry: Entry, coding: str, data: Callable[[], bytes | None]) -> tuple[bytes | None, bool]:
+    """The ``coding`` variant of ``entry`` from the variant cache, or compressed from ``data()`` and written out.
+
+    Returns the variant, None when ``data()`` fails verification, and whether it had to be built.
+    """
+    digest = entry.etag.strip('"')
+    cached = VARIANTS_DIR / f"{digest}.{coding}"
+    try:
+        return cached.read_bytes(), False
+    except FileNotFoundError:
+        pass
+    body = data()
+    if body is None:
+        return None, False
+    encoded = compress(body, coding)
+    cached.write_bytes(encoded)
+    return encoded, True
+
+
+def _compressible(entry: Entry) -> bool:
+    if entry.size < MIN_COMPRESS_BYTES or entry.content_type == "application/octet-stream":
+        return False
+    return not any(source.path is not None and source.stat is None for source in entry.sources or (entry,))
+
+
+def precompress(entries: dict[str, Entry]) -> Counter:
+    """Attach encoded variants worth serving, reusing the on-disk variant cache.
+
+    Variants are keyed by the ETag digest, so they are only built from bytes checked against it; entries already
+    known to differ from integrity.txt get none.
+    """
+    VARIANTS_DIR.mkdir(parents=True, exist_ok=True)
+    built: Counter = Counter()
+    for entry in {id(entry): entry for entry in entries.values()}.values():
+        if not _compressible(entry):
+            continue
+        # Read and verify the identity body at most once, and only if some variant is not cached yet
+        data = functools.cache(functools.partial(verified_read, entry))
+        digest = entry.etag.strip('"')
+        for coding in ENCODINGS:
+            encoded, fresh = cached_variant(entry, coding, data)
+            if encoded is None:
+                break
+            if fresh:
+                built[coding] += 1
+            if len(encoded) < entry.size * 0.9:
+                entry.variants[coding] = (encoded, f'"{digest}-{coding}"')
+    return built
+
+
+def negotiate(accept: str, offered: dict[str, tuple[bytes, str]]) -> str | None:
+    """Preferred offered coding for an ``Accept-Encoding`` header, or None for identity."""
+    weights = {}
+    for item in accept.split(","):
+        coding, _, params = item.partition(";")
+        q = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+    best, best_q = None, 0.0
+    for coding in ENCODINGS:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if coding in offered and q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def _bounds(first: str, last: str, size: int) -> tuple[int, int]:
+    """Inclusive bounds of ``first-last`` (or a ``-last`` suffix); ValueError if either is not a number."""
+    if not first:
+        return max(size - int(last), 0), size - 1
+    return int(first), int(last) if last else size - 1
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Inclusive ``(start, end)`` of a single ``bytes=`` range, None when it should be ignored."""
+    unit, _, spec = header.partition("=")
+    first, dash, last = spec.strip().partition("-")
+    if unit.strip().lower() != "bytes" or "," in spec or not dash:
+        return None
+    try:
+        start, end = _bounds(first, last, size)
+    except ValueError:
+        return None
+    if end < start < size:
+        return None
+    if start >= size or (not first and int(last) == 0):
+        raise RangeNotSatisfiableError
+    return start, min(end, size - 1)
+
+
+def select_range(header: str, size: int, out: dict[str, str]) -> tuple[HTTPStatus, int, int]:
+    """Status, offset and length to send for a ``Range`` header ('' for none), adding Content-Range to ``out``."""
+    byte_range = parse_range(header, size) if header else None
+    if byte_range is None:
+        return HTTPStatus.OK, 0, size
+    start, end = byte_range
+    out["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return HTTPStatus.PARTIAL_CONTENT, start, end - start + 1
+
+
+def parse_head(head: bytes) -> tuple[str, str, str, dict[str, str]] | None:
+    """Method, target, version and lower-cased headers of a request head; None if the request line is malformed."""
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ")
+    if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+        return None
+    headers = {}
+    for line in lines[1:]:
+        name, colon, value = line.partition(":")
+        if colon:
+            headers[name.strip().lower()] = value.strip()
+    return parts[0], parts[1], parts[2], headers
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of ``If-None-Match`` against ``etag``."""
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class Origin:
+    def __init__(self, entries: dict[str, Entry], immutable: bool, cache_bytes: int, access_log: bool) -> None:
+        self.entries = entries
+        self.cache_control = "public, max-age=31536000, immutable" if immutable else "no-cache"
+        self.lru = LRU(cache_bytes)
+        self.access_log = access_log
+        self.stats: Counter = Counter()
+        self.warned: set[str] = set()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while await self.exchange(reader, writer):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Read and answer one request; whether the connection stays open for another."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+        except asyncio.LimitOverrunError:
+            await self.simple(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "GET", close=True)
+            return False
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return False
+        request = parse_head(head)
+        if request is None:
+            await self.simple(writer, HTTPStatus.BAD_REQUEST, "GET", close=True)
+            return False
+        method, target, version, headers = request
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+        started = time.perf_counter()
+        status, length, coding = await self.respond(writer, method, target, headers, keep_alive)
+        self.stats["requests"] += 1
+        self.stats[f"status_{status}"] += 1
+        if self.access_log:
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f'"{method} {target}" {status} {length} {coding or "-"} {elapsed:.2f}ms', flush=True)
+        return keep_alive
+
+    async def respond(
+        self, writer: asyncio.StreamWriter, method: str, target: str, headers: dict[str, str], keep_alive: bool
+    ) -> tuple[int, int, str | None]:
+        if method not in ("GET", "HEAD"):
+            return await self.simple(writer, HTTPStatus.METHOD_NOT_ALLOWED, method, keep_alive, {"Allow": "GET, HEAD"})
+        rel = repo_path_to_rel(unquote(urlsplit(target).path).lstrip("/"))
+        if rel == STATS_PATH:
+            body = json.dumps({**self.stats, "lru_bytes": self.lru.used}, sort_keys=True).encode("utf-8")
+            extra = {"Content-Type": CONTENT_TYPES[".json"], "Cache-Control": "no-store"}
+            return await self.simple(writer, HTTPStatus.OK, method, keep_alive, extra, body)
+        entry = self.entries.get(rel)
+        if entry is None:
+            return await self.simple(writer, HTTPStatus.NOT_FOUND, method, keep_alive)
+        return await self.respond_entry(writer, method, entry, headers, keep_alive)
+
+    async def respond_entry(
+        self, writer: asyncio.StreamWriter, method: str, entry: Entry, headers: dict[str, str], keep_alive: bool
+    ) -> tuple[int, int, str | None]:
+        """Negotiate, check preconditions and send one entry."""
+        fresh = all(self.fresh(source) for source in entry.sources or (entry,))
+        out = {"Content-Type": entry.content_type, "Vary": "Accept-Encoding", "Accept-Ranges": "bytes"}
+        out["Cache-Control"] = self.cache_control if fresh else "no-store"
+        ranged = "range" in headers and (not fresh or headers.get("if-range", entry.etag) == entry.etag)
+        if not fresh:
+            return await self.send_identity(writer, method, entry, headers, keep_alive, out, ranged)
+        coding, body, etag = (None, None, entry.etag) if ranged else self.encode(entry, headers, out)
+        out["ETag"] = etag
+        if etag_matches(headers.get("if-none-match", ""), etag):
+            return await self.not_modified(writer, method, keep_alive, out)
+        if coding is None:
+            return await self.send_identity(writer, method, entry, headers, keep_alive, out, ranged)
+        status, length, _ = await self.simple(writer, HTTPStatus.OK, method, keep_alive, out, body)
+        return status, length, coding
+
+    def encode(
+        self, entry: Entry, headers: dict[str, str], out: dict[str, str]
+    ) -> tuple[str | None, bytes | None, str]:
+        """The negotiated variant's coding, body and ETag; ``(None, None, entry.etag)`` for identity."""
+        coding = negotiate(headers.get("accept-encoding", ""), entry.variants)
+        if coding is None:
+            return None, None, entry.etag
+        body, etag = entry.variants[coding]
+        out["Content-Encoding"] = coding
+        self.stats[f"encoding_{coding}"] += 1
+        return coding, body, etag
+
+    async def not_modified(
+        self, writer: asyncio.StreamWriter, method: str, keep_alive: bool, out: dict[str, str]
+    ) -> tuple[int, int, None]:
+        del out["Content-Type"], out["Accept-Ranges"]
+        out.pop("Content-Encoding", None)
+        return await self.simple(writer, HTTPStatus.NOT_MODIFIED, method, keep_alive, out)
+
+    async def send_identity(
+        self,
+        writer: asyncio.StreamWriter,
+        method: str,
+        entry: Entry,
+        headers: dict[str, str],
+        keep_alive: bool,
+        out: dict[str, str],
+        ranged: bool,
+    ) -> tuple[int, int, None]:
+        """Send the identity body, or the requested byte range of it, from memory or with sendfile."""
+        fresh = "ETag" in out  # respond_entry only sets an ETag on fresh entries
+        body, handle, still_fresh = self.identity(entry, fresh)
+        with handle or contextlib.nullcontext():
+            if fresh and not still_fresh:
+                del out["ETag"]
+                out["Cache-Control"] = "no-store"
+            size = len(body) if body is not None else entry.size
+            try:
+                status, start, length = select_range(headers["range"] if ranged else "", size, out)
+            except RangeNotSatisfiableError:
+                out["Content-Range"] = f"bytes */{size}"
+                return await self.simple(writer, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, method, keep_alive, out)
+            await self.send_head(writer, status, out, length, keep_alive)
+            if method == "GET":
+                await self.send_bytes(writer, body, handle, start, length)
+            await writer.drain()
+            return status.value, length, None
+
+    async def send_bytes(
+        self, writer: asyncio.StreamWriter, body: bytes | None, handle: BinaryIO | None, start: int, length: int
+    ) -> None:
+        if handle is None:
+            writer.write(body[start : start + length] if length != len(body) else body)
+            return
+        self.stats["sendfile"] += 1
+        await writer.drain()
+        await asyncio.get_running_loop().sendfile(writer.transport, handle, start, length)
+
+    def identity(self, entry: Entry, fresh: bool) -> tuple[bytes | None, BinaryIO | None, bool]:
+        """Identity body (or an open handle for sendfile) and whether the ETag still describes it."""
+        if entry.path is None:
+            return (entry.body if fresh else read(entry)), None, fresh
+        if not fresh:
+            self.lru.discard(entry.rel)
+            return entry.path.read_bytes(), None, False
+        cached = self.lru.get(entry.rel)
+        if cached is not None:
+            self.stats["lru_hits"] += 1
+            return cached, None, True
+        self.stats["lru_misses"] += 1
+        handle = open(entry.path, "rb")  # noqa: SIM115 - send_identity closes it with a with block
+        st = os.fstat(handle.fileno())
+        if (st.st_size, st.st_mtime_ns) != entry.stat:
+            with handle:
+                return handle.read(), None, False
+        if st.st_size <= min(MAX_CACHED_FILE, self.lru.budget):
+            with handle:
+                data = handle.read()
+            self.lru.put(entry.rel, data)
+            return data, None, True
+        return None, handle, True
+
+    def fresh(self, entry: Entry) -> bool:
+        if entry.path is None:
+            return True
+        try:
+            st = entry.path.stat()
+        except FileNotFoundError:
+            st = None
+        if st is not None and (st.st_size, st.st_mtime_ns) == entry.stat:
+            return True
+        if entry.rel not in self.warned:
+            self.warned.add(entry.rel)
+            print(f"⚠️  {entry.rel} changed since startup; serving it without an ETag", file=sys.stderr)
+        self.stats["stale"] += 1
+        return False
+
+    async def simple(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        method: str,
+        keep_alive: bool = False,
+        headers: dict[str, str] | None = None,
+        body: bytes = b"",
+        close: bool = False,
+    ) -> tuple[int, int, None]:
+        headers = dict(headers or {})
+        if status == HTTPStatus.NOT_MODIFIED:
+            await self.send_head(writer, status, headers, None, keep_alive and not close)
+        else:
+            if not body and status >= 400:
+                body = f"{status.value} {status.phrase}\n".encode()
+                headers.setdefault("Content-Type", CONTENT_TYPES[".txt"])
+            await self.send_head(writer, status, headers, len(body), keep_alive and not close)
+            if method != "HEAD":
+                writer.write(body)
+        await writer.drain()
+        return status.value, len(body), None
+
+    @staticmethod
+    async def send_head(
+        writer: asyncio.StreamWriter, status: HTTPStatus, headers: dict[str, str], length: int | None, keep_alive: bool
+    ) -> None:
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}", f"Date: {formatdate(usegmt=True)}", f"Server: {SERVER}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+
+async def serve(origin: Origin, host: str, port: int, label: str) -> None:
+    server = await asyncio.start_server(origin.handle, host, port, limit=MAX_HEADER_BYTES)
+    files = sum(1 for rel in origin.entries if not rel.startswith(TWIN_PREFIX))
+    print(f"🌐 {label}: {files} files on http://{host}:{port}/ (Ctrl+C to stop)", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def report_variants(entries: dict[str, Entry], built: Counter) -> None:
+    unique = {id(entry): entry for entry in entries.values()}.values()
+    encoded = Counter(coding for entry in unique for coding in entry.variants)
+    summary = ", ".join(f"{encoded[coding]} {coding} ({built[coding]} built)" for coding in ENCODINGS)
+    print(f"📦 variants: {summary}" + ("" if brotli else "; brotli not installed"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tag", help="serve the raw-text/ of this git tag/revision instead of the working tree")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--cache-mb", type=float, default=64, help="LRU budget for working-tree bodies (0: sendfile)")
+    parser.add_argument("--no-compress", action="store_true", help="serve identity bodies only")
+    parser.add_argument("--precompress", action="store_true", help="build the encoded variant cache and exit")
+    parser.add_argument("--access-log", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        entries = load_tag(args.tag) if args.tag else load_worktree()
+    except (OriginError, OSError) as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    twins = add_twin_bundles(entries)
+    if not args.no_compress:
+        report_variants(entries, precompress(entries))
+    if args.precompress:
+        return 0
+
+    label = f"raw-text@{args.tag}" if args.tag else "raw-text (working tree)"
+    print(f"🧩 {twins} twin bundles under /{TWIN_PREFIX}")
+    cache_bytes = int(args.cache_mb * 1024 * 1024)
+    origin = Origin(entries, immutable=bool(args.tag), cache_bytes=cache_bytes, access_log=args.access_log)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(origin, args.host, args.port, label))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""Compiled placeholder renderer for per-firm bundles of the raw-text corpus.
+
+Every fragment is scanned for ``${key}`` once and compiled into a tuple of
+pre-encoded literal parts with holes at the slot positions. Rendering a
+tenant resolves its values into a slot table and fills the holes of each
+template; no regex runs and no string is concatenated per tenant. Templates
+come from the .txt files rather than the twins' transformed_text: the
+validator's twin-sync rule keeps the two identical, and headers and faqs
+have no twin.
+
+Tenant values are validated against the ``type``/``format``/``required``
+metadata declared in the twins' ``placeholders`` arrays (ADR-007).
+
+Usage:
+    python .claude/hooks/placeholder_renderer.py                  # corpus report
+    python .claude/hooks/placeholder_renderer.py --tenants firms.jsonl --out dist/
+
+Each line of the tenants file is ``{"tenant_id": "slug", "values": {"razao-social": "..."}}``;
+keys may be given bare or as ``${key}``. Every tenant_id must be unique within the file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import tarfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from multiprocessing import Pool
+from pathlib import Path
+
+from corpus import CHUNKS_PATH, PLACEHOLDER, PLACEHOLDERS_PATH, RAW_TEXT_DIR, iter_raw_text, load_json
+
+TENANT_ID = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+DEFAULT_DATE_FORMAT = "DD/MM/YYYY"
+DATE_TOKENS = (("YYYY", "%Y"), ("DD", "%d"), ("MM", "%m"))
+PARALLEL_MIN_TENANTS = 32
+
+
+class TenantError(Exception):
+    """The tenants file cannot be rendered as a whole."""
+
+
+@dataclass
+class PlaceholderSpec:
+    key: str
+    type: str = "string"
+    format: str | None = None
+    required: bool = True
+    description: str = ""
+    declared_in: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Template:
+    """A fragment split into literal bytes with holes for slots.
+
+    ``parts[pos]`` is ``b""`` for every ``(pos, slot)`` in ``holes``.
+    """
+
+    rel: str
+    parts: tuple[bytes, ...]
+    holes: tuple[tuple[int, int], ...]
+
+
+@dataclass
+class CompiledCorpus:
+    keys: tuple[str, ...]  # slot id -> placeholder key (without ``${}``)
+    specs: dict[str, PlaceholderSpec]
+    templates: tuple[Template, ...]
+    conflicts: list[str]
+
+
+def bare_key(key: str) -> str:
+    return key[2:-1] if key.startswith("${") and key.endswith("}") else key
+
+
+def compile_template(rel: str, text: str, slot_of: dict[str, int]) -> Template:
+    parts: list[bytes] = []
+    holes: list[tuple[int, int]] = []
+    pos = 0
+    for match in PLACEHOLDER.finditer(text):
+        parts.append(text[pos : match.start()].encode("utf-8"))
+        slot = slot_of.setdefault(match.group(1), len(slot_of))
+        holes.append((len(parts), slot))
+        parts.append(b"")
+        pos = match.end()
+    parts.append(text[pos:].encode("utf-8"))
+    return Template(rel, tuple(parts), tuple(holes))
+
+
+def load_specs() -> tuple[dict[str, PlaceholderSpec], list[str]]:
+    """Merge the placeholder metadata of every twin, reporting disagreements."""
+    specs: dict[str, PlaceholderSpec] = {}
+    conflicts = []
+    for rel in iter_raw_text():
+        if not rel.endswith(".json") or rel.startswith("meta/"):
+            continue
+        for entry in load_json(RAW_TEXT_DIR / rel).get("placeholders", []):
+            key = bare_key(entry["key"])
+            spec = PlaceholderSpec(
+                key=key,
+                type=entry.get("type", "string"),
+                format=entry.get("format"),
+                required=entry.get("required", True),
+                description=entry.get("description", ""),
+            )
+            known = specs.get(key)
+            if known is None:
+                specs[key] = spec
+            elif (known.type, known.format) != (spec.type, spec.format):
+                conflicts.append(f"${{{key}}}: {rel} declares {spec.type} but {known.declared_in[0]} {known.type}")
+            else:
+                known.required = known.required or spec.required
+            specs[key].declared_in.append(rel)
+    return specs, conflicts
+
+
+def compile_corpus() -> CompiledCorpus:
+    slot_of: dict[str, int] = {}
+    templates = []
+    for rel in iter_raw_text():
+        if rel.endswith(".txt") and not rel.startswith("meta/"):
+            text = (RAW_TEXT_DIR / rel).read_text(encoding="utf-8")
+            templates.append(compile_template(rel, text, slot_of))
+    specs, conflicts = load_specs()
+    keys = tuple(sorted(slot_of, key=slot_of.__getitem__))
+    return CompiledCorpus(keys, specs, tuple(templates), conflicts)
+
+
+# --- tenant values ---------------------------------------------------------------
+
+
+def _date_pattern(fmt: str) -> str:
+    for token, directive in DATE_TOKENS:
+        fmt = fmt.replace(token, directive)
+    return fmt
+
+
+def _coerce_integer(value: object) -> tuple[str | None, str | None]:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value), None
+    if isinstance(value, str) and re.fullmatch(r"-?\d+", value.strip()):
+        return value.strip(), None
+    return None, f"expected integer, got {value!r}"
+
+
+def _text_error(spec: PlaceholderSpec, value: str) -> str | None:
+    """Why a non-empty string is not a valid ``date`` or ``reference`` value; None if it is."""
+    if spec.type == "date":
+        fmt = spec.format or DEFAULT_DATE_FORMAT
+        try:
+            datetime.strptime(value, _date_pattern(fmt))
+        except ValueError:
+            return f"expected date {fmt}, got {value!r}"
+    elif spec.type == "reference" and (value.startswith("/") or ".." in value or "://" in value):
+        return f"reference must be a relative raw-text path, got {value!r}"
+    return None
+
+
+def coerce(spec: PlaceholderSpec, value: object) -> tuple[str | None, str | None]:
+    """Return ``(rendered value, error)`` for ``value`` under ``spec``."""
+    if spec.type == "integer":
+        return _coerce_integer(value)
+    if not isinstance(value, str) or not value.strip():
+        return None, f"expected non-empty {spec.type}, got {value!r}"
+    error = _text_error(spec, value)
+    return (None, error) if error else (value, None)
+
+
+@dataclass
+class TenantResult:
+    tenant_id: str
+    rendered: bool = False
+    files: int = 0
+    bytes: int = 0
+    invalid: dict[str, str] = field(default_factory=dict)
+    unresolved: list[str] = field(default_factory=list)
+    orphaned: list[str] = field(default_factory=list)
+
+
+def _slot(spec: PlaceholderSpec, value: object, result: TenantResult) -> bytes:
+    """Rendered bytes of one slot; a missing or invalid value keeps its ``${key}`` and is recorded in ``result``."""
+    if value is None:
+        result.unresolved.append(spec.key)
+        if spec.required:
+            result.invalid[spec.key] = "required value missing"
+        return f"${{{spec.key}}}".encode()
+    rendered, error = coerce(spec, value)
+    if error:
+        result.invalid[spec.key] = error
+        rendered = f"${{{spec.key}}}"
+    return rendered.encode("utf-8")
+
+
+def resolve(corpus: CompiledCorpus, tenant_id: str, values: dict) -> tuple[list[bytes], TenantResult]:
+    """Build the slot table for one tenant; unresolved optional slots keep their ``${key}``."""
+    result = TenantResult(tenant_id)
+    if not TENANT_ID.match(tenant_id):
+        result.invalid["tenant_id"] = "must be a lowercase slug"
+    given = {bare_key(k): v for k, v in values.items()}
+    table = [_slot(corpus.specs.get(key) or PlaceholderSpec(key), given.get(key), result) for key in corpus.keys]
+    used = set(corpus.keys)
+    result.orphaned = sorted(k for k in given if k not in used)
+    return table, result
+
+
+# --- rendering -----------------------------------------------------------------
+
+_worker: dict = {}
+
+
+def _init_worker(corpus: CompiledCorpus, out_dir: Path, fmt: str) -> None:
+    _worker.update(corpus=corpus, out_dir=out_dir, fmt=fmt)
+
+
+def iter_rendered(corpus: CompiledCorpus, table: list[bytes]) -> Iterator[tuple[str, list[bytes]]]:
+    for template in corpus.templates:
+        if not template.holes:
+            yield template.rel, list(template.parts)
+            continue
+        parts = list(template.parts)
+        for pos, slot in template.holes:
+            parts[pos] = table[slot]
+        yield template.rel, parts
+
+
+def discard_bundle(out_dir: Path, result: TenantResult, fmt: str) -> None:
+    """Remove the bundle an earlier run left for a tenant that now fails validation."""
+    if "tenant_id" in result.invalid:
+        return  # not a safe path component, so nothing was ever written under it
+    if fmt == "tar":
+        (out_dir / f"{result.tenant_id}.tar").unlink(missing_ok=True)
+    else:
+        shutil.rmtree(out_dir / result.tenant_id, ignore_errors=True)
+
+
+def render_tenant(tenant: dict) -> TenantResult:
+    corpus: CompiledCorpus = _worker["corpus"]
+    out_dir: Path = _worker["out_dir"]
+    table, result = resolve(corpus, str(tenant.get("tenant_id", "")), tenant.get("values", {}))
+    if result.invalid:
+        discard_bundle(out_dir, result, _worker["fmt"])
+        return result
+
+    if _worker["fmt"] == "tar":
+        tmp = out_dir / f".{result.tenant_id}.tar.tmp"
+        with tarfile.open(tmp, "w", format=tarfile.PAX_FORMAT) as bundle:
+            for rel, parts in iter_rendered(corpus, table):
+                data = b"".join(parts)
+                info = tarfile.TarInfo(f"{result.tenant_id}/{rel}")
+                info.size = len(data)
+                info.mode = 0o644
+                bundle.addfile(info, io.BytesIO(data))
+                result.files += 1
+                result.bytes += info.size
+        os.replace(tmp, out_dir / f"{result.tenant_id}.tar")
+    else:
+        root = out_dir / result.tenant_id
+        for rel, parts in iter_rendered(corpus, table):
+            target = root / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, "wb") as handle:
+                handle.writelines(parts)
+            result.files += 1
+            result.bytes += sum(map(len, parts))
+    result.rendered = True
+    return result
+
+
+def render_all(
+    corpus: CompiledCorpus, tenants: Iterable[dict], out_dir: Path, fmt: str, jobs: int
+) -> list[TenantResult]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tenants = list(tenants)
+    if jobs > 1 and len(tenants) >= PARALLEL_MIN_TENANTS:
+        with Pool(jobs, initializer=_init_worker, initargs=(corpus, out_dir, fmt)) as pool:
+            return list(pool.imap_unordered(render_tenant, tenants, chunksize=max(1, len(tenants) // (jobs * 8))))
+    _init_worker(corpus, out_dir, fmt)
+    return [render_tenant(tenant) for tenant in tenants]
+
+
+def load_tenants(path: Path) -> list[dict]:
+    """Read the tenants file: one JSON object per line, with no tenant_id repeated (bundles would share a path)."""
+    tenants = []
+    first_line: dict[str, int] = {}
+    with open(path, encoding="utf-8") as handle:
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                tenant = json.loads(line.rstrip())
+            except json.JSONDecodeError as exc:
+                raise TenantError(f"{path}:{number}: invalid JSON: {exc.msg} (column {exc.colno})") from exc
+            if not isinstance(tenant, dict):
+                raise TenantError(f"{path}:{number}: expected a JSON object, got {type(tenant).__name__}")
+            tenant_id = str(tenant.get("tenant_id", ""))
+            if tenant_id in first_line:
+                raise TenantError(f"{path}:{number}: duplicate tenant_id {tenant_id!r} (line {first_line[tenant_id]})")
+            first_line[tenant_id] = number
+            tenants.append(tenant)
+    return tenants
+
+
+# --- reports -------------------------------------------------------------------
+
+
+def _wrap(keys: Iterable[str]) -> list[str]:
+    return sorted(f"${{{key}}}" for key in keys)
+
+
+def corpus_report(corpus: CompiledCorpus) -> dict:
+    used = set(corpus.keys)
+    listed = {
+        match.group(1)
+        for line in PLACEHOLDERS_PATH.read_text(encoding="utf-8").splitlines()
+        if not line.startswith("#") and (match := PLACEHOLDER.fullmatch(line.strip()))
+    }
+    inventory = set()
+    if CHUNKS_PATH.exists():
+        inventory = {bare_key(k) for k in load_json(CHUNKS_PATH).get("placeholders_inventory", [])}
+    declared = set(corpus.specs)
+    return {
+        "templates": len(corpus.templates),
+        "templates_with_slots": sum(1 for t in corpus.templates if t.holes),
+        "keys_used": _wrap(used),
+        "used_without_twin_metadata": _wrap(used - declared),
+        "declared_but_unused": _wrap((declared | listed | inventory) - used),
+        "missing_from_placeholders_txt": _wrap(used - listed),
+        "missing_from_chunks_inventory": _wrap(used - inventory),
+        "conflicting_metadata": corpus.conflicts,
+    }
+
+
+def tenants_report(results: list[TenantResult]) -> dict:
+    failed = sum(1 for r in results if not r.rendered)
+    return {
+        "rendered": len(results) - failed,
+        "failed": failed,
+        "issues": [
+            {"tenant_id": r.tenant_id, "invalid": r.invalid, "unresolved": r.unresolved, "orphaned": r.orphaned}
+            for r in results
+            if r.invalid or r.unresolved or r.orphaned
+        ],
+    }
+
+
+def render_tenants(corpus: CompiledCorpus, tenants: list[dict], args: argparse.Namespace, report: dict) -> int:
+    """Render every tenant bundle and write render-report.json next to them; 1 if any tenant failed validation."""
+    results = render_all(corpus, tenants, args.out, args.bundle_format, args.jobs)
+    results.sort(key=lambda r: r.tenant_id)
+    report["tenants"] = tenants_report(results)
+    args.out.mkdir(parents=True, exist_ok=True)
+    (args.out / "render-report.json").write_text(
+        json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+    )
+    rendered, failed = report["tenants"]["rendered"], report["tenants"]["failed"]
+    print(f"📦 {rendered} bundles rendered to {args.out}, {failed} failed validation")
+    return 1 if failed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenants", type=Path, help="JSONL file with one tenant per line")
+    parser.add_argument("--out", type=Path, default=Path("dist/bundles"), help="output directory")
+    parser.add_argument("--bundle-format", choices=("tar", "dir"), default="tar")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    try:
+        tenants = load_tenants(args.tenants) if args.tenants else None
+    except TenantError as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    corpus = compile_corpus()
+    report = {"corpus": corpus_report(corpus)}
+    if tenants is not None:
+        return render_tenants(corpus, tenants, args, report)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Portuguese (pt-BR) text analysis shared by the corpus engines.
+
+Accent folding, tokenisation and a light suffix-stripping stemmer in the
+spirit of RSLP: plural reduction, a short list of derivational suffixes and
+final vowel removal, so that ``ético``/``ética``/``éticos`` and
+``profissional``/``profissionais`` conflate.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    """
+    a ao aos as com como da das de do dos e em entre na nas no nos o os ou para pela pelas pelo pelos
+    por que se sem sob sua suas seu seus um uma umas uns isso esta este esse essa nao mais ja
+    """.split()
+)
+
+PLURALS = (("oes", "ao"), ("aes", "ao"), ("ais", "al"), ("eis", "el"), ("ois", "ol"), ("ns", "m"), ("res", "r"))
+SUFFIXES = (
+    "amentos",
+    "imentos",
+    "amento",
+    "imento",
+    "idades",
+    "idade",
+    "mente",
+    "acoes",
+    "acao",
+    "icao",
+    "ismo",
+    "ista",
+    "avel",
+    "ivel",
+    "ador",
+)
+MIN_STEM = 4
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip diacritics (``Ética`` -> ``etica``)."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _singular(word: str) -> str:
+    for suffix, replacement in PLURALS:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM - 1:
+            return word[: -len(suffix)] + replacement
+    if word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def _strip_suffix(word: str) -> str:
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[: -len(suffix)]
+    return word
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    if len(word) <= MIN_STEM or word.isdigit():
+        return word
+    word = _strip_suffix(_singular(word))
+    if len(word) > MIN_STEM and word[-1] in "aeo":
+        word = word[:-1]
+    return word
+
+
+def words(text: str) -> list[str]:
+    """Folded word tokens, stopwords included."""
+    return TOKEN.findall(fold(text))
+
+
+def terms(text: str) -> list[str]:
+    """Index terms: folded, stopwords removed, stemmed."""
+    return [stem(word) for word in words(text) if word not in STOPWORDS]
+
+
+def counts(text: str) -> tuple[int, int]:
+    """``(word_count, character_count)`` as recorded in twins and chunks.json.
+
+    Words are whitespace-delimited and characters are code points, trailing newline included.
+    """
+    return len(text.split()), len(text)
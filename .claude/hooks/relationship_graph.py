@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""Relationship graph over the metadata twins and the chunks.json fragment order.
+
+Nodes are the content_ids of every chunks.json fragment and every twin,
+interned to consecutive integers in corpus order. Each edge kind is kept as a
+pair of compressed adjacency arrays (offsets + targets, forward and reverse):
+
+    references   twin ``relationships.references``
+    related      twin ``relationships.related_fragments``
+    sequence     fragment n -> fragment n+1 inside a chunk
+
+``referenced_by`` is never hand-maintained: it is the reverse of
+``references`` and ``check --write`` patches it into the twins. ``check``
+also flags links to unknown content_ids (errors) and ``related_fragments``
+that the other twin does not reciprocate (warnings).
+
+``impact`` answers "what must be re-validated if these fragments change" with
+a breadth-first walk over the reverse edges, so its cost is linear in the
+affected subgraph rather than in the corpus. ``--include-sequence`` adds the
+chunk neighbours of each affected fragment as a single, non-transitive hop.
+
+Usage:
+    python .claude/hooks/relationship_graph.py check [--write] [--strict]
+    python .claude/hooks/relationship_graph.py impact 017-principios-fundamentais-etica
+    python .claude/hooks/relationship_graph.py impact --changed-since main --include-related --paths
+    python .claude/hooks/relationship_graph.py dot [--out dist/diagrams]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import json_edit
+from corpus import (
+    CHUNKS_PATH,
+    RAW_TEXT_DIR,
+    RAW_TEXT_PREFIX,
+    REPO_ROOT,
+    git_changed_since,
+    iter_twins,
+    load_json,
+    repo_path_to_rel,
+    write_if_changed,
+)
+
+EDGE_KINDS = ("references", "related", "sequence")
+REFERENCED_BY = ("relationships", "referenced_by")
+DEFAULT_DOT_DIR = REPO_ROOT / "dist" / "diagrams"
+DOT_STYLE = {
+    "references": "",
+    "related": ' [style=dashed, color="gray40"]',
+    "sequence": ' [style=dotted, arrowhead=none, color="gray70"]',
+}
+
+
+class Adjacency:
+    """Compressed sparse rows: the neighbours of ``node`` are ``targets[offsets[node]:offsets[node + 1]]``."""
+
+    __slots__ = ("offsets", "targets")
+
+    def __init__(self, size: int, edges: Iterable[tuple[int, int]]) -> None:
+        pairs = sorted(set(edges))
+        counts = array("I", bytes(4 * (size + 1)))
+        for source, _ in pairs:
+            counts[source + 1] += 1
+        for node in range(size):
+            counts[node + 1] += counts[node]
+        self.offsets = counts
+        self.targets = array("I", (target for _, target in pairs))
+
+    def __getitem__(self, node: int) -> array:
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+
+@dataclass
+class Node:
+    content_id: str
+    component: str = ""
+    title: str = ""
+    chunk_id: str = ""
+    path_txt: str = ""  # raw-text relative; faq pairs point at their directory
+    twin: str = ""  # raw-text relative path of the metadata twin, if any
+
+
+@dataclass
+class Finding:
+    level: str  # "error" | "warning"
+    rule: str
+    content_id: str
+    message: str
+
+
+@dataclass
+class Graph:
+    nodes: list[Node] = field(default_factory=list)
+    index: dict[str, int] = field(default_factory=dict)
+    chunks: dict[str, list[int]] = field(default_factory=dict)
+    declared: dict[int, dict[str, list[str]]] = field(default_factory=dict)
+    by_path: dict[str, int] = field(default_factory=dict)  # path_txt and twin -> node
+    forward: dict[str, Adjacency] = field(default_factory=dict)
+    reverse: dict[str, Adjacency] = field(default_factory=dict)
+    findings: list[Finding] = field(default_factory=list)
+
+    def intern(self, content_id: str) -> int:
+        node = self.index.get(content_id)
+        if node is None:
+            node = self.index[content_id] = len(self.nodes)
+            self.nodes.append(Node(content_id))
+        return node
+
+    @classmethod
+    def build(cls, root: Path = RAW_TEXT_DIR, chunks_path: Path = CHUNKS_PATH) -> Graph:
+        graph = cls()
+        edges: dict[str, list[tuple[int, int]]] = {kind: [] for kind in EDGE_KINDS}
+        graph._add_chunks(load_json(chunks_path).get("chunks", []), edges["sequence"])
+        for rel in iter_twins(root):
+            graph._add_twin(rel, load_json(root / rel))
+        graph._link(edges)
+        for node, info in enumerate(graph.nodes):
+            for rel in (info.path_txt, info.twin):
+                if rel:
+                    graph.by_path.setdefault(rel, node)
+
+        size = len(graph.nodes)
+        for kind in EDGE_KINDS:
+            graph.forward[kind] = Adjacency(size, edges[kind])
+            graph.reverse[kind] = Adjacency(size, ((target, source) for source, target in edges[kind]))
+        graph._check_symmetry()
+        return graph
+
+    def _add_chunks(self, chunks: list[dict], sequence: list[tuple[int, int]]) -> None:
+        for chunk in chunks:
+            order = self.chunks.setdefault(chunk["chunk_id"], [])
+            for fragment in sorted(chunk.get("fragments", []), key=lambda item: item.get("seq", 0)):
+                node = self.intern(fragment["content_id"])
+                info = self.nodes[node]
+                info.component = fragment.get("component", "")
+                info.title = fragment.get("title", "")
+                info.chunk_id = chunk["chunk_id"]
+                info.path_txt = repo_path_to_rel(fragment.get("path_txt") or "")
+                if order:
+                    sequence.append((order[-1], node))
+                order.append(node)
+
+    def _add_twin(self, rel: str, twin: dict) -> None:
+        node = self.intern(twin.get("content_id", ""))
+        info = self.nodes[node]
+        info.twin = rel
+        info.component = info.component or twin.get("component", "")
+        info.title = info.title or twin.get("metadata", {}).get("title", "")
+        info.path_txt = info.path_txt or rel[: -len(".json")] + ".txt"
+        links = twin.get("relationships")
+        if isinstance(links, dict):
+            self.declared[node] = {
+                key: list(links.get(key) or []) for key in ("references", "referenced_by", "related_fragments")
+            }
+
+    def _link(self, edges: dict[str, list[tuple[int, int]]]) -> None:
+        """Turn declared content_id links into edges, recording the dangling ones."""
+        for node in sorted(self.declared):
+            links = self.declared[node]
+            for kind, key in (("references", "references"), ("related", "related_fragments")):
+                for target_id in links[key]:
+                    target = self.index.get(target_id)
+                    if target is None:
+                        self.findings.append(
+                            Finding("error", "dangling", self.nodes[node].content_id, f"{key} -> unknown {target_id}")
+                        )
+                    elif target != node:
+                        edges[kind].append((node, target))
+
+    def referenced_by(self, node: int) -> list[str]:
+        return [self.nodes[source].content_id for source in self.reverse["references"][node]]
+
+    def _check_symmetry(self) -> None:
+        for node in sorted(self.declared):
+            links = self.declared[node]
+            content_id = self.nodes[node].content_id
+            derived = self.referenced_by(node)
+            if links["referenced_by"] != derived:
+                message = f"declared {links['referenced_by']}, derived {derived}"
+                self.findings.append(Finding("error", "referenced-by-stale", content_id, message))
+            for target in self.forward["related"][node]:
+                if target in self.declared and node not in self.forward["related"][target]:
+                    self.findings.append(
+                        Finding(
+                            "warning",
+                            "related-asymmetric",
+                            content_id,
+                            f"related to {self.nodes[target].content_id}, which does not list it back",
+                        )
+                    )
+        for node, info in enumerate(self.nodes):
+            if self.reverse["references"][node] and node not in self.declared:
+                cause = "has no twin" if not info.twin else "twin has no relationships block"
+                self.findings.append(
+                    Finding("warning", "referenced-by-unrecorded", info.content_id, f"is referenced but {cause}")
+                )
+
+    def files(self, node: int) -> list[str]:
+        """Raw-text files backing ``node``: its text (both halves of a faq pair) and its twin."""
+        info = self.nodes[node]
+        texts = [info.path_txt + "q.txt", info.path_txt + "a.txt"] if info.path_txt.endswith("/") else [info.path_txt]
+        return [rel for rel in (*texts, info.twin) if rel]
+
+    def resolve(self, token: str) -> int | None:
+        """Map a content_id or a (repository- or raw-text-relative) file path to its node."""
+        if token in self.index:
+            return self.index[token]
+        rel = repo_path_to_rel(token.removeprefix("./"))
+        if rel.startswith("faqs/") and rel.count("/") >= 2:
+            rel = rel.rsplit("/", 1)[0] + "/"
+        return self.by_path.get(rel)
+
+    def impact(
+        self, seeds: Iterable[int], kinds: Iterable[str] = ("references",), neighbours: bool = False
+    ) -> list[tuple[int, int]]:
+        """Nodes transitively depending on ``seeds`` as ``(node, distance)`` in BFS order, seeds first.
+
+        With ``neighbours`` the previous and next fragment in the chunk of every affected node are added one hop
+        further out; they are not expanded themselves, since chunk adjacency (ADR-014) is not a dependency.
+        """
+        reverse = [self.reverse[kind] for kind in kinds]
+        distance: dict[int, int] = {}
+        queue: deque[int] = deque()
+        for seed in seeds:
+            if seed not in distance:
+                distance[seed] = 0
+                queue.append(seed)
+        while queue:
+            node = queue.popleft()
+            for adjacency in reverse:
+                for source in adjacency[node]:
+                    if source not in distance:
+                        distance[source] = distance[node] + 1
+                        queue.append(source)
+        if neighbours:
+            self._add_neighbours(distance)
+        return list(distance.items())
+
+    def _add_neighbours(self, distance: dict[int, int]) -> None:
+        """Add the chunk neighbours of every node in ``distance`` one hop further out, without following them."""
+        adjacent = (self.reverse["sequence"], self.forward["sequence"])
+        for node, depth in list(distance.items()):
+            for adjacency in adjacent:
+                for neighbour in adjacency[node]:
+                    distance.setdefault(neighbour, depth + 1)
+
+
+def write_referenced_by(graph: Graph, root: Path = RAW_TEXT_DIR) -> list[str]:
+    """Patch derived ``referenced_by`` arrays into the twins; return the twins rewritten."""
+    written = []
+    for node, links in graph.declared.items():
+        derived = graph.referenced_by(node)
+        if links["referenced_by"] == derived:
+            continue
+        path = root / graph.nodes[node].twin
+        raw = path.read_text(encoding="utf-8")
+        if write_if_changed(path, json_edit.patch(raw, {REFERENCED_BY: derived})):
+            written.append(graph.nodes[node].twin)
+    return written
+
+
+def _dot_id(text: str) -> str:
+    return json.dumps(text, ensure_ascii=False)
+
+
+def _dot_node(info: Node, extra: str = "", indent: str = "    ") -> str:
+    shape = "box" if info.twin else "plaintext"
+    return f'{indent}{_dot_id(info.content_id)} [label="{info.content_id}\\n{info.component}", shape={shape}{extra}];'
+
+
+def _dot_clusters(graph: Graph, members: list[int]) -> list[str]:
+    """Node lines of ``members``, grouped in one subgraph per chunk."""
+    chunk_of = {node: chunk_id for chunk_id, order in graph.chunks.items() for node in order}
+    clusters: dict[str, list[int]] = {}
+    for node in members:
+        clusters.setdefault(chunk_of.get(node, ""), []).append(node)
+    lines = []
+    for chunk_id, group in clusters.items():
+        if not chunk_id:
+            lines.extend(_dot_node(graph.nodes[node]) for node in group)
+            continue
+        lines.append(f"    subgraph {_dot_id('cluster_' + chunk_id)} {{")
+        lines.append(f"        label={_dot_id(chunk_id)};")
+        lines.extend(_dot_node(graph.nodes[node], indent="        ") for node in group)
+        lines.append("    }")
+    return lines
+
+
+def _dot_edges(graph: Graph, members: list[int]) -> tuple[list[int], list[str]]:
+    """Edges leaving ``members`` and the outside nodes they reach, in corpus order."""
+    selected = set(members)
+    external: set[int] = set()
+    edge_lines = []
+    for kind in EDGE_KINDS:
+        adjacency = graph.forward[kind]
+        for source in members:
+            for target in adjacency[source]:
+                if target not in selected:
+                    external.add(target)
+                edge_lines.append(
+                    f"    {_dot_id(graph.nodes[source].content_id)} -> "
+                    f"{_dot_id(graph.nodes[target].content_id)}{DOT_STYLE[kind]};"
+                )
+    return sorted(external), edge_lines
+
+
+def render_dot(graph: Graph, members: list[int] | None = None, name: str = "relationships") -> str:
+    """Graphviz digraph of ``members`` (the whole corpus by default) and the edges touching them."""
+    if members is None:
+        members = list(range(len(graph.nodes)))
+    lines = [f"digraph {_dot_id(name)} {{", "    rankdir=LR;", "    node [fontsize=10];"]
+    lines.extend(_dot_clusters(graph, members))
+    external, edge_lines = _dot_edges(graph, members)
+    lines.extend(_dot_node(graph.nodes[node], ", style=dashed") for node in external)
+    lines.extend(edge_lines)
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def write_dot(graph: Graph, out_dir: Path) -> list[Path]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    targets = [(out_dir / "relationships.dot.txt", render_dot(graph))]
+    for chunk_id, order in graph.chunks.items():
+        targets.append((out_dir / f"relationships-{chunk_id}.dot.txt", render_dot(graph, order, chunk_id)))
+    return [path for path, text in targets if write_if_changed(path, text)]
+
+
+def _print_findings(findings: list[Finding]) -> None:
+    for finding in findings:
+        icon = "❌" if finding.level == "error" else "⚠️ "
+        print(f"{icon} {finding.content_id}: [{finding.rule}] {finding.message}")
+
+
+def run_check(graph: Graph, write: bool, strict: bool) -> int:
+    findings = graph.findings
+    if write:
+        for rel in write_referenced_by(graph):
+            print(f"📝 {rel}: referenced_by updated")
+        findings = [finding for finding in findings if finding.rule != "referenced-by-stale"]
+    _print_findings(findings)
+    errors = sum(finding.level == "error" for finding in findings)
+    warnings = len(findings) - errors
+    edges = ", ".join(f"{len(graph.forward[kind])} {kind}" for kind in EDGE_KINDS)
+    print(f"🕸️  {len(graph.nodes)} nodes, {edges} edges: {errors} error(s), {warnings} warning(s)")
+    return 1 if errors or (strict and warnings) else 0
+
+
+def _seeds(graph: Graph, targets: list[str], changed_since: str | None) -> list[int] | None:
+    """Nodes for the explicit targets plus the files changed since a revision; None if a target is unknown."""
+    changed = git_changed_since(changed_since) if changed_since is not None else []
+    seeds = []
+    for token in [*targets, *changed]:
+        node = graph.resolve(token)
+        if node is None:
+            if changed_since is None or token in targets:
+                print(f"❌ unknown fragment: {token}", file=sys.stderr)
+                return None
+            continue  # README.md, meta/ files and the like are not graph nodes
+        seeds.append(node)
+    return seeds
+
+
+def _print_impact(graph: Graph, affected: list[tuple[int, int]], seeds: int, as_json: bool, paths: bool) -> None:
+    if as_json:
+        payload = [{**vars(graph.nodes[node]), "distance": depth} for node, depth in affected]
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+    elif paths:
+        for node, _ in affected:
+            for rel in graph.files(node):
+                print(f"{RAW_TEXT_PREFIX}{rel}")
+    else:
+        for node, depth in affected:
+            info = graph.nodes[node]
+            print(f"{'  ' * depth}{info.content_id} ({info.component})")
+        print(f"🕸️  {len(affected)} fragment(s) affected by {seeds} change(s)")
+
+
+def run_impact(graph: Graph, args: argparse.Namespace) -> int:
+    seeds = _seeds(graph, args.targets, args.changed_since)
+    if seeds is None:
+        return 2
+    kinds = ["references"]
+    if args.include_related:
+        kinds.append("related")
+    affected = graph.impact(seeds, kinds, neighbours=args.include_sequence)
+    _print_impact(graph, affected, len(seeds), args.json, args.paths)
+    return 0
+
+
+def run_dot(graph: Graph, out: Path) -> int:
+    written = write_dot(graph, out)
+    print(f"🕸️  {len(graph.chunks) + 1} diagram(s) in {out}, {len(written)} rewritten")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    check_cmd = sub.add_parser("check", help="report dangling, stale and asymmetric links")
+    check_cmd.add_argument("--write", action="store_true", help="patch derived referenced_by into the twins")
+    check_cmd.add_argument("--strict", action="store_true", help="fail on warnings too")
+    impact_cmd = sub.add_parser("impact", help="fragments transitively affected by a change")
+    impact_cmd.add_argument("targets", nargs="*", metavar="ID_OR_PATH")
+    impact_cmd.add_argument("--changed-since", metavar="REV", help="seed with files touched since a git revision")
+    impact_cmd.add_argument("--include-related", action="store_true", help="also follow related_fragments")
+    impact_cmd.add_argument(
+        "--include-sequence", action="store_true", help="also list each fragment's chunk neighbours (ADR-014)"
+    )
+    impact_cmd.add_argument("--paths", action="store_true", help="print file paths, one per line (validator input)")
+    impact_cmd.add_argument("--json", action="store_true")
+    dot_cmd = sub.add_parser("dot", help="export the graph as Graphviz *.dot.txt files")
+    dot_cmd.add_argument("--out", type=Path, default=DEFAULT_DOT_DIR)
+    args = parser.parse_args(argv)
+
+    graph = Graph.build()
+    if args.command == "check":
+        return run_check(graph, args.write, args.strict)
+    if args.command == "impact":
+        return run_impact(graph, args)
+    return run_dot(graph, args.out)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""Release delta manifests and an incremental mirror sync client.
+
+``delta`` diffs the meta/integrity.txt of two releases (git tags/revisions
+or exported raw-text/ directories) into added, modified, removed and renamed
+entries with SHA256 digests and sizes. Renames are taken from the
+``old → new`` lines of DEPRECATIONS.txt (ADR-008); any other path that
+disappears is a removal. It also writes the CDN purge list: every URL whose
+content differs between the two releases.
+
+``sync`` takes a local mirror of raw-text/ from the delta's ``from`` release
+to its ``to`` release. Only added and modified files are fetched, from a
+local directory or an HTTP base URL, and each is hashed while it streams to
+disk; unchanged and renamed-but-identical files are hard-linked from the
+current version. The mirror path is a symlink to a versioned directory
+(``<mirror>@<tag>``) and is repointed atomically once every file checks
+out, so readers never see a half-synced tree. A plain directory is adopted
+on the first sync. A delta may come from a URL, so before anything is
+fetched every path in it must be relative, free of ``..`` and resolve
+inside the new version directory.
+
+A mirror that is not at ``from`` is refused unless ``--force`` is given.
+The delta's unchanged paths then say nothing about what the mirror holds, so
+the new version is built from the ``to`` integrity.txt instead: each listed
+file is hashed in the current version and linked only if it matches, and
+fetched otherwise.
+
+Usage:
+    python .claude/hooks/release_delta.py delta v2.0.0 v2.1.0 --cdn-base https://cdn.example/raw-text
+    python .claude/hooks/release_delta.py sync --mirror ./raw-text --delta dist/releases/delta-v2.0.0-v2.1.0.json \\
+        --source https://cdn.example/gh/org/repo@v2.1.0/online-resources/raw-text
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess  # fixed git argv lists only  # nosec B404
+import sys
+import urllib.parse
+import urllib.request
+from collections.abc import Iterable, Iterator
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO
+
+from corpus import RAW_TEXT_PREFIX, REPO_ROOT, repo_path_to_rel, write_if_changed
+from integrity_engine import INTEGRITY_REL, hash_file, parse_integrity
+
+DELTA_VERSION = 1
+DEFAULT_OUT = REPO_ROOT / "dist" / "releases"
+DEPRECATIONS_REL = "DEPRECATIONS.txt"
+RENAME = re.compile(r"^\s*[-*]?\s*`?(?P<old>[^\s`]+)`?\s*(?:→|->)\s*`?(?P<new>[^\s`]+)`?")
+STREAM_CHUNK = 1 << 16
+HTTP_TIMEOUT = 30
+
+
+class SyncError(Exception):
+    pass
+
+
+@dataclass
+class Release:
+    """One side of a delta: its name, integrity listing, sizes and DEPRECATIONS.txt."""
+
+    name: str
+    integrity: bytes
+    digests: dict[str, str]
+    sizes: dict[str, int]
+    deprecations: str
+
+    @classmethod
+    def load(cls, spec: str) -> Release:
+        """Read a release from an exported raw-text/ directory or from a git revision."""
+        return cls.from_directory(Path(spec)) if os.path.isdir(spec) else cls.from_git(spec)
+
+    @classmethod
+    def from_directory(cls, root: Path) -> Release:
+        integrity = (root / INTEGRITY_REL).read_bytes()
+        digests = dict(parse_integrity(integrity.decode("utf-8")))
+        sizes = {rel: (root / rel).stat().st_size for rel in digests}
+        deprecations = root.parent.parent / DEPRECATIONS_REL
+        text = deprecations.read_text(encoding="utf-8") if deprecations.exists() else ""
+        # An exported checkout is named after its release: <release>/online-resources/raw-text
+        name = root.resolve().parent.parent.name if root.name == "raw-text" else root.name
+        return cls(name, integrity, digests, sizes, text)
+
+    @classmethod
+    def from_git(cls, spec: str) -> Release:
+        integrity = _git("show", f"{spec}:{RAW_TEXT_PREFIX}{INTEGRITY_REL}")
+        digests = dict(parse_integrity(integrity.decode("utf-8")))
+        batch = "".join(f"{spec}:{RAW_TEXT_PREFIX}{rel}\n" for rel in digests)
+        sizes = {}
+        for rel, line in zip(digests, _git("cat-file", "--batch-check", stdin=batch).decode().splitlines()):
+            fields = line.split()
+            if len(fields) != 3 or fields[1] != "blob":
+                raise SyncError(f"{spec}: {rel} is listed in {INTEGRITY_REL} but not in the tree")
+            sizes[rel] = int(fields[2])
+        try:
+            text = _git("show", f"{spec}:{DEPRECATIONS_REL}").decode("utf-8")
+        except SyncError:
+            text = ""
+        return cls(spec, integrity, digests, sizes, text)
+
+
+def _git(*args: str, stdin: str | None = None) -> bytes:
+    data = stdin.encode() if stdin is not None else None
+    # Fixed git subcommands without a shell; git is looked up on PATH like in every other hook
+    result = subprocess.run(["git", *args], cwd=REPO_ROOT, input=data, capture_output=True)  # nosec B603 B607
+    if result.returncode:
+        raise SyncError(f"git {' '.join(args)}: {result.stderr.decode().strip()}")
+    return result.stdout
+
+
+def parse_renames(text: str) -> dict[str, str]:
+    """``old -> new`` raw-text relative paths from DEPRECATIONS.txt."""
+    renames = {}
+    for line in text.splitlines():
+        match = RENAME.match(line)
+        if match and not line.lstrip().startswith("Format:"):
+            old, new = (repo_path_to_rel(match[key].removeprefix("./")) for key in ("old", "new"))
+            renames[old] = new
+    return renames
+
+
+def _renamed(old: Release, new: Release, removed: set[str], added: set[str]) -> list[dict]:
+    """DEPRECATIONS.txt renames whose old path disappeared and whose new path appeared."""
+    renames = parse_renames(new.deprecations)
+    return [
+        {
+            "path": renames[source],
+            "from": source,
+            "sha256": new.digests[renames[source]],
+            "size": new.sizes[renames[source]],
+            "previous_sha256": old.digests[source],
+        }
+        for source in sorted(removed)
+        if renames.get(source) in added
+    ]
+
+
+def _modified(old: Release, new: Release, old_integrity: str, new_integrity: str) -> list[dict]:
+    """Paths on both sides whose digest changed, integrity.txt (given by its digests) included."""
+    modified = [
+        {"path": rel, "sha256": new.digests[rel], "size": new.sizes[rel], "previous_sha256": old.digests[rel]}
+        for rel in old.digests.keys() & new.digests.keys()
+        if old.digests[rel] != new.digests[rel]
+    ]
+    if old_integrity != new_integrity:
+        # integrity.txt does not list itself; ship it so mirrors can verify against it
+        entry = {"path": INTEGRITY_REL, "sha256": new_integrity, "size": len(new.integrity)}
+        modified.append({**entry, "previous_sha256": old_integrity})
+    return sorted(modified, key=lambda entry: entry["path"])
+
+
+def diff(old: Release, new: Release) -> dict:
+    """The delta manifest taking ``old`` to ``new``."""
+    removed_paths = old.digests.keys() - new.digests.keys()
+    added_paths = new.digests.keys() - old.digests.keys()
+    renamed = _renamed(old, new, removed_paths, added_paths)
+    removed_paths -= {entry["from"] for entry in renamed}
+    added_paths -= {entry["path"] for entry in renamed}
+    old_integrity = hashlib.sha256(old.integrity).hexdigest()
+    new_integrity = hashlib.sha256(new.integrity).hexdigest()
+    modified = _modified(old, new, old_integrity, new_integrity)
+    added = [{"path": rel, "sha256": new.digests[rel], "size": new.sizes[rel]} for rel in sorted(added_paths)]
+    removed = [{"path": rel, "previous_sha256": old.digests[rel]} for rel in sorted(removed_paths)]
+    fetched = [*added, *modified, *(entry for entry in renamed if entry["sha256"] != entry["previous_sha256"])]
+
+    return {
+        "version": DELTA_VERSION,
+        "from": old.name,
+        "to": new.name,
+        "from_integrity_sha256": old_integrity,
+        "to_integrity_sha256": new_integrity,
+        "files": len(new.digests) + 1,
+        "download_bytes": sum(entry["size"] for entry in fetched),
+        "added": added,
+        "modified": modified,
+        "removed": removed,
+        "renamed": renamed,
+    }
+
+
+def purge_list(delta: dict, cdn_base: str = "") -> list[str]:
+    """URLs whose cached content is stale after the release (old and new sides of renames included)."""
+    paths = {entry["path"] for kind in ("added", "modified", "removed", "renamed") for entry in delta[kind]}
+    paths |= {entry["from"] for entry in delta["renamed"]}
+    base = cdn_base.rstrip("/") + "/" if cdn_base else RAW_TEXT_PREFIX
+    return [base + urllib.parse.quote(rel) for rel in sorted(paths)]
+
+
+def write_delta(delta: dict, out_dir: Path, cdn_base: str) -> tuple[Path, Path]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"{delta['from']}-{delta['to']}".replace("/", "_")
+    delta_path, purge_path = out_dir / f"delta-{stem}.json", out_dir / f"purge-{stem}.txt"
+    write_if_changed(delta_path, json.dumps(delta, ensure_ascii=False, indent=2) + "\n")
+    write_if_changed(purge_path, "".join(url + "\n" for url in purge_list(delta, cdn_base)))
+    return delta_path, purge_path
+
+
+# --- sync client ---------------------------------------------------------------
+
+
+def _is_url(spec: str) -> bool:
+    return spec.startswith(("http://", "https://"))
+
+
+def _open(source: str, rel: str) -> BinaryIO:
+    if _is_url(source):
+        url = source.rstrip("/") + "/" + urllib.parse.quote(rel)
+        # _is_url admits http(s) URLs only
+        return urllib.request.urlopen(url, timeout=HTTP_TIMEOUT)  # nosec B310
+    return open(Path(source) / rel, "rb")
+
+
+def load_delta(spec: str) -> dict:
+    if _is_url(spec):
+        # _is_url admits http(s) URLs only
+        with closing(urllib.request.urlopen(spec, timeout=HTTP_TIMEOUT)) as response:  # nosec B310
+            return json.load(response)
+    with open(spec, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _delta_paths(delta: dict) -> Iterable[str]:
+    for kind in ("added", "modified", "removed", "renamed"):
+        for entry in delta[kind]:
+            yield entry["path"]
+            if "from" in entry:
+                yield entry["from"]
+
+
+def check_paths(paths: Iterable[str], staging: Path, origin: str = "delta") -> None:
+    """Raise unless every path is relative, free of ``..`` and resolves under ``staging``."""
+    root = staging.resolve()
+    for rel in paths:
+        pure = PurePosixPath(rel)
+        if not rel or pure.is_absolute() or ".." in pure.parts or "\\" in rel:
+            raise SyncError(f"{origin} lists an unsafe path: {rel!r}")
+        resolved = (root / rel).resolve()
+        if resolved == root or root not in resolved.parents:
+            raise SyncError(f"{origin} path {rel!r} resolves outside {staging}")
+
+
+def fetch(source: str, rel: str, target: Path, sha256: str, size: int | None) -> int:
+    """Stream ``rel`` from ``source`` into ``target``, hashing as it goes; raise on any mismatch.
+
+    ``size`` is ``None`` for files integrity.txt lists without a size; only the digest is checked then.
+    Returns the number of bytes received.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    received = 0
+    with closing(_open(source, rel)) as stream, open(target, "wb") as out:
+        while True:
+            block = stream.read(STREAM_CHUNK)
+            if not block:
+                break
+            received += len(block)
+            if size is not None and received > size:
+                raise SyncError(f"{rel}: more than the expected {size} bytes")
+            digest.update(block)
+            out.write(block)
+    if (size is not None and received != size) or digest.hexdigest() != sha256:
+        expected = f"{sha256} ({size} bytes)" if size is not None else sha256
+        raise SyncError(f"{rel}: expected {expected}, got {digest.hexdigest()} ({received} bytes)")
+    return received
+
+
+def _current_version(mirror: Path) -> Path:
+    """Resolve the mirror symlink to its current version directory, adopting a plain directory."""
+    if mirror.is_symlink():
+        return mirror.parent / os.readlink(mirror)
+    if not mirror.is_dir():
+        raise SyncError(f"{mirror} is not a mirror directory")
+    return mirror
+
+
+def _swap(mirror: Path, version_dir: Path) -> None:
+    link = mirror.with_name(f".{mirror.name}.link")
+    if link.is_symlink():
+        link.unlink()
+    link.symlink_to(version_dir.name)
+    os.replace(link, mirror)
+
+
+def _listing(root: Path) -> dict[str, str]:
+    return dict(parse_integrity((root / INTEGRITY_REL).read_text(encoding="utf-8")))
+
+
+def _stage(current: Path, staging: Path, delta: dict, source: str) -> dict[str, int]:
+    """Build the new version in ``staging``: link what is unchanged, fetch the rest.
+
+    Only files the FROM integrity.txt lists are linked, so stray files in the mirror are left behind.
+    """
+    skip = {entry["path"] for kind in ("removed", "modified", "added") for entry in delta[kind]}
+    skip |= {entry["from"] for entry in delta["renamed"]} | {entry["path"] for entry in delta["renamed"]}
+    stats = {"fetched": 0, "linked": 0, "removed": len(delta["removed"]), "bytes": 0}
+    for rel in _listing(current).keys() - skip:
+        _link(current / rel, staging / rel)
+        stats["linked"] += 1
+    pending = [*delta["added"], *delta["modified"]]
+    for entry in delta["renamed"]:
+        if entry["sha256"] != entry["previous_sha256"]:
+            pending.append(entry)
+        else:
+            _link(current / entry["from"], staging / entry["path"])
+            stats["linked"] += 1
+    for entry in pending:
+        stats["bytes"] += fetch(source, entry["path"], staging / entry["path"], entry["sha256"], entry["size"])
+        stats["fetched"] += 1
+    return stats
+
+
+def _fetch_listing(staging: Path, delta: dict, source: str) -> tuple[dict[str, str], int]:
+    """Fetch the TO integrity.txt into ``staging``; its checked entries and the bytes received."""
+    listing = next((entry for entry in delta["modified"] if entry["path"] == INTEGRITY_REL), None)
+    if listing is None:
+        raise SyncError(f"delta does not ship the {delta['to']} {INTEGRITY_REL}; resync from scratch")
+    received = fetch(source, INTEGRITY_REL, staging / INTEGRITY_REL, listing["sha256"], listing["size"])
+    expected = _listing(staging)
+    check_paths(expected, staging, INTEGRITY_REL)
+    return expected, received
+
+
+def _link_or_fetch(current: Path, staging: Path, expected: dict[str, str], source: str, sizes: dict) -> dict[str, int]:
+    """Link each ``expected`` file that ``current`` holds with the listed digest; fetch the others."""
+    stats = {"fetched": 0, "linked": 0, "bytes": 0}
+    for rel, sha256 in expected.items():
+        have = current / rel
+        if have.is_file() and hash_file(str(have)) == sha256:
+            _link(have, staging / rel)
+            stats["linked"] += 1
+        else:
+            stats["bytes"] += fetch(source, rel, staging / rel, sha256, sizes.get(rel))
+            stats["fetched"] += 1
+    return stats
+
+
+def _count_removed(current: Path, expected: dict[str, str]) -> int:
+    """Files in ``current`` that the TO integrity.txt no longer lists."""
+    return sum(1 for rel in _walk(current) if rel not in expected and rel != INTEGRITY_REL)
+
+
+def _stage_verified(current: Path, staging: Path, delta: dict, source: str) -> dict[str, int]:
+    """Build the new version in ``staging`` from the TO integrity.txt, for a mirror that is not at FROM.
+
+    Every listed file is hashed in ``current`` and linked only if it has the TO digest; the rest is fetched.
+    """
+    expected, received = _fetch_listing(staging, delta, source)
+    sizes = {entry["path"]: entry["size"] for kind in ("added", "modified", "renamed") for entry in delta[kind]}
+    stats = _link_or_fetch(current, staging, expected, source, sizes)
+    return {
+        "fetched": stats["fetched"] + 1,
+        "linked": stats["linked"],
+        "removed": _count_removed(current, expected),
+        "bytes": stats["bytes"] + received,
+    }
+
+
+def _publish(mirror: Path, current: Path, target: Path) -> None:
+    """Point ``mirror`` at ``target`` and drop the version it pointed at before."""
+    if mirror.is_symlink():
+        _swap(mirror, target)
+        if current != target:
+            shutil.rmtree(current, ignore_errors=True)
+    else:
+        # First sync of a plain directory: move it aside, then point the mirror at the new version
+        adopted = mirror.with_name(f".{mirror.name}.adopted")
+        os.replace(mirror, adopted)
+        _swap(mirror, target)
+        shutil.rmtree(adopted, ignore_errors=True)
+
+
+def sync(mirror: Path, delta: dict, source: str, force: bool = False) -> dict[str, int]:
+    current = _current_version(mirror)
+    integrity = current / INTEGRITY_REL
+    have = hash_file(str(integrity)) if integrity.exists() else None
+    if have == delta["to_integrity_sha256"]:
+        return {"fetched": 0, "linked": 0, "removed": 0, "bytes": 0}
+    at_from = have == delta["from_integrity_sha256"]
+    if not at_from and not force:
+        raise SyncError(f"{mirror} is not at {delta['from']} (integrity.txt {have}); resync from scratch or --force")
+
+    target = mirror.with_name(f"{mirror.name}@{delta['to']}".replace("/", "_"))
+    staging = target.with_name(f".{target.name}.partial")
+    check_paths(_delta_paths(delta), staging)
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        stage = _stage if at_from else _stage_verified
+        stats = stage(current, staging, delta, source)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    _publish(mirror, current, target)
+    return stats
+
+
+def _walk(root: Path) -> Iterator[str]:
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            yield Path(dirpath, name).relative_to(root).as_posix()
+
+
+def _link(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    delta_cmd = sub.add_parser("delta", help="diff two releases into a delta manifest and a CDN purge list")
+    delta_cmd.add_argument("old", metavar="FROM", help="git tag/revision or exported raw-text/ directory")
+    delta_cmd.add_argument("new", metavar="TO", help="git tag/revision or exported raw-text/ directory")
+    delta_cmd.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    delta_cmd.add_argument("--cdn-base", default="", help="URL of raw-text/ on the CDN, used for the purge list")
+    sync_cmd = sub.add_parser("sync", help="bring a local mirror from the delta's FROM release to its TO release")
+    sync_cmd.add_argument("--mirror", type=Path, required=True)
+    sync_cmd.add_argument("--delta", required=True, help="delta manifest path or URL")
+    sync_cmd.add_argument("--source", required=True, help="raw-text/ of the TO release: directory or HTTP base URL")
+    sync_cmd.add_argument(
+        "--force", action="store_true", help="sync a mirror that is not at FROM, verifying every file against TO"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "delta":
+            delta = diff(Release.load(args.old), Release.load(args.new))
+            delta_path, purge_path = write_delta(delta, args.out, args.cdn_base)
+            counts = ", ".join(f"{len(delta[kind])} {kind}" for kind in ("added", "modified", "removed", "renamed"))
+            print(f"📦 {delta['from']} → {delta['to']}: {counts}, {delta['download_bytes']} bytes to download")
+            print(f"  ✏️  {delta_path}\n  ✏️  {purge_path}")
+            return 0
+        delta = load_delta(args.delta)
+        stats = sync(args.mirror, delta, args.source, args.force)
+    except (SyncError, OSError) as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    print(
+        f"✅ {args.mirror} at {delta['to']}: {stats['fetched']} fetched ({stats['bytes']} bytes), "
+        f"{stats['linked']} linked, {stats['removed']} removed"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
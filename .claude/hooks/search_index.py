@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""Persistent BM25 full-text index over the metadata twins.
+
+Documents are the twins' ``transformed_text`` plus ``metadata.title`` and
+``metadata.keywords`` (weighted 3x and 2x), analysed with pt-BR accent
+folding and light stemming (ptbr.py). Queries expand through
+``meta/abbr.json.txt`` (CFC <-> Conselho Federal de Contabilidade) and
+``meta/glossario.json.txt`` (term <-> slug, plus ``related`` entries at a
+lower weight), and can be filtered by component, section and target
+audience.
+
+The index is a single binary file: a JSON header (documents, term table
+with live document frequencies) followed by fixed-width postings (uint32 doc
+ids, uint16 term frequencies, and a uint32 permutation listing them by
+decreasing BM25 impact) that are decoded per term on first use. Queries walk
+the impact-ordered postings with Fagin's threshold algorithm: every document
+met is scored in full through a per-term doc id -> impact table, and the
+walk stops once the k-th score reaches the sum of the impacts at the
+frontier, so a selective query touches a few dozen postings instead of every
+one of its terms. The walk goes in rounds of growing depth whose set
+operations, pruning and scoring run in C rather than per posting.
+
+Updates are incremental: changed or removed twins are tombstoned, new
+versions are appended, and the file is compacted once tombstones pass a
+quarter of the live documents. Tombstoned postings never count towards
+document frequencies.
+
+Usage:
+    python .claude/hooks/search_index.py build [--rebuild]
+    python .claude/hooks/search_index.py query "independência do auditor" --component plaintext
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from heapq import nlargest
+from itertools import compress, repeat
+from operator import add, mul, neg
+from pathlib import Path
+
+from corpus import CACHE_DIR, META_DIR, RAW_TEXT_DIR, iter_twins, load_json
+from ptbr import terms
+
+INDEX_PATH = CACHE_DIR / "search-index.bin"
+MAGIC = b"CEOIDX2\n"
+FIELD_WEIGHTS = (("title", 3), ("keywords", 2), ("body", 1))
+ABBR_WEIGHT = 0.7
+RELATED_WEIGHT = 0.3
+K1 = 1.2
+B = 0.75
+COMPACT_RATIO = 0.25
+MAX_TF = 0xFFFF
+# Postings read per list in the first round of a query, and the growth of each following round
+FIRST_ROUND = 32
+ROUND_GROWTH = 1.5
+
+
+@dataclass
+class Doc:
+    rel: str
+    content_id: str
+    title: str
+    component: str
+    section: str
+    audience: list[str]
+    length: int
+    fingerprint: list[int]  # [size, mtime_ns] of the twin when indexed
+    live: bool = True
+
+
+@dataclass(frozen=True)
+class Hit:
+    score: float
+    content_id: str
+    title: str
+    component: str
+    rel: str
+
+
+@dataclass
+class _Impacts:
+    """One term's postings by decreasing BM25 impact ``tf / (tf + norm)``, before idf and query weight."""
+
+    ids: list[int]
+    values: list[float]
+    lookup: dict[int, float]  # random access by doc id
+
+
+def _frontier(lists: list[tuple[_Impacts, float]], depth: int) -> list[float]:
+    """Per list, the largest contribution of a document not met before position ``depth``."""
+    return [scale * impacts.values[depth] if depth < len(impacts.values) else 0.0 for impacts, scale in lists]
+
+
+def _candidates(lists: list[tuple[_Impacts, float]], docs: Iterable[int], floor: float, caps: list[float]) -> list[int]:
+    """The ``docs`` that can still reach ``floor`` when each list contributes at most its entry in ``caps``.
+
+    A list whose cap is needed to reach ``floor`` is required: documents it does not hold are dropped.
+    """
+    bound = sum(caps)
+    for (impacts, _), cap in zip(lists, caps):
+        if bound - cap < floor:
+            docs = filter(impacts.lookup.__contains__, docs)
+    return list(docs)
+
+
+def _score(lists: list[tuple[_Impacts, float]], docs: list[int]) -> list[tuple[float, int]]:
+    """``(score, -doc_id)`` for every document in ``docs``, summed list by list through the lookups."""
+    scores = [0.0] * len(docs)
+    for impacts, scale in lists:
+        contributions = map(mul, map(impacts.lookup.get, docs, repeat(0.0)), repeat(scale))
+        scores = list(map(add, scores, contributions))
+    return list(zip(scores, map(neg, docs)))
+
+
+def _top_k(lists: list[tuple[_Impacts, float]], k: int, mask: bytearray) -> list[tuple[float, int]]:
+    """Fagin's threshold algorithm over impact-ordered lists; returns a (score, -doc_id) min-heap.
+
+    The lists are read in rounds of growing depth. A document first met in a
+    round lies at or past the round's starting depth in every list, so the
+    impacts found there cap its score; the documents whose caps cannot reach
+    the k-th best score are dropped and the rest are scored in full through
+    the lookups. The walk stops once the k-th best score reaches the sum of
+    the caps at the new depth.
+    """
+    heap: list[tuple[float, int]] = []
+    seen: set[int] = set()
+    longest = max((len(impacts.ids) for impacts, _ in lists), default=0) if k > 0 else 0
+    depth, step = 0, max(FIRST_ROUND, k)
+    caps = _frontier(lists, 0)
+    while depth < longest:
+        end = depth + step
+        fresh = set().union(*(impacts.ids[depth:end] for impacts, _ in lists))
+        fresh -= seen
+        seen |= fresh
+        floor = heap[0][0] if len(heap) == k else 0.0
+        docs = _candidates(lists, compress(fresh, map(mask.__getitem__, fresh)), floor, caps)
+        heap = nlargest(k, heap + _score(lists, docs))
+        heap.reverse()  # ascending, so heap[0] is the k-th best
+        caps = _frontier(lists, end)
+        if len(heap) == k and heap[0][0] >= sum(caps):
+            break
+        depth, step = end, int(step * ROUND_GROWTH)
+    return heap
+
+
+def _contains(haystack: list[str], needle: list[str]) -> bool:
+    n = len(needle)
+    return n > 0 and any(haystack[i : i + n] == needle for i in range(len(haystack) - n + 1))
+
+
+class Expander:
+    """Query expansion from the glossary and abbreviation dictionaries."""
+
+    def __init__(self, meta_dir: Path = META_DIR) -> None:
+        # Each rule: (trigger term sequences, [(expansion terms, weight), ...])
+        self.rules: list[tuple[list[list[str]], list[tuple[list[str], float]]]] = []
+        abbr_path, glossary_path = meta_dir / "abbr.json.txt", meta_dir / "glossario.json.txt"
+        if abbr_path.exists():
+            for abbr, entry in load_json(abbr_path).get("abbreviations", {}).items():
+                short, full = terms(abbr), terms(entry.get("full", ""))
+                self.rules.append(([short], [(full, ABBR_WEIGHT)]))
+                self.rules.append(([full], [(short, ABBR_WEIGHT)]))
+        if glossary_path.exists():
+            entries = load_json(glossary_path).get("terms", {})
+            for slug, entry in entries.items():
+                forms = [terms(entry.get("term", "")), terms(slug.replace("-", " "))]
+                related = [terms(entries[r]["term"]) for r in entry.get("related", []) if r in entries]
+                expansions = [(form, ABBR_WEIGHT) for form in forms] + [(r, RELATED_WEIGHT) for r in related]
+                self.rules.append((forms, expansions))
+
+    def expand(self, query: str) -> dict[str, float]:
+        base = terms(query)
+        weights = dict.fromkeys(base, 1.0)
+        for triggers, expansions in self.rules:
+            if any(_contains(base, trigger) for trigger in triggers):
+                for expansion, weight in expansions:
+                    for term in expansion:
+                        weights[term] = max(weights.get(term, 0.0), weight)
+        return weights
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        self.docs: list[Doc] = []
+        self.by_rel: dict[str, int] = {}
+        self._table: dict[str, tuple[int, int, int]] = {}
+        self._blob: bytes = b""
+        self._postings: dict[str, tuple[array, array]] = {}
+        # Impact orders and live document frequencies; the table's stored ones
+        # hold until an update changes the documents or their lengths
+        self._orders: dict[str, array] = {}
+        self._df: dict[str, int] = {}
+        self._stored = False
+        self._impacts: dict[str, _Impacts] = {}
+        self._norm: array | None = None
+        self._masks: dict[tuple, bytearray] = {}
+        self.expander = Expander()
+
+    # --- persistence -------------------------------------------------------------
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH) -> SearchIndex:
+        index = cls()
+        with open(path, "rb") as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a search index")
+            (header_len,) = struct.unpack("<Q", handle.read(8))
+            header = json.loads(handle.read(header_len))
+            index._blob = handle.read()
+        index.docs = [Doc(**doc) for doc in header["docs"]]
+        index.by_rel = {doc.rel: i for i, doc in enumerate(index.docs) if doc.live}
+        index._table = {term: tuple(entry) for term, entry in header["terms"].items()}
+        index._stored = True
+        return index
+
+    def _read(self, typecode: str, start: int, count: int) -> array:
+        values = array(typecode)
+        values.frombytes(self._blob[start : start + values.itemsize * count])
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def _decode(self, term: str) -> tuple[array, array] | None:
+        cached = self._postings.get(term)
+        if cached is not None or term not in self._table:
+            return cached
+        offset, count, _ = self._table[term]
+        ids, tfs = self._read("I", offset, count), self._read("H", offset + 4 * count, count)
+        self._postings[term] = (ids, tfs)
+        return ids, tfs
+
+    def _order(self, term: str, ids: array, tfs: array) -> array:
+        """Positions of ``term``'s postings by decreasing impact, ties in doc id order."""
+        order = self._orders.get(term)
+        if order is None:
+            if self._stored and term in self._table:
+                offset, count, _ = self._table[term]
+                order = self._read("I", offset + 6 * count, count)
+            else:
+                norm = self._normalisers()
+                # Sorting is stable, so equal impacts keep ascending doc ids
+                order = array("I", sorted(range(len(ids)), key=lambda j: -tfs[j] / (tfs[j] + norm[ids[j]])))
+            self._orders[term] = order
+        return order
+
+    def _impact_list(self, term: str, ids: array, tfs: array) -> _Impacts:
+        impacts = self._impacts.get(term)
+        if impacts is None:
+            norm = self._normalisers()
+            order = self._order(term, ids, tfs)
+            by_impact = [ids[j] for j in order]
+            values = [tfs[j] / (tfs[j] + norm[ids[j]]) for j in order]
+            impacts = self._impacts[term] = _Impacts(by_impact, values, dict(zip(by_impact, values)))
+        return impacts
+
+    def _live_df(self, term: str, ids: array) -> int:
+        df = self._df.get(term)
+        if df is None:
+            if self._stored and term in self._table:
+                df = self._table[term][2]
+            elif len(self.by_rel) == len(self.docs):
+                df = len(ids)
+            else:
+                live = self._mask(None, None, None)
+                df = sum(live[doc_id] for doc_id in ids)
+            self._df[term] = df
+        return df
+
+    def save(self, path: Path = INDEX_PATH) -> None:
+        for term in self._table:
+            self._decode(term)
+        blob = bytearray()
+        table = {}
+        for term in sorted(self._postings):
+            ids, tfs = self._postings[term]
+            if not ids:
+                continue
+            table[term] = [len(blob), len(ids), self._live_df(term, ids)]
+            for values in (ids, tfs, self._order(term, ids, tfs)):
+                if sys.byteorder != "little":
+                    values = array(values.typecode, values)
+                    values.byteswap()
+                blob += values.tobytes()
+        header = json.dumps(
+            {"docs": [asdict(doc) for doc in self.docs], "terms": table}, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "wb") as handle:
+            handle.write(MAGIC)
+            handle.write(struct.pack("<Q", len(header)))
+            handle.write(header)
+            handle.write(blob)
+        os.replace(tmp, path)
+
+    # --- updates -----------------------------------------------------------------
+
+    def _add(self, rel: str, twin: dict, fingerprint: list[int]) -> None:
+        metadata = twin.get("metadata", {})
+        fields = {
+            "title": metadata.get("title", ""),
+            "keywords": " ".join(k.replace("-", " ") for k in metadata.get("keywords", [])),
+            "body": twin.get("transformed_text", ""),
+        }
+        tf: Counter[str] = Counter()
+        for name, weight in FIELD_WEIGHTS:
+            for term in terms(fields[name]):
+                tf[term] += weight
+        doc_id = len(self.docs)
+        self.docs.append(
+            Doc(
+                rel=rel,
+                content_id=twin.get("content_id", ""),
+                title=metadata.get("title", ""),
+                component=twin.get("component", ""),
+                section=metadata.get("section") or "",
+                audience=list(metadata.get("target_audience", [])),
+                length=sum(tf.values()),
+                fingerprint=fingerprint,
+            )
+        )
+        self.by_rel[rel] = doc_id
+        for term, count in tf.items():
+            ids, tfs = self._decode(term) or self._postings.setdefault(term, (array("I"), array("H")))
+            ids.append(doc_id)
+            tfs.append(min(count, MAX_TF))
+
+    def _remove(self, rel: str) -> None:
+        self.docs[self.by_rel.pop(rel)].live = False
+
+    def compact(self) -> None:
+        """Drop tombstoned documents and renumber the survivors."""
+        for term in self._table:
+            self._decode(term)
+        remap = {}
+        survivors = []
+        for old_id, doc in enumerate(self.docs):
+            if doc.live:
+                remap[old_id] = len(survivors)
+                survivors.append(doc)
+        for term, (ids, tfs) in list(self._postings.items()):
+            kept = [(remap[d], tf) for d, tf in zip(ids, tfs) if d in remap]
+            self._postings[term] = (array("I", (d for d, _ in kept)), array("H", (tf for _, tf in kept)))
+        self.docs = survivors
+        self.by_rel = {doc.rel: i for i, doc in enumerate(survivors)}
+
+    def update(self, root: Path = RAW_TEXT_DIR) -> dict[str, int]:
+        """Re-index only twins whose size or mtime changed since the last build."""
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        seen = set()
+        for rel in iter_twins(root):
+            seen.add(rel)
+            st = os.stat(root / rel)
+            fingerprint = [st.st_size, st.st_mtime_ns]
+            known = self.by_rel.get(rel)
+            if known is not None and self.docs[known].fingerprint == fingerprint:
+                stats["unchanged"] += 1
+                continue
+            if known is not None:
+                self._remove(rel)
+            self._add(rel, load_json(root / rel), fingerprint)
+            stats["updated" if known is not None else "added"] += 1
+        for rel in [rel for rel in self.by_rel if rel not in seen]:
+            self._remove(rel)
+            stats["removed"] += 1
+        if len(self.docs) - len(self.by_rel) > COMPACT_RATIO * max(1, len(self.by_rel)):
+            self.compact()
+        self._invalidate(changed=stats["added"] + stats["updated"] + stats["removed"] > 0)
+        return stats
+
+    def _invalidate(self, changed: bool) -> None:
+        if changed:
+            # Lengths, the average length or liveness moved: stored orders and frequencies are stale
+            self._stored = False
+            self._orders.clear()
+            self._df.clear()
+        self._norm = None
+        self._masks.clear()
+        self._impacts.clear()
+
+    # --- queries -----------------------------------------------------------------
+
+    def _normalisers(self) -> array:
+        if self._norm is None:
+            live = [doc.length for doc in self.docs if doc.live]
+            avgdl = sum(live) / len(live) if live else 1.0
+            self._norm = array("d", (K1 * (1 - B + B * doc.length / avgdl) for doc in self.docs))
+        return self._norm
+
+    def _mask(self, component: str | None, section: str | None, audience: str | None) -> bytearray:
+        key = (component, section, audience)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = bytearray(
+                doc.live
+                and (component is None or doc.component == component)
+                and (section is None or doc.section == section)
+                and (audience is None or audience in doc.audience)
+                for doc in self.docs
+            )
+            self._masks[key] = mask
+        return mask
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        component: str | None = None,
+        section: str | None = None,
+        audience: str | None = None,
+    ) -> list[Hit]:
+        lists = []
+        total = len(self.by_rel)
+        for term, weight in self.expander.expand(query).items():
+            postings = self._decode(term)
+            df = self._live_df(term, postings[0]) if postings else 0
+            if df:
+                idf = weight * math.log(1 + (total - df + 0.5) / (df + 0.5))
+                lists.append((self._impact_list(term, *postings), idf * (K1 + 1)))
+        top = _top_k(lists, k, self._mask(component, section, audience))
+        hits = []
+        for score, negated_id in sorted(top, reverse=True):
+            doc = self.docs[-negated_id]
+            hits.append(Hit(round(score, 4), doc.content_id, doc.title, doc.component, doc.rel))
+        return hits
+
+
+def build(rebuild: bool = False, path: Path = INDEX_PATH) -> dict[str, int]:
+    index = SearchIndex()
+    if not rebuild and path.exists():
+        try:
+            index = SearchIndex.load(path)
+        except ValueError:
+            rebuild = True  # written by an older format
+    stats = index.update()
+    if rebuild or any(stats[key] for key in ("added", "updated", "removed")) or not path.exists():
+        index.save(path)
+    return stats
+
+
+def _print_hits(hits: Iterable[Hit], elapsed_us: float, as_json: bool) -> None:
+    hits = list(hits)
+    if as_json:
+        print(json.dumps({"elapsed_us": round(elapsed_us, 1), "hits": [asdict(h) for h in hits]}, ensure_ascii=False))
+        return
+    for hit in hits:
+        print(f"{hit.score:8.4f}  {hit.component:<12} {hit.content_id}  {hit.title}")
+    print(f"🔎 {len(hits)} hit(s) in {elapsed_us:.0f} µs")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="create or incrementally update the index")
+    build_cmd.add_argument("--rebuild", action="store_true", help="discard the existing index first")
+    query_cmd = sub.add_parser("query", help="run a BM25 query")
+    query_cmd.add_argument("text")
+    query_cmd.add_argument("-k", type=int, default=10)
+    query_cmd.add_argument("--component")
+    query_cmd.add_argument("--section")
+    query_cmd.add_argument("--audience")
+    query_cmd.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        stats = build(args.rebuild)
+        print("📚 search index: " + ", ".join(f"{count} {key}" for key, count in stats.items()))
+        return 0
+
+    try:
+        index = SearchIndex.load()
+    except (FileNotFoundError, ValueError):
+        build(rebuild=True)
+        index = SearchIndex.load()
+    started = time.perf_counter()
+    hits = index.search(args.text, args.k, args.component, args.section, args.audience)
+    _print_hits(hits, (time.perf_counter() - started) * 1e6, args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
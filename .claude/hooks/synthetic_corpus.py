@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""Deterministic synthetic checkouts of the corpus for benchmarking.
+
+Writes a contract-valid repository root (online-resources/raw-text/,
+chunks.json, placeholders.txt, server-brandguide.spec) with any number of
+fragments. The same ``--fragments``/``--seed`` always produce the same bytes.
+
+    mix            HEADER_SHARE of the fragments are structural headers; of
+                   the rest, plaintext sits at the midpoint of chunks.json
+                   ``target_distribution.plaintext`` and OTHERS_MIX splits the
+                   remainder. Chunks never repeat a component back to back.
+    fragments      twins for every twinned component, faqs/NNN-slug/{q,a}.txt
+                   pairs, TSV tables and data, +/- tradeoffs, DOT diagrams,
+                   docks within MAX_DOCK_CHARS, and ``${...}`` placeholders
+                   declared in the twins of PLACEHOLDER_SHARE of the body
+    relationships  ``references`` with their derived ``referenced_by`` and
+                   symmetric ``related_fragments``
+    scores         brandguide_compliance and quality_metrics computed by
+                   brandguide_scorer.py, so ``--check`` passes on the result
+    manifests      chunks.json derived fields are compiled by
+                   manifest_compiler.py; meta/TREE.txt and meta/integrity.txt
+                   are rendered as integrity_engine.py would
+
+Point the engines at the result with ``CEOCONT_REPO_ROOT``.
+
+Usage:
+    python .claude/hooks/synthetic_corpus.py /tmp/corpus-10k --fragments 10000
+    CEOCONT_REPO_ROOT=/tmp/corpus-10k python .claude/hooks/content_validator.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import subprocess  # fixed argv running manifest_compiler.py only  # nosec B404
+import sys
+from collections import Counter
+from pathlib import Path
+
+import brandguide_scorer
+import json_edit
+from content_validator import MAX_DOCK_CHARS
+from corpus import CHUNKS_PATH, META_DIR, RAW_TEXT_PREFIX, REPO_ROOT, TOOLS_DIR, load_json
+from integrity_engine import INTEGRITY_REL, TREE_REL, render_integrity, render_tree, sha256_text
+from ptbr import fold
+
+GENERATOR_VERSION = 5
+MARKER = ".synthetic-corpus.json"
+TIMESTAMP = "2025-01-01T00:00:00Z"
+
+# Shares taken from the hand-written corpus: 17 of 51 fragments are headers,
+# and faqs/docks dominate the non-plaintext body
+HEADER_SHARE = 1 / 3
+HEADERS_MIX = {"header_h1": 3, "header_h2": 1}
+OTHERS_MIX = {
+    "faqs": 8,
+    "docks": 5,
+    "callouts": 2,
+    "tradeoffs": 1,
+    "tables": 1,
+    "data": 1,
+    "disclaimers": 1,
+    "diagrams": 1,
+    "others": 1,
+}
+TWINLESS = {"faqs", "header_h1", "header_h2", "header_h3"}
+SUFFIX = {"tables": ".tsv", "data": ".tsv", "diagrams": ".dot"}
+CHUNK_SIZE = 10
+PLACEHOLDER_SHARE = 0.15
+REFERENCE_SHARE = 0.2
+COPIED = ("server-brandguide.spec", "meta/abbr.json.txt", "meta/glossario.json.txt")
+
+PLACEHOLDERS = (
+    ("razao-social", "Razão social da firma contábil", "string", None),
+    ("responsavel-tecnico", "Nome do responsável técnico", "string", None),
+    ("data-atualizacao", "Data da última atualização", "date", "DD/MM/YYYY"),
+    ("numero-atualizacoes", "Número sequencial de atualizações", "integer", None),
+    ("documento-normativo", "Documento normativo de referência", "reference", None),
+    ("setor-administrativo", "Setor administrativo responsável", "string", None),
+)
+WORDS = """
+análise auditoria avaliação cliente código competência comportamento comunicação conduta confidencialidade
+conformidade contábil controle critério cumprimento dados decisão declaração dever documentação empresa
+equipe escritório ética evidência exigência firma gestão governança honorários independência informação
+integridade interesse irregularidade julgamento legislação liderança manual monitoramento norma objetividade
+obrigação orientação padrão parecer planejamento política prática prazo princípio procedimento processo
+profissional proteção qualidade registro regulamento relatório requisito responsabilidade revisão risco
+segurança serviço sigilo sistema supervisão técnica transparência treinamento zelo
+adequado anual aplicável claro constante contínuo documentado efetivo formal independente interno
+necessário objetivo periódico preciso relevante rigoroso
+assegura avalia comunica define documenta estabelece garante identifica mantém monitora orienta registra
+revisa supervisiona
+""".split()
+CONNECTORS = ("de", "da", "do", "para", "com", "e", "no", "na", "pela", "pelo")
+
+
+class Writer:
+    """Writes raw-text files and remembers their SHA256 for integrity.txt."""
+
+    def __init__(self, root: Path) -> None:
+        self.raw_text = root / RAW_TEXT_PREFIX
+        self.digests: dict[str, str] = {}
+
+    def write(self, rel: str, text: str) -> str:
+        data = text.encode("utf-8")
+        path = self.raw_text / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        self.digests[rel] = hashlib.sha256(data).hexdigest()
+        return self.digests[rel]
+
+
+def quotas(total: int, weights: dict[str, float]) -> Counter:
+    """Split ``total`` across ``weights`` with largest-remainder rounding."""
+    scale = sum(weights.values())
+    exact = {name: total * weight / scale for name, weight in weights.items()}
+    shares = Counter({name: int(value) for name, value in exact.items()})
+    by_remainder = sorted(exact, key=lambda name: exact[name] - shares[name], reverse=True)
+    for name in by_remainder[: total - sum(shares.values())]:
+        shares[name] += 1
+    return shares
+
+
+def component_mix(total: int, targets: dict) -> Counter:
+    plaintext = targets.get("plaintext", {"min": 60.0, "max": 70.0})
+    headers = round(total * HEADER_SHARE)
+    body = total - headers
+    share = (plaintext["min"] + plaintext["max"]) / 200
+    mix = quotas(headers, HEADERS_MIX) + Counter(plaintext=round(body * share))
+    return mix + quotas(body - mix["plaintext"], OTHERS_MIX)
+
+
+def arrange(mix: Counter, rng: random.Random) -> list[str]:
+    """A shuffled sequence of ``mix`` with no component repeated back to back."""
+    remaining = +mix
+    left = sum(remaining.values())
+    sequence: list[str] = []
+    while left:
+        previous = sequence[-1] if sequence else None
+        candidates = sorted(name for name in remaining if name != previous)
+        top = max(candidates, key=lambda name: (remaining[name], name))
+        # Draw at random unless the most frequent component must go now to stay placeable
+        if 2 * remaining[top] < left:
+            top = rng.choices(candidates, weights=[remaining[name] for name in candidates])[0]
+        sequence.append(top)
+        remaining[top] -= 1
+        remaining = +remaining
+        left -= 1
+    return sequence
+
+
+class Text:
+    """Seeded pt-BR-like prose."""
+
+    def __init__(self, rng: random.Random) -> None:
+        self.rng = rng
+
+    def phrase(self, low: int, high: int) -> str:
+        picked = []
+        for i in range(self.rng.randint(low, high)):
+            if i and i % 3 == 0:
+                picked.append(self.rng.choice(CONNECTORS))
+            picked.append(self.rng.choice(WORDS))
+        return " ".join(picked)
+
+    def sentence(self, low: int = 8, high: int = 18, end: str = ".") -> str:
+        text = self.phrase(low, high)
+        return text[0].upper() + text[1:] + end
+
+    def sentences(self, low: int, high: int) -> str:
+        return " ".join(self.sentence() for _ in range(self.rng.randint(low, high)))
+
+    def title(self) -> str:
+        text = self.phrase(2, 5)
+        return text[0].upper() + text[1:]
+
+
+def _table(text: Text, numeric: bool) -> str:
+    rng = text.rng
+    columns = rng.randint(3, 4)
+    rows = ["\t".join(text.title() for _ in range(columns))]
+    for _ in range(rng.randint(3, 8)):
+        if numeric:
+            cells = [text.phrase(1, 2)] + [f"{rng.randint(0, 9999) / 10:.1f}" for _ in range(columns - 1)]
+        else:
+            cells = [text.phrase(1, 6) for _ in range(columns)]
+        rows.append("\t".join(cells))
+    return "\n".join(rows) + "\n"
+
+
+def _tradeoffs(text: Text) -> str:
+    lines = [text.title(), ""]
+    lines += [f"+ {text.phrase(5, 10)}" for _ in range(text.rng.randint(2, 4))]
+    lines += [f"- {text.phrase(5, 10)}" for _ in range(text.rng.randint(2, 4))]
+    return "\n".join(lines) + "\n"
+
+
+def _diagram(text: Text) -> str:
+    steps = [text.title() for _ in range(text.rng.randint(3, 6))]
+    edges = "".join(f'  "{a}" -> "{b}";\n' for a, b in zip(steps, steps[1:]))
+    return f"digraph fluxo {{\n  rankdir=LR;\n{edges}}}\n"
+
+
+STRUCTURED = {
+    "tables": lambda text: _table(text, numeric=False),
+    "data": lambda text: _table(text, numeric=True),
+    "tradeoffs": _tradeoffs,
+    "diagrams": _diagram,
+}
+PROSE = {
+    "plaintext": lambda text: "\n\n".join(text.sentences(2, 4) for _ in range(text.rng.randint(2, 5))),
+    "docks": lambda text: f"Estudo de caso\n\nCenário: {text.sentence()}\n\nComportamento: {text.sentence()}",
+    "callouts": lambda text: text.sentences(1, 2),
+    "disclaimers": lambda text: text.sentences(1, 3),
+    "others": lambda text: text.sentences(1, 2),
+}
+
+
+def body_text(component: str, text: Text, keys: list[str]) -> str | tuple[str, str]:
+    """File content for ``component``; faqs return ``(question, answer)``."""
+    if component in HEADERS_MIX:
+        return text.title() + "\n"
+    if component == "faqs":
+        return text.sentence(6, 12, "?") + "\n", text.sentences(2, 3) + "\n"
+    if component in STRUCTURED:
+        return STRUCTURED[component](text)
+    words = PROSE[component](text).split(" ")
+    for key in keys:
+        words.insert(text.rng.randint(1, len(words) - 1), "${" + key + "}")
+    paragraphs = " ".join(words)
+    if component == "docks" and len(paragraphs) > MAX_DOCK_CHARS:
+        paragraphs = paragraphs[:MAX_DOCK_CHARS].rsplit(" ", 1)[0]
+    return paragraphs + "\n"
+
+
+def twin(fragment: dict, text: str, chunk: dict, blocks: dict[str, dict]) -> dict:
+    word_count = blocks["quality_metrics"]["word_count"]
+    stored = text.rstrip("\n")
+    digest = sha256_text(text)  # the .txt file's SHA256, as integrity_engine.py records it
+    return {
+        "version": "1.0.0",
+        "content_id": fragment["content_id"],
+        "component": fragment["component"],
+        "original_text": stored,
+        "transformed_text": stored,
+        "metadata": {
+            "title": fragment["title"],
+            "description": f"Fragmento sintético de {fragment['component']}: {fragment['title']}",
+            "domain": "etica-profissional",
+            "keywords": sorted(set(fold(fragment["title"]).split()) - set(CONNECTORS)),
+            "language": "pt-BR",
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP,
+            "author": "firma-contabil",
+            "source": chunk["source_document"],
+            "section": "sintetico",
+            "target_audience": ["profissionais-contabeis"],
+            "reading_level": "tecnico",
+            "estimated_reading_time_minutes": max(1, word_count // 200),
+        },
+        "source_metadata": {
+            "document_name": chunk["source_document"],
+            "extraction_method": "synthetic",
+            "page_number": chunk["source_metadata"]["page_number"],
+            "source_format": "text",
+        },
+        "placeholders": [
+            {"key": "${" + key + "}", "description": description, "type": kind, "format": fmt, "required": True}
+            if fmt
+            else {"key": "${" + key + "}", "description": description, "type": kind, "required": True}
+            for key, description, kind, fmt in PLACEHOLDERS
+            if key in fragment["_placeholders"]
+        ],
+        "transformations": [],
+        "brandguide_compliance": blocks["brandguide_compliance"],
+        "quality_metrics": blocks["quality_metrics"],
+        "relationships": {
+            "references": fragment["_references"],
+            "referenced_by": sorted(fragment["_referenced_by"]),
+            "related_fragments": sorted(fragment["_related"]),
+        },
+        "warnings": [],
+        "review_status": {"status": "approved", "reviewed_by": "auto", "reviewed_at": TIMESTAMP},
+        "audit": {
+            "fragment_id": fragment["fragment_id"],
+            "chunk_id": chunk["chunk_id"],
+            "ingestion_date": TIMESTAMP,
+            "sha256_original": sha256_text(stored),
+            "sha256_transformed": digest,
+            "classification_confidence": 1.0,
+        },
+    }
+
+
+def new_chunk(number: int, width: int) -> dict:
+    return {
+        "chunk_id": f"chunk_{number:0{width}d}",
+        "status": "completed",
+        "ingested_at": TIMESTAMP,
+        "source_document": f"Documento sintético {number}",
+        "source_metadata": {"extraction_method": "synthetic", "page_number": number, "source_format": "text"},
+        "fragments_generated": 0,
+        "validation": {"no_consecutive_components": True, "component_sequence": []},
+        "fragments": [],
+    }
+
+
+def name_fragment(index: int, component: str, title: str, content: str | tuple[str, str], used: set[str]) -> str:
+    """A unique content_id: NNN-slug, plus a content hash for single-file fragments."""
+    nnn = f"{index % 999 + 1:03d}"
+    slug = "-".join(word for word in fold(title).split() if word not in CONNECTORS)[:48].strip("-")
+    content_id = f"{nnn}-{slug}"
+    if component != "faqs" and component not in SUFFIX:
+        first = content[0] if isinstance(content, tuple) else content
+        content_id += "-" + sha256_text(first)[:4]
+    if content_id in used:
+        content_id = f"{nnn}-{slug}-{index:x}"
+    used.add(content_id)
+    return content_id
+
+
+def write_text(writer: Writer, component: str, stem: str, content: str | tuple[str, str]) -> tuple[str, str | None]:
+    """Write the fragment's .txt (or faq pair); its chunks.json path_txt and sha256_txt."""
+    if component == "faqs":
+        writer.write(f"{stem}/q.txt", content[0])
+        writer.write(f"{stem}/a.txt", content[1])
+        return f"{RAW_TEXT_PREFIX}{stem}/", None
+    return f"{RAW_TEXT_PREFIX}{stem}.txt", writer.write(f"{stem}.txt", content)
+
+
+def link(content_id: str, keys: list[str], twinned: list[dict], rng: random.Random) -> dict:
+    """Relationship fields of a new twin, pointing back into the last 50 twins."""
+    extra = {"_placeholders": keys, "_references": [], "_referenced_by": set(), "_related": set()}
+    if twinned and rng.random() < REFERENCE_SHARE:
+        target = rng.choice(twinned[-50:])
+        extra["_references"] = [target["content_id"]]
+        target["_referenced_by"].add(content_id)
+    if twinned and rng.random() < REFERENCE_SHARE:
+        target = rng.choice(twinned[-50:])
+        extra["_related"].add(target["content_id"])
+        target["_related"].add(content_id)
+    return extra
+
+
+def place(sequence: list[str], text: Text, writer: Writer) -> tuple[list[dict], list[dict], dict[str, str]]:
+    """Write every fragment's text files; return the chunks, the twinned fragments and their texts."""
+    rng = text.rng
+    width = max(2, len(str(-(-len(sequence) // CHUNK_SIZE))))
+    chunks: list[dict] = []
+    twinned: list[dict] = []
+    texts: dict[str, str] = {}
+    used: set[str] = set()
+    placeholder_keys = [key for key, *_ in PLACEHOLDERS]
+    for index, component in enumerate(sequence):
+        if index % CHUNK_SIZE == 0:
+            chunks.append(new_chunk(len(chunks) + 1, width))
+        chunk = chunks[-1]
+        keys = []
+        if component in PROSE and rng.random() < PLACEHOLDER_SHARE:
+            keys = sorted(rng.sample(placeholder_keys, rng.randint(1, 2)))
+        content = body_text(component, text, keys)
+        title = text.title()
+        content_id = name_fragment(index, component, title, content, used)
+        stem = f"{component}/{content_id}{SUFFIX.get(component, '')}"
+        path_txt, sha256_txt = write_text(writer, component, stem, content)
+        fragment = {
+            "fragment_id": f"{chunk['chunk_id']}_frag_{index % 999 + 1:03d}",
+            "seq": len(chunk["fragments"]) + 1,
+            "component": component,
+            "content_id": content_id,
+            "title": title,
+            "path_txt": path_txt,
+            "path_json": None if component in TWINLESS else f"{RAW_TEXT_PREFIX}{stem}.json",
+            "sha256_txt": sha256_txt,
+            "word_count": 0,
+            "character_count": 0,
+            "transformations_applied": [],
+            "review_status": "approved",
+        }
+        chunk["fragments"].append(fragment)
+        if component not in TWINLESS:
+            twinned.append({**fragment, **link(content_id, keys, twinned, rng), "_chunk": chunk})
+            texts[content_id] = content
+    return chunks, twinned, texts
+
+
+def write_twins(writer: Writer, twinned: list[dict], texts: dict[str, str]) -> None:
+    """Score every twinned fragment with brandguide_scorer.py and write its twin."""
+    automaton, _ = brandguide_scorer.load_rules()
+    items = [
+        (fragment["path_txt"][len(RAW_TEXT_PREFIX) :], texts[fragment["content_id"]].encode("utf-8"))
+        for fragment in twinned
+    ]
+    for fragment, blocks in zip(twinned, brandguide_scorer.score_batch(automaton, items)):
+        data = twin(fragment, texts[fragment["content_id"]], fragment["_chunk"], blocks)
+        rel = fragment["path_json"][len(RAW_TEXT_PREFIX) :]
+        writer.write(rel, json.dumps(data, ensure_ascii=False, indent=2) + "\n")
+
+
+def write_support(root: Path, writer: Writer, categories: set[str]) -> None:
+    """Category READMEs, plus the spec and meta files copied from this checkout."""
+    for category in sorted({*categories, "meta"}):
+        writer.write(f"{category}/README.md", f"# {category}\n\nSynthetic benchmark corpus.\n")
+    for rel in COPIED:
+        if rel.startswith("meta/"):
+            writer.write(rel, (META_DIR / rel[len("meta/") :]).read_text(encoding="utf-8"))
+        else:
+            shutil.copyfile(REPO_ROOT / rel, root / rel)
+
+
+def write_manifest(root: Path, chunks: list[dict], targets: dict) -> None:
+    manifest = {
+        "version": "1.0.0",
+        "last_updated": TIMESTAMP,
+        "total_chunks": 0,
+        "total_fragments": 0,
+        "chunks": chunks,
+        "component_distribution": {},
+        "component_distribution_percentage": {},
+        "_distribution_note": "",
+        "target_distribution": targets,
+        "validation_rules": {"no_consecutive_components": {"enabled": True, "enforcement": "pre-commit"}},
+        "saturation_warnings": [],
+        "placeholders_inventory": [],
+    }
+    chunks_path = root / CHUNKS_PATH.name
+    chunks_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    compile_manifest(root)
+
+
+def generate(root: Path, fragments: int, seed: int = 0) -> str:
+    """Write a synthetic checkout with ``fragments`` fragments to ``root``; return its integrity.txt digest."""
+    # Seeded for a reproducible corpus, not for anything secret
+    rng = random.Random(f"{GENERATOR_VERSION}:{seed}:{fragments}")  # nosec B311
+    targets = load_json(CHUNKS_PATH).get("target_distribution", {})
+    sequence = arrange(component_mix(fragments, targets), rng)
+    writer = Writer(root)
+    chunks, twinned, texts = place(sequence, Text(rng), writer)
+    write_twins(writer, twinned, texts)
+    write_support(root, writer, set(sequence))
+    write_manifest(root, chunks, targets)
+
+    rels = set(writer.digests) | {TREE_REL, INTEGRITY_REL}
+    writer.write(TREE_REL, render_tree(rels))
+    fingerprint = writer.write(INTEGRITY_REL, render_integrity(writer.digests))
+    (root / MARKER).write_text(
+        json.dumps({"generator": GENERATOR_VERSION, "fragments": fragments, "seed": seed, "fingerprint": fingerprint})
+        + "\n",
+        encoding="utf-8",
+    )
+    return fingerprint
+
+
+def compile_manifest(root: Path) -> None:
+    """Fill the chunks.json derived fields and placeholders.txt with manifest_compiler.py."""
+    env = {**os.environ, "CEOCONT_REPO_ROOT": str(root)}
+    cmd = [sys.executable, str(TOOLS_DIR / "hooks" / "manifest_compiler.py"), "--no-cache"]
+    # This interpreter running manifest_compiler.py, no shell
+    subprocess.run(cmd, env=env, check=True, capture_output=True)  # nosec B603
+    # Keep the output reproducible: the compiler stamps the build time
+    path = root / CHUNKS_PATH.name
+    raw = path.read_text(encoding="utf-8")
+    path.write_text(json_edit.patch(raw, {("last_updated",): TIMESTAMP}), encoding="utf-8")
+    shutil.rmtree(root / ".claude", ignore_errors=True)
+
+
+def existing(root: Path, fragments: int, seed: int) -> str | None:
+    """Fingerprint of a complete corpus already generated at ``root`` with these parameters."""
+    try:
+        marker = json.loads((root / MARKER).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (marker.get("generator"), marker.get("fragments"), marker.get("seed")) != (GENERATOR_VERSION, fragments, seed):
+        return None
+    return marker.get("fingerprint")
+
+
+def parse_size(value: str) -> int:
+    """``1000``, ``10k`` or ``1m``."""
+    value = value.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    return int(float(value.rstrip("km")) * scale)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out", type=Path)
+    parser.add_argument("--fragments", type=parse_size, default=1000, help="e.g. 1000, 10k, 100k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--force", action="store_true", help="replace a non-empty OUT")
+    args = parser.parse_args(argv)
+
+    out = args.out.resolve()
+    if out.exists() and any(out.iterdir()):
+        if not args.force:
+            print(f"❌ {out} is not empty; pass --force to replace it", file=sys.stderr)
+            return 1
+        shutil.rmtree(out)
+    fingerprint = generate(out, args.fragments, args.seed)
+    print(f"🧪 {args.fragments} fragments written to {out} (integrity.txt {fingerprint[:12]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Pydantic v2 model for the metadata twin (``*.json``) of each raw-text fragment.
+
+See ADR-001. Nested blocks accept extra keys so component-specific fields such
+as ``quality_metrics.table_rows`` validate without a schema bump.
+"""
+
+from __future__ import annotations
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+Component = Literal[
+    "plaintext",
+    "callouts",
+    "docks",
+    "tradeoffs",
+    "tables",
+    "data",
+    "faqs",
+    "diagrams",
+    "disclaimers",
+    "others",
+    "header_h1",
+    "header_h2",
+    "header_h3",
+]
+
+PLACEHOLDER_KEY_PATTERN = r"^\$\{[a-z0-9]+(-[a-z0-9]+)*\}$"
+SHA256_PATTERN = r"^[0-9a-f]{64}$"
+
+
+class _Block(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class Metadata(_Block):
+    title: str = Field(min_length=1)
+    description: str
+    domain: str
+    language: Literal["pt-BR"]
+    reading_level: str
+    keywords: list[str] = []
+    section: Optional[str] = None
+    target_audience: list[str] = []
+
+
+class SourceMetadata(_Block):
+    document_name: str
+    page_number: Optional[int] = None
+
+
+class Placeholder(_Block):
+    key: str = Field(pattern=PLACEHOLDER_KEY_PATTERN)
+    description: str
+    type: Literal["string", "date", "integer", "reference"]
+    format: Optional[str] = None
+    required: bool
+
+
+class BrandguideCompliance(_Block):
+    overall_score: float = Field(ge=0.0, le=1.0)
+    modals_forbidden_detected: list[str] = []
+
+
+class QualityMetrics(_Block):
+    word_count: int = Field(ge=0)
+    character_count: int = Field(ge=0)
+
+
+class Relationships(_Block):
+    references: list[str] = []
+    referenced_by: list[str] = []
+    related_fragments: list[str] = []
+
+
+class ReviewStatus(_Block):
+    status: Literal["pending", "approved", "rejected", "needs_review"]
+
+
+class Audit(_Block):
+    fragment_id: str
+    chunk_id: str
+    sha256_original: str = Field(pattern=SHA256_PATTERN)
+    sha256_transformed: Optional[str] = Field(default=None, pattern=SHA256_PATTERN)
+
+
+class MetadataTwin(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    version: str = Field(pattern=r"^\d+\.\d+\.\d+$")
+    content_id: str = Field(pattern=r"^\d{3}-[a-z0-9]+(-[a-z0-9]+)*$")
+    component: Component
+    original_text: str
+    transformed_text: str
+    metadata: Metadata
+    source_metadata: SourceMetadata
+    placeholders: list[Placeholder]
+    transformations: list[dict]
+    brandguide_compliance: BrandguideCompliance
+    quality_metrics: QualityMetrics
+    relationships: Relationships = Relationships()
+    warnings: list = []
+    review_status: ReviewStatus
+    audit: Audit
@@ -0,0 +1,44 @@
+"""Shared fixtures: scratch checkouts the hooks can be pointed at through CEOCONT_REPO_ROOT."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+HOOKS_DIR = REPO_ROOT / ".claude" / "hooks"
+CHECKOUT_FILES = ("chunks.json", "placeholders.txt")
+# Copies are backdated past corpus.RACY_WINDOW_NS so stat caches trust them on the first run
+SETTLED_AGE_S = 3600
+
+
+def run_hook(script: str, root: Path, *args: str, returncode: int = 0) -> subprocess.CompletedProcess:
+    """Run ``.claude/hooks/<script>`` against the checkout at ``root``; fail the test on any other exit status."""
+    env = {**os.environ, "CEOCONT_REPO_ROOT": str(root)}
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, str(HOOKS_DIR / script), *args], env=env, capture_output=True, text=True, check=False
+    )
+    assert result.returncode == returncode, f"{script} exited {result.returncode}:\n{result.stdout}{result.stderr}"
+    return result
+
+
+def settle(path: Path) -> None:
+    """Backdate the mtime of ``path`` and everything below it."""
+    stamp = path.stat().st_mtime - SETTLED_AGE_S
+    for entry in [path, *path.rglob("*")] if path.is_dir() else [path]:
+        os.utime(entry, (stamp, stamp))
+
+
+@pytest.fixture
+def checkout(tmp_path: Path) -> Path:
+    """A copy of the repository's raw-text corpus and manifest files."""
+    shutil.copytree(REPO_ROOT / "online-resources", tmp_path / "online-resources")
+    for name in CHECKOUT_FILES:
+        shutil.copy2(REPO_ROOT / name, tmp_path / name)
+    settle(tmp_path)
+    return tmp_path
@@ -0,0 +1,74 @@
+"""brandguide_scorer.py blocks: readability and the CI line width only where there is prose."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import brandguide_scorer
+import pytest
+from brandguide_scorer import MAX_LINE_CHARS, load_rules, merge, score_batch
+
+PROSE = (
+    "O profissional responsável avalia a situação. A decisão é documentada pelo responsável técnico.\n"
+    "Os registros são mantidos pela firma durante o prazo legal.\n"
+)
+SENTENCE_METRICS = ("readability_score", "avg_sentence_length", "flesch_reading_ease", "gunning_fog_index")
+
+
+def blocks(rel: str, text: str) -> dict[str, dict]:
+    automaton, _ = load_rules()
+    return score_batch(automaton, [(rel, text.encode("utf-8"))])[0]
+
+
+@pytest.mark.parametrize("rel", ["plaintext/001-x.txt", "callouts/001-x.txt", "docks/001-x.txt"])
+def test_prose_gets_readability(rel: str) -> None:
+    metrics = blocks(rel, PROSE)["quality_metrics"]
+    for key in (*SENTENCE_METRICS, "avg_word_length"):
+        assert isinstance(metrics[key], float), key
+    assert metrics["readability_score"] == metrics["flesch_reading_ease"]
+
+
+@pytest.mark.parametrize(
+    ("rel", "text"),
+    [
+        ("tables/001-x.tsv.txt", "Princípio\tDescrição\nIntegridade\tFundamental para os serviços contábeis\n"),
+        ("data/001-x.tsv.txt", "Ano\tValor\n2025\t10.5\n"),
+        ("diagrams/001-x.dot.txt", 'digraph g {\n    "Integridade" -> "Objetividade";\n}\n'),
+    ],
+)
+def test_non_prose_readability_is_null(rel: str, text: str) -> None:
+    metrics = blocks(rel, text)["quality_metrics"]
+    for key in (*SENTENCE_METRICS, "avg_word_length"):
+        assert metrics[key] is None, key
+    assert metrics["word_count"] > 0
+
+
+def test_tradeoff_bullets_keep_word_metrics_only() -> None:
+    text = "Monitoramento\n\n+ Rastreabilidade das ações realizadas\n- Investimento em infraestrutura\n"
+    metrics = blocks("tradeoffs/001-x.txt", text)["quality_metrics"]
+    assert all(metrics[key] is None for key in SENTENCE_METRICS)
+    assert isinstance(metrics["avg_word_length"], float)
+
+
+def test_line_width_applies_to_prose_only() -> None:
+    line = "Uma frase longa sobre controle de qualidade. " * 4
+    compliance = blocks("plaintext/001-x.txt", f"Curta.\n\n{line.strip()}\n")["brandguide_compliance"]
+    assert compliance["max_line_length_ok"] is False
+    assert compliance["issues"] == [f"line 3: {len(line.strip())} characters, limit is {MAX_LINE_CHARS} (§6.1)"]
+    assert compliance["overall_score"] < 1.0
+
+    row = "\t".join(["Integridade e objetividade"] * 8)
+    table = blocks("tables/001-x.tsv.txt", f"{row}\n{row}\n")["brandguide_compliance"]
+    assert len(row) > MAX_LINE_CHARS
+    assert (table["max_line_length_ok"], table["issues"]) == (True, [])
+
+
+def test_line_width_comes_from_the_ci_lint_config() -> None:
+    config = json.loads((Path(brandguide_scorer.__file__).parents[2] / ".markdownlintrc").read_text(encoding="utf-8"))
+    assert config["MD013"]["line_length"] == MAX_LINE_CHARS
+
+
+def test_merge_keeps_hand_added_keys() -> None:
+    current = {"overall_score": 0.5, "revisado_por": "comitê"}
+    assert merge(current, {"overall_score": 1.0}) == {"overall_score": 1.0, "revisado_por": "comitê"}
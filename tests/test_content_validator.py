@@ -0,0 +1,87 @@
+"""content_validator.py rule hits on single buffers and on a whole checkout."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from conftest import run_hook
+from content_validator import check_dock_length, check_path, check_tradeoffs, check_tsv
+
+DOCK = "docks/020-estudo-caso-relacionamento-cliente-401c.txt"
+
+
+def rules(findings: list) -> list[str]:
+    return [finding.rule for finding in findings]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("a\tb\n1\t2\n", []),
+        ("a\tb\n1\n", ["tsv-columns"]),
+        ("a\tb\n=SOMA(A1)\t2\n", ["tsv-formula"]),
+        ("a\tb\n1,5\t2\n", ["tsv-decimal"]),
+        ("ab\n1\n", ["tsv-header"]),
+    ],
+)
+def test_tsv(text: str, expected: list[str]) -> None:
+    assert rules(check_tsv("tables/001-x.tsv.txt", text)) == expected
+
+
+def test_tradeoff_markers_skip_the_title() -> None:
+    text = "Título\n\n+ vantagem\n- desvantagem\nsem marcador\n"
+    findings = check_tradeoffs("tradeoffs/001-x.txt", text)
+    assert [(finding.rule, finding.line) for finding in findings] == [("tradeoff-marker", 5)]
+
+
+def test_dock_length() -> None:
+    assert check_dock_length("docks/001-x.txt", "x" * 600 + "\n") == []
+    assert rules(check_dock_length("docks/001-x.txt", "x" * 601)) == ["dock-length"]
+
+
+def test_grandfathered_docks_can_only_shrink() -> None:
+    assert check_dock_length(DOCK, "x" * 753) == []
+    assert [finding.message for finding in check_dock_length(DOCK, "x" * 754)] == ["754 characters, limit is 753"]
+
+
+@pytest.mark.parametrize(
+    ("rel", "expected"),
+    [
+        ("plaintext/001-slug.txt", []),
+        ("plaintext/001-Slug.txt", ["filename"]),
+        ("plaintext/001-slug.md", ["raw-text-only"]),
+        ("unknown/001-slug.txt", ["category"]),
+        ("tables/001-slug.txt", ["filename"]),
+        ("faqs/001-slug/q.txt", []),
+        ("faqs/001-slug/x.txt", ["filename"]),
+    ],
+)
+def test_path(rel: str, expected: list[str]) -> None:
+    assert rules(check_path(rel)) == expected
+
+
+def test_checkout_passes(checkout: Path) -> None:
+    result = run_hook("content_validator.py", checkout, "--format", "json")
+    assert json.loads(result.stdout)["findings"] == []
+
+
+def test_checkout_reports_every_rule_hit(checkout: Path) -> None:
+    raw_text = checkout / "online-resources" / "raw-text"
+    dock = raw_text / DOCK
+    dock.write_text(dock.read_text(encoding="utf-8").rstrip("\n") + " Mais uma frase.\n", encoding="utf-8")
+    table = raw_text / "tables" / "017-principios-fundamentais-etica.tsv.txt"
+    table.write_text(table.read_text(encoding="utf-8") + "Extra\t1,5\n", encoding="utf-8")
+    (raw_text / "faqs" / "011-diferenca-empresa-privada-publica" / "a.txt").unlink()
+    (raw_text / "callouts" / "008-principios-seguranca-informacao-1fcc.json").unlink()
+
+    result = run_hook("content_validator.py", checkout, "--format", "json", returncode=1)
+    hits = {(finding["rule"], finding["path"]) for finding in json.loads(result.stdout)["findings"]}
+
+    assert ("dock-length", DOCK) in hits
+    assert ("tsv-columns", table.relative_to(raw_text).as_posix()) in hits
+    assert ("tsv-decimal", table.relative_to(raw_text).as_posix()) in hits
+    assert ("twin-sync", table.relative_to(raw_text).as_posix()) in hits
+    assert ("faq-pair", "faqs/011-diferenca-empresa-privada-publica/") in hits
+    assert ("twin-missing", "callouts/008-principios-seguranca-informacao-1fcc.txt") in hits
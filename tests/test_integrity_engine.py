@@ -0,0 +1,75 @@
+"""Twin audit hashes: sha256_transformed is the .txt file digest integrity.txt lists, sha256_original that of
+the twin's original_text."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+import synthetic_corpus
+from conftest import run_hook, settle
+
+
+def audited_twins(raw_text: Path) -> list[Path]:
+    return [
+        path
+        for path in sorted(raw_text.rglob("*.json"))
+        if path.parent.name != "meta" and isinstance(json.loads(path.read_text(encoding="utf-8")).get("audit"), dict)
+    ]
+
+
+def assert_audits_match_files(raw_text: Path) -> None:
+    listed = {}
+    for line in (raw_text / "meta" / "integrity.txt").read_text(encoding="utf-8").splitlines():
+        digest, rel = line.split("  ./", 1)
+        listed[rel] = digest
+    for twin in audited_twins(raw_text):
+        text = twin.with_suffix(".txt")
+        digest = hashlib.sha256(text.read_bytes()).hexdigest()
+        document = json.loads(twin.read_text(encoding="utf-8"))
+        audit = document["audit"]
+        assert audit.get("sha256_transformed", digest) == digest, twin.name
+        original = hashlib.sha256(document["original_text"].encode("utf-8")).hexdigest()
+        assert audit.get("sha256_original", original) == original, twin.name
+        assert listed[text.relative_to(raw_text).as_posix()] == digest
+        assert listed[twin.relative_to(raw_text).as_posix()] == hashlib.sha256(twin.read_bytes()).hexdigest()
+
+
+def test_repository_twins_carry_file_digests(checkout: Path) -> None:
+    raw_text = checkout / "online-resources" / "raw-text"
+    assert audited_twins(raw_text)
+    assert_audits_match_files(raw_text)
+    run_hook("integrity_engine.py", checkout, "--verify")
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_edited_text_is_reconciled(checkout: Path, cached: bool) -> None:
+    """Editing only a .txt moves its twin's sha256_transformed, also when the twin's stat key is cached."""
+    raw_text = checkout / "online-resources" / "raw-text"
+    flags = () if cached else ("--no-cache",)
+    run_hook("integrity_engine.py", checkout, *flags)
+    edited = audited_twins(raw_text)[::3]
+    originals = [json.loads(twin.read_text(encoding="utf-8"))["audit"]["sha256_original"] for twin in edited]
+    for twin in edited:
+        text = twin.with_suffix(".txt")
+        with open(text, "a", encoding="utf-8") as handle:
+            handle.write("Linha acrescentada.\n")
+        settle(text)
+    run_hook("integrity_engine.py", checkout, *flags)
+    assert_audits_match_files(raw_text)
+    # Only the transformed side moves: the original_text the fragment was extracted as is unchanged
+    assert [json.loads(twin.read_text(encoding="utf-8"))["audit"]["sha256_original"] for twin in edited] == originals
+    run_hook("integrity_engine.py", checkout, "--verify")
+
+
+def test_synthetic_corpus_follows_the_convention(tmp_path: Path) -> None:
+    """Generated twins already carry file digests, so the engine leaves a fresh corpus untouched."""
+    synthetic_corpus.generate(tmp_path, 300)
+    raw_text = tmp_path / "online-resources" / "raw-text"
+    assert audited_twins(raw_text)
+    assert_audits_match_files(raw_text)
+    before = {path: path.read_bytes() for path in raw_text.rglob("*") if path.is_file()}
+    run_hook("integrity_engine.py", tmp_path)
+    assert {path: path.read_bytes() for path in raw_text.rglob("*") if path.is_file()} == before
@@ -0,0 +1,68 @@
+"""json_edit.patch rewrites only the spans of the values that change."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from corpus import CHUNKS_PATH, RAW_TEXT_DIR, iter_twins
+from json_edit import locate, patch
+
+RAW = """{
+  "id": "001-politica",
+  "tags": ["a", "b"],
+  "steps": [
+    "um",
+    "dois"
+  ],
+  "audit": {"sha256_original": "00", "count": 3,   "ok": true},
+  "title": "Política de \\u00e9tica"
+}
+"""
+
+
+def test_noop_patch_is_byte_identical() -> None:
+    updates = {path: json.loads(RAW[start:end]) for path, (start, end) in locate(RAW).items() if path}
+    assert patch(RAW, updates) == RAW
+    assert patch(RAW, {}) == RAW
+
+
+def test_escaped_string_equal_value_is_left_alone() -> None:
+    assert patch(RAW, {("title",): "Política de ética"}) == RAW
+
+
+def test_only_the_changed_span_is_rewritten() -> None:
+    out = patch(RAW, {("audit", "sha256_original"): "ff", ("audit", "count"): 4})
+    assert out == RAW.replace('"00"', '"ff"').replace('"count": 3', '"count": 4')
+
+
+def test_unicode_is_written_unescaped() -> None:
+    out = patch(RAW, {("id",): "002-ética"})
+    assert out == RAW.replace('"001-politica"', '"002-ética"')
+    assert json.loads(out)["id"] == "002-ética"
+
+
+def test_inline_and_expanded_arrays_keep_their_layout() -> None:
+    out = patch(RAW, {("tags",): ["a", "b", "c"], ("steps",): ["um", "dois", "três"]})
+    assert '"tags": ["a", "b", "c"],' in out
+    assert '"steps": [\n    "um",\n    "dois",\n    "três"\n  ],' in out
+    assert json.loads(out) == {**json.loads(RAW), "tags": ["a", "b", "c"], "steps": ["um", "dois", "três"]}
+
+
+def test_type_change_is_rewritten() -> None:
+    out = patch(RAW, {("audit", "ok"): 1})
+    assert '"ok": 1}' in out
+
+
+def test_missing_path_raises() -> None:
+    with pytest.raises(KeyError):
+        patch(RAW, {("absent",): 1})
+
+
+@pytest.mark.parametrize("rel", [CHUNKS_PATH.name, *iter_twins()])
+def test_repository_files_round_trip(rel: str) -> None:
+    path = CHUNKS_PATH if rel == CHUNKS_PATH.name else RAW_TEXT_DIR / rel
+    raw = path.read_text(encoding="utf-8")
+    spans = locate(raw)
+    assert patch(raw, {key: json.loads(raw[start:end]) for key, (start, end) in spans.items() if key}) == raw
+    assert json.loads(raw) == json.loads(patch(raw, {}))
@@ -0,0 +1,49 @@
+"""A cached manifest_compiler.py build must equal a --no-cache build of the same checkout."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from conftest import run_hook, settle
+from json_edit import patch
+
+EDITED_TITLE = "Título editado à mão"
+
+
+def compile_outputs(root: Path, *args: str) -> tuple[dict, str]:
+    run_hook("manifest_compiler.py", root, *args)
+    manifest = json.loads((root / "chunks.json").read_text(encoding="utf-8"))
+    manifest.pop("last_updated")
+    return manifest, (root / "placeholders.txt").read_text(encoding="utf-8")
+
+
+def test_cached_build_equals_uncached_after_edits(checkout: Path) -> None:
+    chunks = checkout / "chunks.json"
+    compile_outputs(checkout)  # prime the cache
+    raw = chunks.read_text(encoding="utf-8")
+    fragments = json.loads(raw)["chunks"][0]["fragments"]
+    header = next(i for i, fragment in enumerate(fragments) if fragment["component"].startswith("header"))
+    edited = patch(raw, {("chunks", 0, "fragments", header, "title"): EDITED_TITLE})
+    text = next(
+        checkout / fragment["path_txt"] for fragment in fragments if not fragment["component"].startswith("header")
+    )
+    with open(text, "a", encoding="utf-8") as handle:
+        handle.write("Mais três palavras ${novo-placeholder}\n")
+    settle(text)
+
+    chunks.write_text(edited, encoding="utf-8")
+    cached = compile_outputs(checkout)
+    chunks.write_text(edited, encoding="utf-8")
+    uncached = compile_outputs(checkout, "--no-cache")
+
+    assert cached == uncached
+    assert cached[0]["chunks"][0]["fragments"][header]["title"] == EDITED_TITLE
+    assert "${novo-placeholder}" in cached[1]
+
+
+def test_cached_rebuild_is_stable(checkout: Path) -> None:
+    first = compile_outputs(checkout)
+    assert compile_outputs(checkout) == first
+    assert compile_outputs(checkout, "--no-cache") == first
+    run_hook("manifest_compiler.py", checkout, "--check")
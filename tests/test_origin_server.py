@@ -0,0 +1,178 @@
+"""origin_server range parsing over the single-range subset of RFC 9110, and conditional requests end to end."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+from http import HTTPStatus
+from pathlib import Path
+
+import origin_server
+import pytest
+from origin_server import (
+    Entry,
+    Origin,
+    RangeNotSatisfiableError,
+    load_worktree,
+    parse_range,
+    precompress,
+    select_range,
+)
+
+SIZE = 100
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=0-0", (0, 0)),
+        ("bytes=99-99", (99, 99)),
+        ("bytes=5-", (5, 99)),
+        ("bytes=-5", (95, 99)),
+        ("bytes=-100", (0, 99)),
+        ("bytes=-500", (0, 99)),
+        ("bytes=0-999999", (0, 99)),
+        ("bytes=90-200", (90, 99)),
+        ("Bytes = 1-2", (1, 2)),
+    ],
+)
+def test_satisfiable(header: str, expected: tuple[int, int]) -> None:
+    assert parse_range(header, SIZE) == expected
+
+
+@pytest.mark.parametrize(
+    "header",
+    ["bytes=0-1,3-4", "bytes=20-10", "items=0-1", "bytes=abc", "bytes=a-b", "bytes=-", "bytes=10", "bytes="],
+)
+def test_ignored(header: str) -> None:
+    assert parse_range(header, SIZE) is None
+
+
+@pytest.mark.parametrize(
+    ("header", "size"), [("bytes=-0", SIZE), ("bytes=100-", SIZE), ("bytes=999999-", SIZE), ("bytes=0-", 0)]
+)
+def test_not_satisfiable(header: str, size: int) -> None:
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range(header, size)
+
+
+def test_select_range() -> None:
+    headers: dict[str, str] = {}
+    assert select_range("", SIZE, headers) == (HTTPStatus.OK, 0, SIZE)
+    assert select_range("bytes=0-1,3-4", SIZE, headers) == (HTTPStatus.OK, 0, SIZE)
+    assert headers == {}
+    assert select_range("bytes=-10", SIZE, headers) == (HTTPStatus.PARTIAL_CONTENT, 90, 10)
+    assert headers == {"Content-Range": "bytes 90-99/100"}
+
+
+# --- conditional requests against a running Origin -----------------------------
+
+TEXT = "Linha de teste do servidor de origem.\n" * 40
+
+
+def export(root: Path, files: dict[str, str]) -> Path:
+    lines = []
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        lines.append(f"{hashlib.sha256(text.encode()).hexdigest()}  ./{rel}\n")
+    (root / "meta").mkdir(parents=True, exist_ok=True)
+    (root / "meta" / "integrity.txt").write_text("".join(lines), encoding="utf-8")
+    return root
+
+
+async def fetch(port: int, path: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    lines = [
+        f"GET /{path} HTTP/1.1",
+        "Host: localhost",
+        "Connection: close",
+        *(f"{k}: {v}" for k, v in headers.items()),
+    ]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    fields = dict(line.split(": ", 1) for line in header_lines)
+    return int(status_line.split()[1]), fields, body
+
+
+def exchange(entries: dict[str, Entry], path: str, requests: list[dict[str, str]]) -> list[tuple[int, dict, bytes]]:
+    """Answer each header set in ``requests`` for ``path`` from a server on an ephemeral port."""
+
+    async def scenario() -> list[tuple[int, dict, bytes]]:
+        origin = Origin(entries, immutable=False, cache_bytes=1 << 20, access_log=False)
+        server = await asyncio.start_server(origin.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return [await fetch(port, path, headers) for headers in requests]
+
+    return asyncio.run(scenario())
+
+
+@pytest.fixture
+def worktree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(origin_server, "VARIANTS_DIR", tmp_path / "variants")
+    return export(tmp_path / "raw-text", {"plaintext/001-a.txt": TEXT})
+
+
+def test_conditional_get(worktree: Path) -> None:
+    entries = load_worktree(worktree)
+    precompress(entries)
+    etag = f'"{hashlib.sha256(TEXT.encode()).hexdigest()}"'
+    plain, revalidated, gzipped, gzip_revalidated = exchange(
+        entries,
+        "plaintext/001-a.txt",
+        [{}, {"If-None-Match": etag}, {"Accept-Encoding": "gzip"}, {"Accept-Encoding": "gzip", "If-None-Match": etag}],
+    )
+    assert (plain[0], plain[1]["ETag"], plain[2]) == (200, etag, TEXT.encode())
+    assert (revalidated[0], revalidated[2]) == (304, b"")
+    assert "Content-Length" not in revalidated[1]
+    assert gzipped[1]["Content-Encoding"] == "gzip"
+    assert gzipped[1]["ETag"] == etag[:-1] + '-gzip"'
+    assert gzip.decompress(gzipped[2]) == TEXT.encode()
+    assert gzip_revalidated[0] == 200  # the identity ETag does not validate the gzip representation
+
+
+def test_ranges_and_if_range(worktree: Path) -> None:
+    entries = load_worktree(worktree)
+    etag = entries["plaintext/001-a.txt"].etag
+    size = len(TEXT)
+    partial, unsatisfiable, current, outdated = exchange(
+        entries,
+        "plaintext/001-a.txt",
+        [
+            {"Range": "bytes=0-4"},
+            {"Range": f"bytes={size}-"},
+            {"Range": "bytes=-6", "If-Range": etag},
+            {"Range": "bytes=-6", "If-Range": '"outdated"'},
+        ],
+    )
+    assert (partial[0], partial[1]["Content-Range"], partial[2]) == (206, f"bytes 0-4/{size}", b"Linha")
+    assert (unsatisfiable[0], unsatisfiable[1]["Content-Range"]) == (416, f"bytes */{size}")
+    assert (current[0], current[2]) == (206, b"origem.\n"[-6:])
+    assert (outdated[0], outdated[2]) == (200, TEXT.encode())
+
+
+def test_variants_are_reused_from_the_cache(worktree: Path) -> None:
+    assert precompress(load_worktree(worktree)) == dict.fromkeys(origin_server.ENCODINGS, 1)
+    entries = load_worktree(worktree)
+    assert precompress(entries) == {}
+    assert set(entries["plaintext/001-a.txt"].variants) == set(origin_server.ENCODINGS)
+
+
+def test_drift_before_startup_is_not_cached_or_tagged(worktree: Path) -> None:
+    """A file edited after integrity.txt was generated must not poison the variant cache under the old digest."""
+    (worktree / "plaintext" / "001-a.txt").write_text(TEXT.upper(), encoding="utf-8")
+    entries = load_worktree(worktree)
+    precompress(entries)
+    assert not any(origin_server.VARIANTS_DIR.iterdir())
+
+    ((status, headers, body),) = exchange(entries, "plaintext/001-a.txt", [{"Accept-Encoding": "gzip"}])
+    assert (status, body) == (200, TEXT.upper().encode())
+    assert "ETag" not in headers and "Content-Encoding" not in headers
+    assert headers["Cache-Control"] == "no-store"
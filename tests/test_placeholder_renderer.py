@@ -0,0 +1,122 @@
+"""placeholder_renderer.py slot resolution, bundle output and tenants-file checks."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from conftest import run_hook
+from placeholder_renderer import (
+    CompiledCorpus,
+    PlaceholderSpec,
+    TenantError,
+    compile_template,
+    iter_rendered,
+    load_tenants,
+    resolve,
+)
+
+VALUES = {
+    "razao-social": "Contábil Exemplo Ltda.",
+    "tipo-servico": "auditoria",
+    "tipo-irregularidade": "lançamentos sem suporte",
+    "responsavel-tecnico": "Ana Souza",
+    "objetivo-correcao": "a posição patrimonial",
+    "responsavel-qualidade": "Bruno Lima",
+    "nome-profissional": "Carla Dias",
+    "data-atualizacao": "01/02/2026",
+    "numero-atualizacoes": 3,
+    "areas-treinamento": "ética e independência",
+    "documento-normativo": "NBC PG 100",
+    "descricao-conteudo-normativo": "o código de ética",
+    "sistema-arquivo": "GED",
+    "codigo-referencia": "MQ-01",
+    "setor-administrativo": "Qualidade",
+}
+OPTIONAL = ["acao-cliente", "diagrama-piramide"]
+
+
+def small_corpus() -> CompiledCorpus:
+    slot_of: dict[str, int] = {}
+    template = compile_template("plaintext/001-x.txt", "A ${firma} em ${data} (${nota}).\n", slot_of)
+    specs = {
+        "firma": PlaceholderSpec("firma"),
+        "data": PlaceholderSpec("data", type="date", format="DD/MM/YYYY"),
+        "nota": PlaceholderSpec("nota", required=False),
+    }
+    return CompiledCorpus(tuple(sorted(slot_of, key=slot_of.__getitem__)), specs, (template,), [])
+
+
+def rendered(corpus: CompiledCorpus, table: list[bytes]) -> str:
+    return "".join(b"".join(parts).decode("utf-8") for _, parts in iter_rendered(corpus, table))
+
+
+def test_unresolved_optional_slot_keeps_its_key() -> None:
+    corpus = small_corpus()
+    table, result = resolve(corpus, "firma-a", {"${firma}": "Exemplo", "data": "31/12/2025", "sobra": "x"})
+    assert result.invalid == {}
+    assert result.unresolved == ["nota"]
+    assert result.orphaned == ["sobra"]
+    assert rendered(corpus, table) == "A Exemplo em 31/12/2025 (${nota}).\n"
+
+
+def test_missing_required_and_invalid_values() -> None:
+    _, result = resolve(small_corpus(), "Firma A", {"data": "2025-12-31"})
+    assert set(result.invalid) == {"tenant_id", "firma", "data"}
+    assert result.unresolved == ["firma", "nota"]
+
+
+def test_bundles_and_report(checkout: Path) -> None:
+    tenants = checkout / "firmas.jsonl"
+    out = checkout / "bundles"
+    lines = [
+        {"tenant_id": "firma-a", "values": {**VALUES, "chave-extra": "x"}},
+        {"tenant_id": "firma-b", "values": {k: v for k, v in VALUES.items() if k != "razao-social"}},
+    ]
+    tenants.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+
+    run_hook("placeholder_renderer.py", checkout, "--tenants", str(tenants), "--out", str(out), returncode=1)
+
+    report = json.loads((out / "render-report.json").read_text(encoding="utf-8"))["tenants"]
+    assert (report["rendered"], report["failed"]) == (1, 1)
+    issues = {issue["tenant_id"]: issue for issue in report["issues"]}
+    assert issues["firma-a"] == {
+        "tenant_id": "firma-a",
+        "invalid": {},
+        "unresolved": OPTIONAL,
+        "orphaned": ["chave-extra"],
+    }
+    assert issues["firma-b"]["invalid"] == {"razao-social": "required value missing"}
+    assert (out / "firma-a.tar").is_file()
+    assert not (out / "firma-b.tar").exists()
+
+
+def test_duplicate_tenant_ids_are_rejected(checkout: Path) -> None:
+    tenants = checkout / "firmas.jsonl"
+    out = checkout / "bundles"
+    line = json.dumps({"tenant_id": "firma-a", "values": VALUES}) + "\n"
+    tenants.write_text(line + "\n" + line, encoding="utf-8")
+
+    result = run_hook("placeholder_renderer.py", checkout, "--tenants", str(tenants), "--out", str(out), returncode=1)
+
+    assert "duplicate tenant_id 'firma-a' (line 1)" in result.stderr
+    assert not out.exists()
+
+
+@pytest.mark.parametrize(
+    ("line", "message"),
+    [
+        ('{"tenant_id": "firma-b", "values": {\n', "firmas.jsonl:2: invalid JSON"),
+        ('["firma-b"]\n', "firmas.jsonl:2: expected a JSON object, got list"),
+    ],
+)
+def test_malformed_tenant_lines_are_rejected(checkout: Path, line: str, message: str) -> None:
+    tenants = checkout / "firmas.jsonl"
+    tenants.write_text(json.dumps({"tenant_id": "firma-a", "values": VALUES}) + "\n" + line, encoding="utf-8")
+
+    with pytest.raises(TenantError, match=message):
+        load_tenants(tenants)
+    result = run_hook("placeholder_renderer.py", checkout, "--tenants", str(tenants), returncode=1)
+    assert message in result.stderr
+    assert "Traceback" not in result.stderr
@@ -0,0 +1,60 @@
+"""relationship_graph.Graph link checks, impact walks and DOT export on a small hand-written corpus."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from relationship_graph import Graph, render_dot
+
+# content_id -> (references, referenced_by, related_fragments)
+TWINS = {
+    "001-a": (["002-b", "009-missing"], [], ["002-b"]),
+    "002-b": ([], ["001-a"], []),
+    "003-c": (["002-b"], [], ["001-a"]),
+}
+CHUNKS = {"chunks": [{"chunk_id": "chunk_01", "fragments": [{"content_id": "001-a", "seq": 1}]}]}
+
+
+def build(tmp_path: Path) -> Graph:
+    root = tmp_path / "raw-text"
+    (root / "plaintext").mkdir(parents=True)
+    for content_id, (references, referenced_by, related) in TWINS.items():
+        twin = {
+            "content_id": content_id,
+            "component": "plaintext",
+            "relationships": {"references": references, "referenced_by": referenced_by, "related_fragments": related},
+        }
+        (root / "plaintext" / f"{content_id}.json").write_text(json.dumps(twin), encoding="utf-8")
+    chunks = tmp_path / "chunks.json"
+    chunks.write_text(json.dumps(CHUNKS), encoding="utf-8")
+    return Graph.build(root, chunks)
+
+
+def test_findings(tmp_path: Path) -> None:
+    graph = build(tmp_path)
+    found = {(f.level, f.rule, f.content_id, f.message) for f in graph.findings}
+    assert found == {
+        ("error", "dangling", "001-a", "references -> unknown 009-missing"),
+        ("error", "referenced-by-stale", "002-b", "declared ['001-a'], derived ['001-a', '003-c']"),
+        ("warning", "related-asymmetric", "001-a", "related to 002-b, which does not list it back"),
+        ("warning", "related-asymmetric", "003-c", "related to 001-a, which does not list it back"),
+    }
+
+
+def test_impact_follows_reverse_references(tmp_path: Path) -> None:
+    graph = build(tmp_path)
+    affected = graph.impact([graph.index["002-b"]])
+    assert [(graph.nodes[node].content_id, depth) for node, depth in affected] == [
+        ("002-b", 0),
+        ("001-a", 1),
+        ("003-c", 1),
+    ]
+
+
+def test_dot_lists_each_external_node_once(tmp_path: Path) -> None:
+    graph = build(tmp_path)
+    dot = render_dot(graph, [graph.index["001-a"], graph.index["003-c"]], "parcial")
+    external = [line for line in dot.splitlines() if "style=dashed];" in line]
+    assert external == ['    "002-b" [label="002-b\\nplaintext", shape=box, style=dashed];']
+    assert dot.count('"003-c" -> "002-b";') == 1
@@ -0,0 +1,108 @@
+"""release_delta.py delta and sync round-trips between two exported raw-text/ trees."""
+
+from __future__ import annotations
+
+import hashlib
+import shutil
+from pathlib import Path
+
+import pytest
+from release_delta import Release, SyncError, diff, sync
+
+V1 = {
+    "plaintext/001-a.txt": "Texto A\n",
+    "plaintext/002-b.txt": "Texto B\n",
+    "docks/003-c.txt": "Texto C\n",
+}
+V2 = {
+    "plaintext/001-a.txt": "Texto A\n",
+    "plaintext/002-b.txt": "Texto B revisado\n",
+    "callouts/004-d.txt": "Texto D\n",
+}
+
+
+def export(root: Path, files: dict[str, str]) -> Path:
+    """Write ``files`` and their meta/integrity.txt under ``root``."""
+    lines = []
+    for rel, text in sorted(files.items()):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        lines.append(f"{hashlib.sha256(text.encode()).hexdigest()}  ./{rel}\n")
+    (root / "meta").mkdir(parents=True, exist_ok=True)
+    (root / "meta" / "integrity.txt").write_text("".join(lines), encoding="utf-8")
+    return root
+
+
+def tree(root: Path) -> dict[str, bytes]:
+    return {path.relative_to(root).as_posix(): path.read_bytes() for path in root.rglob("*") if path.is_file()}
+
+
+@pytest.fixture
+def releases(tmp_path: Path) -> tuple[Path, Path, dict]:
+    old = export(tmp_path / "v1", V1)
+    new = export(tmp_path / "v2", V2)
+    return old, new, diff(Release.from_directory(old), Release.from_directory(new))
+
+
+def test_delta_lists_the_changes(releases: tuple[Path, Path, dict]) -> None:
+    _, _, delta = releases
+    assert [entry["path"] for entry in delta["added"]] == ["callouts/004-d.txt"]
+    assert [entry["path"] for entry in delta["modified"]] == ["meta/integrity.txt", "plaintext/002-b.txt"]
+    assert [entry["path"] for entry in delta["removed"]] == ["docks/003-c.txt"]
+
+
+def test_sync_round_trip(tmp_path: Path, releases: tuple[Path, Path, dict]) -> None:
+    old, new, delta = releases
+    mirror = tmp_path / "mirror"
+    shutil.copytree(old, mirror)
+
+    stats = sync(mirror, delta, str(new))
+
+    assert mirror.is_symlink()
+    assert tree(mirror) == tree(new)
+    assert (stats["fetched"], stats["linked"], stats["removed"]) == (3, 1, 1)
+    assert sync(mirror, delta, str(new))["fetched"] == 0  # already at TO
+
+
+def test_unlisted_mirror_files_are_not_carried_over(tmp_path: Path, releases: tuple[Path, Path, dict]) -> None:
+    old, new, delta = releases
+    mirror = tmp_path / "mirror"
+    shutil.copytree(old, mirror)
+    (mirror / "plaintext" / "099-local.txt").write_text("Nota local\n", encoding="utf-8")
+
+    stats = sync(mirror, delta, str(new))
+
+    assert tree(mirror) == tree(new)
+    assert stats["linked"] == 1
+
+
+def test_hash_mismatch_aborts_without_publishing(tmp_path: Path, releases: tuple[Path, Path, dict]) -> None:
+    old, new, delta = releases
+    mirror = tmp_path / "mirror"
+    shutil.copytree(old, mirror)
+    # Same size as the delta entry, different digest
+    (new / "plaintext" / "002-b.txt").write_text("Texto B REVISADO\n", encoding="utf-8")
+
+    with pytest.raises(SyncError, match="plaintext/002-b.txt: expected"):
+        sync(mirror, delta, str(new))
+
+    assert not mirror.is_symlink()
+    assert tree(mirror) == tree(old)
+    assert [path.name for path in tmp_path.iterdir() if path.name.startswith(".")] == []
+
+
+def test_mirror_off_from_needs_force(tmp_path: Path, releases: tuple[Path, Path, dict]) -> None:
+    old, new, delta = releases
+    mirror = tmp_path / "mirror"
+    shutil.copytree(old, mirror)
+    (mirror / "plaintext" / "001-a.txt").write_text("Editado localmente\n", encoding="utf-8")
+    (mirror / "meta" / "integrity.txt").write_text("", encoding="utf-8")
+
+    with pytest.raises(SyncError, match="is not at"):
+        sync(mirror, delta, str(new))
+    stats = sync(mirror, delta, str(new), force=True)
+
+    # 001-a is "unchanged" in the delta but differs locally, so --force fetches it instead of linking it
+    assert tree(mirror) == tree(new)
+    assert (stats["fetched"], stats["linked"], stats["removed"]) == (4, 0, 1)
@@ -0,0 +1,106 @@
+"""SearchIndex.search against an exhaustive BM25 scoring of the same postings."""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+
+import pytest
+import synthetic_corpus
+from search_index import K1, B, SearchIndex
+
+FRAGMENTS = 2000
+QUERIES = (
+    "CFC",
+    "Conselho Federal de Contabilidade",
+    "controle de qualidade",
+    "independência do auditor",
+    "risco",
+    "honorários obrigação",
+    "princípio documentado risco comportamento",
+    "termo-que-nao-existe",
+)
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    root = tmp_path_factory.mktemp("corpus")
+    synthetic_corpus.generate(root, FRAGMENTS)
+    return root / "online-resources" / "raw-text"
+
+
+@pytest.fixture(scope="module")
+def index(corpus: Path) -> SearchIndex:
+    index = SearchIndex()
+    index.update(corpus)
+    return index
+
+
+def exhaustive_scores(index: SearchIndex, query: str) -> dict[int, float]:
+    """BM25 of every live document, summed term by term in expansion order."""
+    live = [i for i, doc in enumerate(index.docs) if doc.live]
+    avgdl = sum(index.docs[i].length for i in live) / len(live)
+    scores = dict.fromkeys(live, 0.0)
+    for term, weight in index.expander.expand(query).items():
+        ids, tfs = index._decode(term) or ((), ())
+        postings = [(doc_id, tf) for doc_id, tf in zip(ids, tfs) if doc_id in scores]
+        df = len(postings)
+        scale = weight * math.log(1 + (len(live) - df + 0.5) / (df + 0.5)) * (K1 + 1)
+        for doc_id, tf in postings:
+            norm = K1 * (1 - B + B * index.docs[doc_id].length / avgdl)
+            scores[doc_id] += scale * (tf / (tf + norm))
+    return scores
+
+
+def brute_force(index: SearchIndex, query: str, k: int, component: str | None = None) -> list[tuple[str, float]]:
+    """The best ``k`` matching documents by exhaustive scoring, ties by ascending doc id."""
+    ranked = sorted(
+        (score, -doc_id)
+        for doc_id, score in exhaustive_scores(index, query).items()
+        if score > 0 and component in (None, index.docs[doc_id].component)
+    )
+    return [(index.docs[-negated].rel, round(score, 4)) for score, negated in ranked[::-1][:k]]
+
+
+def results(index: SearchIndex, query: str, k: int, component: str | None = None) -> list[tuple[str, float]]:
+    return [(hit.rel, hit.score) for hit in index.search(query, k=k, component=component)]
+
+
+def title_queries(index: SearchIndex) -> list[str]:
+    """Prefixes of a spread of document titles: common and rare terms, one to four at a time."""
+    titles = [doc.title for doc in index.docs[:: max(1, len(index.docs) // 12)]]
+    return [" ".join(title.split()[:n]) for title in titles for n in (1, 2, 4)]
+
+
+@pytest.mark.parametrize("k", [1, 10, 50])
+def test_top_k_matches_brute_force(index: SearchIndex, k: int) -> None:
+    for query in (*QUERIES, *title_queries(index)):
+        assert results(index, query, k) == brute_force(index, query, k), query
+
+
+@pytest.mark.parametrize("component", ["plaintext", "docks", "tables", "absent"])
+def test_component_filter_matches_brute_force(index: SearchIndex, component: str) -> None:
+    for query in (*QUERIES, *title_queries(index)):
+        assert results(index, query, 10, component) == brute_force(index, query, 10, component), query
+
+
+def test_incremental_update_and_reload(corpus: Path, index: SearchIndex, tmp_path: Path) -> None:
+    """Tombstoned documents stop counting towards frequencies, in memory and after a save/load round trip."""
+    twins = sorted(corpus.rglob("*.json"))
+    twins = [path for path in twins if path.parent.name != "meta"]
+    for path in twins[::7]:
+        path.unlink()
+    for path in twins[3::11]:
+        if path.exists():
+            twin = json.loads(path.read_text(encoding="utf-8"))
+            twin["transformed_text"] += " risco controle de qualidade CFC"
+            path.write_text(json.dumps(twin, ensure_ascii=False), encoding="utf-8")
+    stats = index.update(corpus)
+    assert stats["removed"] and stats["updated"]
+    index.save(tmp_path / "index.bin")
+    loaded = SearchIndex.load(tmp_path / "index.bin")
+    for query in (*QUERIES, *title_queries(index)):
+        expected = brute_force(index, query, 10)
+        assert results(index, query, 10) == expected, query
+        assert results(loaded, query, 10) == expected, query